@@ -0,0 +1,20 @@
+"""Ajan tipi adından ajan oluşturma (CLI modları ve alt süreçler ortak kullanır)"""
+from poker import Player
+from heuristic_agent import BasicHeuristicAgent, AggressiveHeuristicAgent
+from mcts_agent import MCTSAgent
+from expectiminimax_agent import ExpectiminimaxAgent
+
+AGENT_CLASSES = {
+    "basic_heuristic": BasicHeuristicAgent,
+    "aggressive_heuristic": AggressiveHeuristicAgent,
+    "mcts": MCTSAgent,
+    "expectiminimax": ExpectiminimaxAgent
+}
+
+def create_agent(agent_type, name, stack):
+    """Belirtilen tipte bir AI agent oluşturur"""
+    agent_class = AGENT_CLASSES.get(agent_type)
+    if agent_class is None:
+        # Bilinmeyen agent tipi için varsayılan Player
+        return Player(name, stack)
+    return agent_class(name, stack)
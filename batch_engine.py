@@ -0,0 +1,379 @@
+"""Binlerce bağımsız masayı aynı anda oynatan vektörel oyun motoru.
+
+`run_ai_comparison` / `benchmark_agents` her masayı tek tek, her adımda
+oyuncu nesnelerinin özelliklerine erişerek oynatır. Bu motor T masanın
+durumunu (T, S) NumPy dizilerinde tutar (S koltuk sayısı):
+
+* stacks, bets, contributions (el boyunca pota konan toplam), folded
+* hole: (T, S, 2) ve board: (T, 5) kart ID'leri (bkz. cards.py)
+
+Masalar aynı sokakta ilerler; bir bahis turunun her adımında, turu devam
+eden her masada sıradaki koltuk tek bir aksiyon alır. Kararlar koltuğun
+politikasına (policy) masa grubu halinde tek çağrıda sorulur; bu yüzden
+yalnızca vektörel ifade edilebilen politikalar desteklenir (`POLICIES`).
+El skorları, masa dokusu ve equity tabloları sokak başında tüm masalar
+için toplu hesaplanır.
+
+Bahis kuralları `HandEngine` ile aynıdır: ödenecek bir şey yokken fold
+check sayılır; raise en az call + big blind veya bu sokaktaki son tam raise
+artışı kadardır ve stack ile sınırlıdır (eksik all-in raise artışı
+değiştirmez), diğer oyuncuların tekrar aksiyon almasını gerektirir; tur
+`max_iterations` aksiyonda bitmezse bahisler eşitlenir.
+Showdown'da yan potlar el boyunca konan toplam miktarlardan hesaplanır,
+eşitlikte pot bölünür, artan chip koltuk sırasıyla dağıtılır.
+"""
+import numpy as np
+
+import batch_evaluator
+import board_texture
+import flop_strength
+import preflop_equity
+from deal_buffer import DealBuffer
+from pot_manager import resolve_batch
+
+FOLD, CALL, RAISE = 0, 1, 2
+
+class HeuristicPolicy:
+    """`BasicHeuristicAgent` karar mantığının vektörel karşılığı.
+
+    Eşikler sınıf özellikleri olarak tanımlıdır; alt sınıflar yalnızca
+    değerleri değiştirir.
+    """
+    bluff_chance = 0.05
+    alpha = 0.5  # Pot odaklı raise çarpanı
+    preflop_equity_thresholds = (1.13, 0.93)  # raise, call (equity * oyuncu sayısı)
+    rank_sum_thresholds = (20, 15)
+    flop_strength_thresholds = (0.93, 0.71)
+    score_thresholds = (2000, 4000)
+    preflop_random_call = 0.0
+    postflop_random_call = 0.0
+    wet_board_caution = True  # Islak masada flush/straight yoksa raise yerine call
+    strong_outs = None
+    playable_outs = 8
+
+    def act(self, view, rng):
+        """Masa grubu için aksiyon kodları (FOLD / CALL / RAISE)"""
+        size = len(view["needed"])
+        if view["street"] == 0:
+            strong, playable = self._preflop(view)
+            random_call = self.preflop_random_call
+        else:
+            strong, playable = self._postflop(view)
+            random_call = self.postflop_random_call
+
+        actions = np.where(strong, RAISE, np.where(playable, CALL, FOLD))
+        if random_call:
+            actions = np.where((actions == FOLD) & (rng.random(size) < random_call), CALL, actions)
+        actions = np.where((actions == FOLD) & (view["needed"] <= 0), CALL, actions)  # Bedava call = check
+        return np.where(rng.random(size) < self.bluff_chance, RAISE, actions)
+
+    def raise_amount(self, view):
+        """Pot odaklı raise miktarı (call dahil), stack ile sınırlı"""
+        return np.minimum(view["needed"] + (self.alpha * view["pot"]).astype(np.int64), view["stack"])
+
+    def _preflop(self, view):
+        if preflop_equity.is_available():
+            players = view["players_in_hand"]
+            ratio = preflop_equity.equity_vs_random_batch(view["hole"], players - 1) * players
+            raise_at, call_at = self.preflop_equity_thresholds
+        else:
+            ratio = (view["hole"] % 13 + 2).sum(axis=1)
+            raise_at, call_at = self.rank_sum_thresholds
+        return ratio >= raise_at, ratio >= call_at
+
+    def _postflop(self, view):
+        strength = view["flop_strength"]
+        if strength is not None:
+            strength = strength ** (view["players_in_hand"] - 1)
+            strong_at, playable_at = self.flop_strength_thresholds
+            strong, playable = strength >= strong_at, strength >= playable_at
+        else:
+            strong_below, playable_below = self.score_thresholds
+            strong, playable = view["score"] < strong_below, view["score"] < playable_below
+            if self.wet_board_caution:
+                strong &= ~view["wet"] | view["made_flush"] | view["made_straight"]
+
+        outs = view["outs"]
+        if self.strong_outs is not None:
+            strong = strong | (outs >= self.strong_outs)
+        return strong, playable | (outs >= self.playable_outs)
+
+class BasicHeuristicPolicy(HeuristicPolicy):
+    pass
+
+class AggressiveHeuristicPolicy(HeuristicPolicy):
+    """`AggressiveHeuristicAgent` karar mantığının vektörel karşılığı"""
+    bluff_chance = 0.15
+    alpha = 0.8
+    preflop_equity_thresholds = (1.06, 0.81)
+    rank_sum_thresholds = (18, 12)
+    flop_strength_thresholds = (0.84, 0.59)
+    score_thresholds = (3000, 5000)
+    preflop_random_call = 0.2
+    postflop_random_call = 0.3
+    wet_board_caution = False
+    strong_outs = 12
+
+# Ajan tipi -> vektörel politika
+POLICIES = {
+    "basic_heuristic": BasicHeuristicPolicy,
+    "aggressive_heuristic": AggressiveHeuristicPolicy
+}
+
+STREET_CARDS = (0, 3, 4, 5)  # Her sokakta masadaki kart sayısı
+DEAL_BUFFER_HANDS = 16  # Dağıtım tamponu: masa başına önceden üretilen el sayısı
+
+class BatchEngine:
+    """Aynı ajan dizilimine sahip `num_tables` bağımsız masa"""
+
+    def __init__(self, agent_types, num_tables, starting_stack, small_blind, seed=None, max_iterations=50):
+        unknown = [agent_type for agent_type in agent_types if agent_type not in POLICIES]
+        if unknown:
+            raise ValueError(f"Vektörel politikası olmayan ajan tipleri: {', '.join(unknown)}")
+        self.agent_types = list(agent_types)
+        self.policies = [POLICIES[agent_type]() for agent_type in agent_types]
+        self.num_tables = num_tables
+        self.num_seats = len(agent_types)
+        self.small_blind = small_blind
+        self.max_iterations = max_iterations
+        self.rng = np.random.default_rng(seed)
+        self.deals = DealBuffer(2 * self.num_seats + 5, num_tables * DEAL_BUFFER_HANDS, self.rng)
+
+        shape = (num_tables, self.num_seats)
+        self.stacks = np.full(shape, starting_stack, dtype=np.int64)
+        self.bets = np.zeros(shape, dtype=np.int64)
+        self.contributions = np.zeros(shape, dtype=np.int64)
+        self.folded = np.zeros(shape, dtype=bool)
+        self.in_hand = np.zeros(shape, dtype=bool)
+        self.pot = np.zeros(num_tables, dtype=np.int64)
+        self.current_bet = np.zeros(num_tables, dtype=np.int64)
+        self.last_raise = np.zeros(num_tables, dtype=np.int64)  # Sokaktaki son tam raise artışı
+        self.hole = np.zeros((num_tables, self.num_seats, 2), dtype=np.int64)
+        self.board = np.zeros((num_tables, 5), dtype=np.int64)
+        self.features = {}
+
+        # İstatistikler (koltuk başına, tüm masalar üzerinden toplam)
+        self.rounds_played = np.zeros(num_tables, dtype=np.int64)
+        self.eliminated_round = np.zeros(shape, dtype=np.int64)  # 0: elenmedi
+        self.fold_count = np.zeros(self.num_seats, dtype=np.int64)
+        self.raise_count = np.zeros(self.num_seats, dtype=np.int64)
+        self.all_in_count = np.zeros(self.num_seats, dtype=np.int64)
+        self.showdown_wins = np.zeros(self.num_seats, dtype=np.int64)
+        self.hands_played = 0
+
+    def run(self, max_round):
+        """`max_round` el oyna; masa başına son stack'leri döndürür"""
+        running = np.ones(self.num_tables, dtype=bool)
+        for round_number in range(1, max_round + 1):
+            # Oyunu süren masalarda el numarası, elenenlerde elendiği el kaydedilir
+            self.rounds_played[running] = round_number
+            alive = self.stacks > 0
+            newly_out = ~alive & (self.eliminated_round == 0)
+            self.eliminated_round[newly_out] = round_number
+            running &= alive.sum(axis=1) >= 2
+            tables = np.flatnonzero(running)
+            if len(tables) == 0:
+                break
+            self.play_hand(tables, round_number)
+        return self.stacks
+
+    # Bir el
+    def play_hand(self, tables, round_number):
+        """`tables` masalarında bir el oyna (tüm masalarda en az iki aktif oyuncu var)"""
+        self.hands_played += len(tables)
+        self.in_hand[tables] = self.stacks[tables] > 0
+        self.folded[tables] = ~self.in_hand[tables]
+        self.bets[tables] = 0
+        self.contributions[tables] = 0
+        self.pot[tables] = 0
+        self.last_raise[tables] = 0
+        self._deal(tables)
+
+        # Pozisyonlar aktif oyuncular arasında: dealer = el % aktif sayısı
+        in_hand = self.in_hand[tables]
+        active_count = in_hand.sum(axis=1)
+        active_rank = np.where(in_hand, np.cumsum(in_hand, axis=1) - 1, -1)
+        dealer = round_number % active_count
+
+        def seat_at(offset):
+            target = (dealer + offset) % active_count
+            return (active_rank == target[:, None]).argmax(axis=1)
+
+        sb_seat, bb_seat = seat_at(1), seat_at(2)
+        sb_amount = np.minimum(self.small_blind, self.stacks[tables, sb_seat])
+        self._pay(tables, sb_seat, sb_amount)
+        bb_amount = np.minimum(self.small_blind * 2, self.stacks[tables, bb_seat])
+        self._pay(tables, bb_seat, bb_amount)
+        self.current_bet[tables] = np.maximum(sb_amount, bb_amount)
+
+        # Preflop big blind'dan sonraki, diğer sokaklar dealer'dan sonraki oyuncuyla başlar
+        self._betting_round(tables, seat_at(3), street=0)
+        postflop_start = seat_at(1)
+        for street in (1, 2, 3):
+            tables, postflop_start = self._award_uncontested(tables, postflop_start)
+            if len(tables) == 0:
+                return
+            self.bets[tables] = 0
+            self.current_bet[tables] = 0
+            self.last_raise[tables] = 0
+            self._betting_round(tables, postflop_start, street)
+        tables, _ = self._award_uncontested(tables, postflop_start)
+        if len(tables):
+            self._showdown(tables)
+
+    def _deal(self, tables):
+        # Önceden üretilmiş dağıtım sıralarından masa başına 2S+5 kart
+        drawn = self.deals.take(len(tables))
+        self.hole[tables] = drawn[:, :2 * self.num_seats].reshape(len(tables), self.num_seats, 2)
+        self.board[tables] = drawn[:, 2 * self.num_seats:]
+
+    def _pay(self, tables, seats, amounts):
+        self.stacks[tables, seats] -= amounts
+        self.bets[tables, seats] += amounts
+        self.contributions[tables, seats] += amounts
+        self.pot[tables] += amounts
+
+    def _award_uncontested(self, tables, start):
+        # Tek oyuncu kalan masalarda potu ona ver; devam eden masaları döndür
+        remaining = self.in_hand[tables] & ~self.folded[tables]
+        alone = remaining.sum(axis=1) == 1
+        if alone.any():
+            won, seats = tables[alone], remaining[alone].argmax(axis=1)
+            self.stacks[won, seats] += self.pot[won]
+            self.pot[won] = 0
+            np.add.at(self.showdown_wins, seats, 1)
+        return tables[~alone], start[~alone]
+
+    # Bahis turu
+    def _street_features(self, tables, street):
+        # Sokak başında tüm koltuklar için politika girdileri
+        num_cards = STREET_CARDS[street]
+        features = {"street": street, "flop_strength": None}
+        if street == 0:
+            self.features = features
+            return
+        hole = self.hole[tables].reshape(-1, 2)
+        board = np.repeat(self.board[tables, :num_cards], self.num_seats, axis=0)
+        shape = (len(tables), self.num_seats)
+        features["score"] = batch_evaluator.evaluate_hands(np.hstack([hole, board])).reshape(shape)
+        hole_masks = np.bitwise_or.reduce(np.left_shift(1, hole), axis=1)
+        board_masks = np.bitwise_or.reduce(np.left_shift(1, board), axis=1)
+        for name, values in board_texture.analyze_batch(hole_masks, board_masks).items():
+            features[name] = values.reshape(shape)
+        if street == 1 and flop_strength.is_available():
+            ehs, _ = flop_strength.expected_strength_batch(hole, board)
+            features["flop_strength"] = ehs.reshape(shape)
+        # Masa ID'si -> satır indeksi
+        features["row"] = np.full(self.num_tables, -1, dtype=np.int64)
+        features["row"][tables] = np.arange(len(tables))
+        self.features = features
+
+    def _view(self, tables, seat, needed):
+        # Koltuğun masa grubundaki karar girdileri
+        features = self.features
+        view = {
+            "street": features["street"],
+            "hole": self.hole[tables, seat],
+            "needed": needed,
+            "pot": self.pot[tables],
+            "stack": self.stacks[tables, seat],
+            "players_in_hand": (self.in_hand[tables] & ~self.folded[tables]).sum(axis=1),
+            "flop_strength": None
+        }
+        if features["street"] > 0:
+            rows = features["row"][tables]
+            for name in ("score", "outs", "made_flush", "made_straight", "wet"):
+                view[name] = features[name][rows, seat]
+            if features["flop_strength"] is not None:
+                view["flop_strength"] = features["flop_strength"][rows, seat]
+        return view
+
+    def _betting_round(self, tables, start, street):
+        self._street_features(tables, street)
+        num_seats = self.num_seats
+        seat_ids = np.arange(num_seats)
+        pending = self.in_hand[tables] & ~self.folded[tables] & (self.stacks[tables] > 0)
+        current = start.copy()
+        actions_taken = np.zeros(len(tables), dtype=np.int64)
+        folded_now = np.zeros((len(tables), num_seats), dtype=bool)
+        raised_now = np.zeros((len(tables), num_seats), dtype=bool)
+
+        while True:
+            remaining = (self.in_hand[tables] & ~self.folded[tables]).sum(axis=1)
+            live = pending.any(axis=1) & (remaining > 1)
+            over = live & (actions_taken >= self.max_iterations)
+            if over.any():
+                self._equalize_bets(tables[over])
+                pending[over] = False
+                live &= ~over
+            rows = np.flatnonzero(live)
+            if len(rows) == 0:
+                break
+
+            # Sıradaki (mevcut koltuktan itibaren) aksiyon bekleyen koltuk
+            distance = np.where(pending[rows], (seat_ids - current[rows, None]) % num_seats, num_seats)
+            seats = (current[rows] + distance.min(axis=1)) % num_seats
+            for seat in range(num_seats):
+                group = rows[seats == seat]
+                if len(group):
+                    self._act(tables, group, seat, pending, folded_now, raised_now)
+            current[rows] = (seats + 1) % num_seats
+            actions_taken[rows] += 1
+
+        self.fold_count += folded_now.sum(axis=0)
+        self.raise_count += raised_now.sum(axis=0)
+        all_in = self.in_hand[tables] & ~self.folded[tables] & (self.stacks[tables] == 0)
+        self.all_in_count += all_in.sum(axis=0)
+
+    def _act(self, tables, group, seat, pending, folded_now, raised_now):
+        table_ids = tables[group]
+        needed = self.current_bet[table_ids] - self.bets[table_ids, seat]
+        view = self._view(table_ids, seat, needed)
+        policy = self.policies[seat]
+        actions = policy.act(view, self.rng)
+
+        stack = view["stack"]
+        call_amount = np.minimum(needed, stack)
+        # En az call + big blind veya son raise artışı (bkz. PokerGame.min_raise), en fazla all-in
+        min_raise = np.maximum(self.small_blind * 2, self.last_raise[table_ids])
+        raise_total = np.minimum(np.maximum(policy.raise_amount(view), needed + min_raise), stack)
+        is_raise = (actions == RAISE) & (raise_total > needed)
+        full_raise = is_raise & (raise_total - needed >= min_raise)
+        self.last_raise[table_ids[full_raise]] = (raise_total - needed)[full_raise]
+        is_fold = (actions == FOLD) & (needed > 0)
+        amounts = np.where(is_raise, raise_total, np.where(is_fold, 0, call_amount))
+
+        self._pay(table_ids, seat, amounts)
+        self.folded[table_ids, seat] |= is_fold
+        self.current_bet[table_ids] = np.maximum(self.current_bet[table_ids], self.bets[table_ids, seat])
+
+        # Raise sonrası diğer oyuncular tekrar aksiyon almalı
+        reopened = group[is_raise]
+        if len(reopened):
+            raised_tables = tables[reopened]
+            pending[reopened] = ~self.folded[raised_tables] & self.in_hand[raised_tables] & (self.stacks[raised_tables] > 0)
+        pending[group, seat] = False
+        folded_now[group, seat] |= is_fold
+        raised_now[group, seat] |= is_raise
+
+    def _equalize_bets(self, tables):
+        # İterasyon sınırında bahisleri en yüksek bahse eşitle
+        max_bet = self.bets[tables].max(axis=1, keepdims=True)
+        active = self.in_hand[tables] & ~self.folded[tables]
+        amounts = np.where(active, np.minimum(max_bet - self.bets[tables], self.stacks[tables]), 0)
+        self.stacks[tables] -= amounts
+        self.bets[tables] += amounts
+        self.contributions[tables] += amounts
+        self.pot[tables] += amounts.sum(axis=1)
+
+    # Showdown
+    def _showdown(self, tables):
+        num_seats = self.num_seats
+        cards = np.concatenate([self.hole[tables], np.repeat(self.board[tables, None, :], num_seats, axis=1)], axis=2)
+        scores = batch_evaluator.evaluate_hands(cards.reshape(-1, 7)).reshape(len(tables), num_seats)
+        remaining = self.in_hand[tables] & ~self.folded[tables]
+        winnings = resolve_batch(self.contributions[tables], scores, remaining)
+
+        self.stacks[tables] += winnings
+        self.pot[tables] = 0
+        self.showdown_wins += (winnings > 0).sum(axis=0)
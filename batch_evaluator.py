@@ -0,0 +1,83 @@
+"""NumPy ile toplu el değerlendirme.
+
+`lookup_evaluator` tablolarını NumPy dizisi olarak kullanır: anahtar
+toplamları, renk sayaçları ve flush rank maskeleri gather + broadcast
+işlemleriyle hesaplanır, skorlar tek bir indeksleme ile tablodan okunur.
+Kartlar 0..51 arası tamsayı ID'leri ile verilir (bkz. cards.py).
+
+Aynı kartın hem elde hem masada olduğu kombinasyonlar geçersizdir; bu
+durumlarda dönen skor anlamsızdır, `overlap_mask` ile ayıklanabilir.
+"""
+import numpy as np
+
+import lookup_evaluator
+
+RANK_KEYS = np.array(lookup_evaluator.CARD_RANK_KEYS, dtype=np.int64)
+SUIT_KEYS = np.array(lookup_evaluator.CARD_SUIT_KEYS, dtype=np.int64)
+
+# Kart ID'si -> (4,) her renk için rank biti (kartın rengi dışındakiler 0)
+SUIT_RANK_BITS = np.zeros((52, 4), dtype=np.int64)
+for _card_id, _bits in enumerate(lookup_evaluator.CARD_RANK_BITS):
+    SUIT_RANK_BITS[_card_id, _card_id // 13] = _bits
+
+CARD_MASKS = np.array([1 << card_id for card_id in range(52)], dtype=np.uint64)
+
+TABLE = None
+
+def load():
+    """Lookup tablosunu (aynı memory-map üzerinden) NumPy dizisi olarak yükle"""
+    global TABLE
+    if TABLE is None:
+        TABLE = np.frombuffer(lookup_evaluator.load(), dtype=np.uint16)
+    return TABLE
+
+def _partials(cards):
+    # Kart grubunun anahtar toplamı, renk sayaçları ve renk başına rank maskeleri
+    cards = np.asarray(cards, dtype=np.int64)
+    keys = RANK_KEYS[cards].sum(axis=-1)
+    suits = SUIT_KEYS[cards].sum(axis=-1)
+    bits = np.bitwise_or.reduce(SUIT_RANK_BITS[cards], axis=-2)
+    return keys, suits, bits
+
+def _lookup(keys, suits, bits, num_cards):
+    # Renksiz skorları oku, flush olan elleri flush tablosundan düzelt
+    table = load()
+    # Çakışan kartlar (aynı ranktan 4'ten fazla) tablo dışına taşabilir
+    ranks = table[np.minimum(lookup_evaluator.OFFSETS[num_cards] + keys, len(table) - 1)]
+    flush = (suits + lookup_evaluator.FLUSH_CHECK_ADD) & lookup_evaluator.FLUSH_CHECK_MASK
+    if flush.any():
+        for suit_index in range(4):
+            hit = (flush >> (4 * suit_index + 3)) & 1 == 1
+            if hit.any():
+                ranks[hit] = table[bits[..., suit_index][hit]]
+    return ranks
+
+def evaluate_hands(cards):
+    """(K, n) kart dizisindeki her satırı değerlendir (5 <= n <= 7) -> (K,)"""
+    cards = np.asarray(cards, dtype=np.int64)
+    keys, suits, bits = _partials(cards)
+    return _lookup(keys, suits, bits, cards.shape[-1])
+
+def evaluate_matrix(hole_cards, boards):
+    """(N, 2) el ve (M, k) masa dizisi için (N, M) skor matrisi döndür.
+
+    k 3 ile 5 arasında olabilir; sonuç `el_gucu_hesapla` ile aynı ölçektedir
+    (1 en iyi, 7462 en kötü).
+    """
+    hole_cards = np.asarray(hole_cards, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    hole_keys, hole_suits, hole_bits = _partials(hole_cards)
+    board_keys, board_suits, board_bits = _partials(boards)
+
+    keys = hole_keys[:, None] + board_keys[None, :]
+    suits = hole_suits[:, None] + board_suits[None, :]
+    bits = hole_bits[:, None, :] | board_bits[None, :, :]
+    return _lookup(keys, suits, bits, hole_cards.shape[1] + boards.shape[1])
+
+def card_masks(cards):
+    """(..., n) kart dizisini (...,) 64 bitlik maske dizisine dönüştür"""
+    return np.bitwise_or.reduce(CARD_MASKS[np.asarray(cards, dtype=np.int64)], axis=-1)
+
+def overlap_mask(hole_cards, boards):
+    """(N, M) boolean: el ile masa ortak kart içeriyorsa True"""
+    return (card_masks(hole_cards)[:, None] & card_masks(boards)[None, :]) != 0
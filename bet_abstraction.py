@@ -0,0 +1,55 @@
+"""Yasal aksiyonlar ve ayrık bahis boyutu soyutlaması.
+
+Arama ajanları eskiden her durumda aynı üç aksiyonu ("fold", "call",
+"raise") dallandırıyordu: ödenecek bir şey yokken fold anlamsız bir dal,
+raise ise tek ve ajana göre sabit bir miktardı. `legal_actions` yalnızca
+o durumda geçerli olan aksiyonları (aksiyon, miktar) çiftleri olarak verir:
+
+* fold: yalnızca ödenecek miktar varken
+* check (ödenecek yoksa) veya call (miktar stack ile sınırlı)
+* pot oranlarına göre ayrık raise'ler (varsayılan 0.5, 1 ve 2 pot), en az
+  min-raise (call + big blind veya son raise artışı), stack'ten küçük
+  olanlar; aynı miktarlar bir kez
+* all-in (stack call'dan büyükse)
+
+raise miktarı motordaki gibi oyuncunun ortaya koyduğu toplamdır (call
+dahil); pot oranı call sonrası pota göre hesaplanır. Oranlar ajan başına
+verilebilir, verilmezse `configure_bet_sizes` ile ayarlanan süreç geneli
+değerler kullanılır.
+"""
+
+DEFAULT_BET_SIZES = (0.5, 1.0, 2.0)
+
+# Süreç boyunca kullanılan pot oranları
+BET_SIZES = DEFAULT_BET_SIZES
+
+def configure_bet_sizes(bet_sizes):
+    """Varsayılan pot oranlarını ayarla"""
+    global BET_SIZES
+    BET_SIZES = tuple(sorted(set(bet_sizes)))
+
+def legal_actions(to_call, stack, pot, min_raise, bet_sizes=None):
+    """Geçerli (aksiyon, miktar) listesi.
+
+    to_call: ödenecek miktar, stack: oyuncunun stack'i, pot: ortadaki toplam,
+    min_raise: call üzerine en az eklenmesi gereken miktar (big blind veya bu
+    sokaktaki son raise artışı, bkz. PokerGame.min_raise).
+    """
+    if bet_sizes is None:
+        bet_sizes = BET_SIZES
+    if to_call > 0:
+        actions = [("fold", 0), ("call", min(to_call, stack))]
+    else:
+        actions = [("check", 0)]
+    if stack <= to_call:
+        return actions
+
+    smallest = to_call + max(min_raise, 1)
+    amounts = set()
+    for fraction in bet_sizes:
+        amount = max(to_call + int(fraction * (pot + to_call)), smallest)
+        if amount < stack and amount not in amounts:
+            amounts.add(amount)
+            actions.append(("raise", amount))
+    actions.append(("raise", stack))
+    return actions
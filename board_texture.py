@@ -0,0 +1,206 @@
+"""Masa dokusu (board texture) ve out analizi.
+
+Ajanlar yalnızca elin nihai skorunu görür; masanın eşli olup olmadığını,
+flush/straight ihtimallerini ve elin çekilişlerini bilmez. Bu modül bu
+özellikleri bitmask işlemleriyle hesaplar (bkz. cards.py):
+
+* `analyze_board`: yalnızca masaya bağlı özellikler. Aynı masa için tüm
+  ajanlar aynı sonucu kullanır; sonuçlar masa maskesine göre önbelleğe
+  alınır, böylece bir eldeki her sokak için bir kez hesaplanır.
+* `analyze_hand`: hole kartlara bağlı çekilişler ve out sayısı. Out, açılması
+  durumunda eli (hole kartlardan en az birini kullanarak) flush veya
+  straight yapan görülmemiş karttır.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from cards import FULL_DECK_MASK, SUIT_MASK, cards_to_mask, popcount
+
+BOARD_CACHE_CAPACITY = 4096
+
+# Rank maskesinin ardışık 5 bitlik pencereleri (as hem en yüksek hem en düşük)
+STRAIGHT_WINDOWS = tuple(0x1F << start for start in range(10))
+
+def suit_masks(mask):
+    """Maskteki her rengin 13 bitlik rank maskesi"""
+    return tuple((mask >> (13 * suit_index)) & SUIT_MASK for suit_index in range(4))
+
+def _extend_ace(rank_mask):
+    # Ası en düşük karta da kopyala (A-2-3-4-5 için); bit 0 as, bit 1 "2" olur
+    return (rank_mask << 1) | ((rank_mask >> 12) & 1)
+
+def has_straight(rank_mask):
+    """Rank maskesi 5 ardışık rank içeriyor mu"""
+    extended = _extend_ace(rank_mask)
+    return any(extended & window == window for window in STRAIGHT_WINDOWS)
+
+def _max_window_count(rank_mask):
+    # Tek bir straight penceresine düşen en fazla rank sayısı
+    extended = _extend_ace(rank_mask)
+    return max(popcount(extended & window) for window in STRAIGHT_WINDOWS)
+
+class BoardTexture:
+    """Yalnızca masa kartlarına bağlı özellikler"""
+    __slots__ = ("mask", "num_cards", "rank_mask", "suit_counts", "max_suit_count",
+                 "paired", "trips", "flush_possible", "straight_possible", "high_rank")
+
+    def __init__(self, board_mask):
+        suits = suit_masks(board_mask)
+        self.mask = board_mask
+        self.num_cards = popcount(board_mask)
+        self.rank_mask = suits[0] | suits[1] | suits[2] | suits[3]
+        self.suit_counts = tuple(popcount(bits) for bits in suits)
+        self.max_suit_count = max(self.suit_counts)
+
+        # En az iki / üç renkte bulunan rankler eş / üçlü demektir
+        pairs = ((suits[0] & suits[1]) | (suits[0] & suits[2]) | (suits[0] & suits[3]) |
+                 (suits[1] & suits[2]) | (suits[1] & suits[3]) | (suits[2] & suits[3]))
+        trips = ((suits[0] & suits[1] & suits[2]) | (suits[0] & suits[1] & suits[3]) |
+                 (suits[0] & suits[2] & suits[3]) | (suits[1] & suits[2] & suits[3]))
+        self.paired = pairs != 0
+        self.trips = trips != 0
+
+        # İki hole kart ile tamamlanabilecek flush / straight
+        self.flush_possible = self.max_suit_count >= 3
+        self.straight_possible = self.num_cards >= 3 and _max_window_count(self.rank_mask) >= 3
+        self.high_rank = self.rank_mask.bit_length() - 1
+
+    def is_wet(self):
+        """Masa çekiliş ihtimali yüksek mi (flush veya straight mümkün)"""
+        return self.flush_possible or self.straight_possible
+
+# Süreç boyunca paylaşılan masa analizi önbelleği; showdown önbelleğinden
+# ayrı bir LRU, sayaçları `analyze_board.cache_info()` ile okunur
+@lru_cache(maxsize=BOARD_CACHE_CAPACITY)
+def analyze_board(board_mask):
+    """Masa dokusu; aynı masa için önbellekten döner"""
+    return BoardTexture(board_mask)
+
+class HandAnalysis:
+    """Hole kartlar ve masa için çekilişler ve out sayıları"""
+    __slots__ = ("board", "flush_draw", "straight_draw", "made_flush", "made_straight",
+                 "flush_outs", "straight_outs", "outs", "unseen")
+
+    def __init__(self, hole_mask, board_mask):
+        self.board = analyze_board(board_mask)
+        known = hole_mask | board_mask
+        unseen = FULL_DECK_MASK & ~known
+        self.unseen = 52 - popcount(known)
+
+        hole_suits = suit_masks(hole_mask)
+        board_suits = suit_masks(board_mask)
+        hand_ranks = self.board.rank_mask | hole_suits[0] | hole_suits[1] | hole_suits[2] | hole_suits[3]
+        cards_to_come = self.board.num_cards in (3, 4)
+
+        # Flush: hole kartlardan en az biri ile aynı renkte 4 kart
+        self.made_flush = False
+        flush_outs = 0
+        for suit_index in range(4):
+            in_hole = popcount(hole_suits[suit_index])
+            total = in_hole + self.board.suit_counts[suit_index]
+            if in_hole and total >= 5:
+                self.made_flush = True
+            elif in_hole and total == 4 and cards_to_come:
+                flush_outs |= unseen & (SUIT_MASK << (13 * suit_index))
+
+        # Straight: masayı tek başına straight yapmayan, eli straight yapan rankler
+        self.made_straight = has_straight(hand_ranks) and not has_straight(self.board.rank_mask)
+        straight_outs = 0
+        completing_ranks = 0
+        if cards_to_come and not self.made_straight:
+            for rank_index in range(13):
+                bit = 1 << rank_index
+                if hand_ranks & bit:
+                    continue
+                if has_straight(hand_ranks | bit) and not has_straight(self.board.rank_mask | bit):
+                    completing_ranks += 1
+                    for suit_index in range(4):
+                        straight_outs |= unseen & (bit << (13 * suit_index))
+
+        self.flush_draw = flush_outs != 0
+        if completing_ranks >= 2:
+            self.straight_draw = "open_ended"
+        elif completing_ranks == 1:
+            self.straight_draw = "gutshot"
+        else:
+            self.straight_draw = None
+        self.flush_outs = popcount(flush_outs)
+        self.straight_outs = popcount(straight_outs)
+        self.outs = popcount(flush_outs | straight_outs)
+
+    def has_draw(self):
+        """Flush veya straight çekilişi var mı"""
+        return self.outs > 0
+
+    def draw_equity(self):
+        """Kalan kartlarda en az bir out gelme olasılığı"""
+        cards_to_come = 5 - self.board.num_cards if self.board.num_cards >= 3 else 0
+        miss = 1.0
+        for i in range(cards_to_come):
+            miss *= (self.unseen - self.outs - i) / (self.unseen - i)
+        return 1.0 - miss
+
+def analyze_hand(hole_cards, community_cards):
+    """Kart listeleri için el analizi"""
+    return HandAnalysis(cards_to_mask(hole_cards), cards_to_mask(community_cards))
+
+def _has_straight_batch(rank_masks):
+    # Vektörel `has_straight`
+    extended = (rank_masks << 1) | ((rank_masks >> 12) & 1)
+    found = np.zeros(rank_masks.shape, dtype=bool)
+    for window in STRAIGHT_WINDOWS:
+        found |= (extended & window) == window
+    return found
+
+def analyze_batch(hole_masks, board_masks):
+    """`HandAnalysis`'in NumPy karşılığı: (N,) maske dizileri için sözlük.
+
+    Dönen alanlar: outs, made_flush, made_straight ve wet (masada flush
+    veya straight mümkün).
+    """
+    hole_masks = np.asarray(hole_masks, dtype=np.int64)
+    board_masks = np.asarray(board_masks, dtype=np.int64)
+    unseen = FULL_DECK_MASK & ~(hole_masks | board_masks)
+    num_board = np.bitwise_count(board_masks)
+    cards_to_come = (num_board == 3) | (num_board == 4)
+
+    hole_ranks = np.zeros_like(hole_masks)
+    board_ranks = np.zeros_like(board_masks)
+    max_suit = np.zeros_like(board_masks)
+    made_flush = np.zeros(hole_masks.shape, dtype=bool)
+    flush_outs = np.zeros_like(hole_masks)
+    for suit_index in range(4):
+        hole_bits = (hole_masks >> (13 * suit_index)) & SUIT_MASK
+        board_bits = (board_masks >> (13 * suit_index)) & SUIT_MASK
+        hole_ranks |= hole_bits
+        board_ranks |= board_bits
+        in_hole = np.bitwise_count(hole_bits)
+        in_board = np.bitwise_count(board_bits)
+        total = in_hole + in_board
+        max_suit = np.maximum(max_suit, in_board)
+        made_flush |= (in_hole > 0) & (total >= 5)
+        draw = (in_hole > 0) & (total == 4) & cards_to_come
+        flush_outs |= np.where(draw, unseen & (SUIT_MASK << (13 * suit_index)), 0)
+
+    hand_ranks = hole_ranks | board_ranks
+    made_straight = _has_straight_batch(hand_ranks) & ~_has_straight_batch(board_ranks)
+    straight_outs = np.zeros_like(hole_masks)
+    for rank_index in range(13):
+        bit = 1 << rank_index
+        completes = (cards_to_come & ~made_straight & ((hand_ranks & bit) == 0) &
+                     _has_straight_batch(hand_ranks | bit) & ~_has_straight_batch(board_ranks | bit))
+        rank_cards = sum(bit << (13 * suit_index) for suit_index in range(4))
+        straight_outs |= np.where(completes, unseen & rank_cards, 0)
+
+    extended = (board_ranks << 1) | ((board_ranks >> 12) & 1)
+    max_window = np.zeros_like(board_masks)
+    for window in STRAIGHT_WINDOWS:
+        max_window = np.maximum(max_window, np.bitwise_count(extended & window))
+    wet = (max_suit >= 3) | ((num_board >= 3) & (max_window >= 3))
+    return {
+        "outs": np.bitwise_count(flush_outs | straight_outs).astype(np.int64),
+        "made_flush": made_flush,
+        "made_straight": made_straight,
+        "wet": wet
+    }
@@ -0,0 +1,95 @@
+"""Kompakt kart gösterimi.
+
+Destedeki 52 kartın her biri yalnızca bir kez oluşturulur (flyweight) ve
+0..51 arası bir tamsayı ID taşır:
+
+    id = suit_index * 13 + rank_index
+
+rank_index 0 ("2") ile 12 ("ace") arasındadır. Bir kart kümesi (el, masa,
+deste) 64 bitlik bir tamsayı içinde `1 << id` bitleri ile tutulur; böylece
+bir rengin (suit) kartları maskenin ardışık 13 bitine denk gelir.
+"""
+
+SUITS = ["spades", "hearts", "diamonds", "clubs"]
+RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "jack", "queen", "king", "ace"]
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+
+FULL_DECK_MASK = (1 << 52) - 1
+SUIT_MASK = 0x1FFF  # Tek bir rengin 13 bitlik rank maskesi
+
+class Card:
+    """Değiştirilemez kart nesnesi; aynı kart için her zaman aynı nesne döner."""
+    __slots__ = ("id", "suit", "rank", "mask", "suit_index", "rank_index")
+
+    def __new__(cls, suit, rank):
+        return CARDS[SUIT_INDEX[suit] * 13 + RANK_INDEX[rank]]
+
+    @classmethod
+    def _create(cls, card_id):
+        card = object.__new__(cls)
+        card.id = card_id
+        card.suit_index, card.rank_index = divmod(card_id, 13)
+        card.suit = SUITS[card.suit_index]
+        card.rank = RANKS[card.rank_index]
+        card.mask = 1 << card_id
+        return card
+
+    def __str__(self):
+        # ui.py kart resimlerini bu isimle arar (ör. "ace_of_spades")
+        return f"{self.rank}_of_{self.suit}"
+
+    def __repr__(self):
+        return f"Card({self.suit!r}, {self.rank!r})"
+
+    # Kartlar paylaşılan nesneler olduğu için kopyalanmaz
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (card_from_id, (self.id,))
+
+CARDS = tuple(Card._create(card_id) for card_id in range(52))
+
+def card_from_id(card_id):
+    """ID'si verilen kartı döndür"""
+    return CARDS[card_id]
+
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "shdc"
+
+def parse_card(text):
+    """Kısa gösterimdeki kartı döndür (ör. "As", "Td", "9h")"""
+    text = text.strip()
+    rank = text[:-1].upper().replace("10", "T")
+    if len(rank) != 1 or rank not in RANK_CHARS or text[-1].lower() not in SUIT_CHARS:
+        raise ValueError(f"Geçersiz kart: {text!r}")
+    return CARDS[SUIT_CHARS.index(text[-1].lower()) * 13 + RANK_CHARS.index(rank)]
+
+def card_to_str(card):
+    """Kartın kısa gösterimi (ör. "As")"""
+    return RANK_CHARS[card.rank_index] + SUIT_CHARS[card.suit_index]
+
+def cards_to_mask(cards):
+    """Kart listesini bitmaske dönüştür"""
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
+
+def mask_to_cards(mask):
+    """Bitmaskteki kartları ID sırasıyla döndür"""
+    cards = []
+    while mask:
+        low_bit = mask & -mask
+        cards.append(CARDS[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return cards
+
+def popcount(mask):
+    """Maskteki kart sayısı"""
+    return bin(mask).count("1")
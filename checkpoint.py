@@ -0,0 +1,64 @@
+"""Uzun ai_compare / benchmark çalışmaları için kontrol noktası ve devam.
+
+`play_games` (main.py) oyun kayıtlarını sırayla işlerken en fazla
+`interval` saniyede bir, bir oyunun (vektörel motorda bir paketin) sonunda
+kontrol noktası yazar. Kontrol noktası bir JSON dosyasıdır:
+
+* çalışmanın modu, çıktı dosyaları ve `simulate` ayarları (kök tohum dahil)
+* next_game: tamamlanan oyunlar 0..next_game-1 (kayıtlar oyun sırasıyla
+  geldiğinden tamamlananlar her zaman bir öneklidir)
+* akıştan hesaplanan özetin durumu (bkz. results_stream.RunSummary.state)
+* oyun kayıtları ve el geçmişi dosyalarının o anki boyutları, geçen süre
+
+Oyunların rastgelelik akışları kök tohum ve oyun indeksinden türetildiği
+için (bkz. rng_streams.py) RNG durumu kök tohum ve next_game ile tam olarak
+belirlenir; kontrol noktası gerekirken tohum verilmemişse çalışmanın başında
+bir kök tohum üretilir. Devam eden çalışma dosyaları kayıtlı boyutlara
+kırpar ve next_game'den itibaren oynar; sonuçlar kesintisiz bir çalışmayla
+aynıdır. Dosya önce geçici bir dosyaya yazılıp yerine taşınır, bu yüzden
+yazma sırasında kesilen bir çalışma bozuk kontrol noktası bırakmaz.
+Çalışma bittiğinde son kontrol noktası (next_game == num_games) kalır;
+onunla devam etmek yalnızca raporu yeniden üretir.
+"""
+import os
+import json
+import time
+
+VERSION = 1
+DEFAULT_INTERVAL = 60.0
+
+def save_checkpoint(path, state):
+    """Kontrol noktasını atomik olarak yaz"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, **state}, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def load_checkpoint(path):
+    """Kontrol noktasını oku"""
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != VERSION:
+        raise ValueError(f"Desteklenmeyen kontrol noktası sürümü: {state.get('version')}")
+    return state
+
+class Checkpointer:
+    """Periyodik kontrol noktası yazıcısı.
+
+    run_info: her kontrol noktasına eklenen sabit alanlar (mod, çıktı dosyası vb.)
+    """
+
+    def __init__(self, path, interval=DEFAULT_INTERVAL, **run_info):
+        self.path = path
+        self.interval = interval
+        self.run_info = run_info
+        self.last_save = time.monotonic()
+
+    def due(self):
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, **state):
+        save_checkpoint(self.path, {**self.run_info, **state})
+        self.last_save = time.monotonic()
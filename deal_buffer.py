@@ -0,0 +1,44 @@
+"""Toplu simülasyon için önceden üretilmiş dağıtım sıraları.
+
+Vektörel motor her elde masa başına yalnızca 2 * oyuncu + 5 kart kullanır.
+`deal_orders` bu kadar kartı NumPy üzerinde kısmi Fisher–Yates ile bütün
+dağıtımlar için aynı anda seçer: k. adımda her dağıtımın k..51
+pozisyonlarından biri k. pozisyonla takaslanır. Deste (52, N) düzeninde
+tutulur, böylece k. pozisyon bellekte bitişik bir satırdır.
+
+`DealBuffer` milyonlarca dağıtımı tek bir diziye üretir ve dilimler halinde
+verir; dilimler kopyasız görünümlerdir. Tampon bittiğinde aynı üreteçle
+yeniden doldurulur. Farklı süreçler kendi üreteçleriyle kendi tamponlarını
+doldurabilir veya ana süreçte üretilen `deal_orders` dizisinin dilimlerini
+alabilir.
+"""
+import numpy as np
+
+def deal_orders(rng, num_deals, num_cards):
+    """(num_deals, num_cards) int8 kart ID'leri; her satır tekrarsız rastgele kartlar"""
+    deck = np.repeat(np.arange(52, dtype=np.int8)[:, None], num_deals, axis=1)
+    columns = np.arange(num_deals)
+    for position in range(num_cards):
+        swap = rng.integers(position, 52, size=num_deals)
+        picked = deck[swap, columns]
+        deck[swap, columns] = deck[position]
+        deck[position] = picked
+    return np.ascontiguousarray(deck[:num_cards].T)
+
+class DealBuffer:
+    """`deal_orders` tamponu; `take(count)` sıradaki `count` dağıtımı verir"""
+
+    def __init__(self, num_cards, capacity, rng):
+        self.num_cards = num_cards
+        self.capacity = max(1, capacity)
+        self.rng = rng
+        self.orders = np.empty((0, num_cards), dtype=np.int8)
+        self.position = 0
+
+    def take(self, count):
+        if self.position + count > len(self.orders):
+            self.orders = deal_orders(self.rng, max(self.capacity, count), self.num_cards)
+            self.position = 0
+        start = self.position
+        self.position += count
+        return self.orders[start:self.position]
@@ -0,0 +1,166 @@
+"""Equity hesaplayıcı.
+
+"Bilinen ölü kartlar varken K rakibe karşı equity'm nedir?" sorusunu
+cevaplar:
+
+* Masada en fazla 2 kart açılacaksa ve tek rakip varsa, tüm masa
+  tamamlamaları ve rakip elleri tek tek sayılır (kesin sonuç).
+* Diğer durumlarda (preflop, flop'ta çok rakip vb.) Monte Carlo
+  kullanılır. Örnekler sabit boyutlu paketler halinde (isteğe bağlı olarak
+  birden fazla süreçte) üretilir ve standart hata hedefe inene kadar devam
+  edilir. Her paketin tohumu sırasına göre belirlendiği için sonuç, kullanılan
+  süreç sayısından bağımsızdır.
+
+Eşitliklerde pot paylaşılır: eşit en iyi ele sahip t oyuncudan her biri 1/t
+pay alır.
+"""
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import batch_evaluator
+
+DEFAULT_TARGET_SE = 0.005
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_MAX_SAMPLES = 1000000
+
+def showdown_share(hero_ranks, villain_ranks):
+    """(S,) kahraman skorları ve (S, K) rakip skorları -> (S,) pot payı"""
+    best = villain_ranks.min(axis=1)
+    ties = (villain_ranks == hero_ranks[:, None]).sum(axis=1)
+    return np.where(hero_ranks < best, 1.0, np.where(hero_ranks == best, 1.0 / (ties + 1), 0.0))
+
+def _remaining_ids(known_ids):
+    known = set(known_ids)
+    if len(known) != len(known_ids):
+        raise ValueError("Aynı kart birden fazla kez verilmiş")
+    return np.array([card_id for card_id in range(52) if card_id not in known], dtype=np.int64)
+
+def _exact_equity(hole_ids, board_ids, remaining):
+    # Tek rakibe karşı tüm masa tamamlamaları ve rakip elleri
+    runouts = np.array(list(itertools.combinations(remaining, 5 - len(board_ids))), dtype=np.int64)
+    runouts = runouts.reshape(len(runouts), 5 - len(board_ids))
+    boards = np.hstack([np.tile(np.array(board_ids, dtype=np.int64), (len(runouts), 1)), runouts])
+    villains = np.array(list(itertools.combinations(remaining, 2)), dtype=np.int64)
+
+    hero_ranks = batch_evaluator.evaluate_matrix(np.array([hole_ids], dtype=np.int64), boards)[0]
+    villain_ranks = batch_evaluator.evaluate_matrix(villains, boards)
+    valid = ~batch_evaluator.overlap_mask(villains, runouts)
+
+    hero = np.broadcast_to(hero_ranks[None, :], villain_ranks.shape)[valid]
+    share = showdown_share(hero, villain_ranks[valid][:, None])
+    return {
+        "equity": float(share.mean()),
+        "std_error": 0.0,
+        "samples": int(share.size),
+        "exact": True
+    }
+
+def _sample_batch(hole_ids, board_ids, remaining, num_opponents, batch_size, seed):
+    """Bir Monte Carlo paketi; (pay toplamı, kare toplamı, örnek sayısı) döndür"""
+    rng = np.random.default_rng(seed)
+    missing = 5 - len(board_ids)
+    drawn = rng.permuted(np.tile(remaining, (batch_size, 1)), axis=1)[:, :missing + 2 * num_opponents]
+
+    boards = np.hstack([np.tile(np.array(board_ids, dtype=np.int64), (batch_size, 1)), drawn[:, :missing]])
+    hero_ranks = batch_evaluator.evaluate_hands(np.hstack([np.tile(np.array(hole_ids, dtype=np.int64), (batch_size, 1)), boards]))
+    villain_ranks = np.stack([
+        batch_evaluator.evaluate_hands(np.hstack([drawn[:, missing + 2 * k:missing + 2 * k + 2], boards]))
+        for k in range(num_opponents)
+    ], axis=1)
+    share = showdown_share(hero_ranks, villain_ranks)
+    return float(share.sum()), float((share * share).sum()), batch_size
+
+def _monte_carlo_equity(hole_ids, board_ids, remaining, num_opponents, target_se, max_samples,
+                        batch_size, seed, executor):
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-max_samples // batch_size)))
+    total = total_sq = 0.0
+    samples = 0
+
+    def finished():
+        if samples < 2:
+            return False
+        mean = total / samples
+        variance = max(total_sq / samples - mean * mean, 0.0)
+        return (variance / samples) ** 0.5 <= target_se or samples >= max_samples
+
+    if executor is None:
+        for batch_seed in seeds:
+            batch_total, batch_sq, batch_samples = _sample_batch(
+                hole_ids, board_ids, remaining, num_opponents, batch_size, batch_seed)
+            total += batch_total
+            total_sq += batch_sq
+            samples += batch_samples
+            if finished():
+                break
+    else:
+        # Paketler süreç havuzuna sırayla gönderilir ve sırayla tüketilir
+        window = 2 * (os.cpu_count() or 1)
+        pending = []
+        next_batch = 0
+        while True:
+            while next_batch < len(seeds) and len(pending) < window:
+                pending.append(executor.submit(_sample_batch, hole_ids, board_ids, remaining,
+                                               num_opponents, batch_size, seeds[next_batch]))
+                next_batch += 1
+            if not pending:
+                break
+            batch_total, batch_sq, batch_samples = pending.pop(0).result()
+            total += batch_total
+            total_sq += batch_sq
+            samples += batch_samples
+            if finished():
+                break
+        for future in pending:
+            future.cancel()
+
+    mean = total / samples
+    variance = max(total_sq / samples - mean * mean, 0.0)
+    return {
+        "equity": mean,
+        "std_error": (variance / samples) ** 0.5,
+        "samples": samples,
+        "exact": False
+    }
+
+def calculate_equity(hole_cards, community_cards=(), num_opponents=1, dead_cards=(),
+                     target_se=DEFAULT_TARGET_SE, max_samples=DEFAULT_MAX_SAMPLES,
+                     batch_size=DEFAULT_BATCH_SIZE, seed=0, executor=None):
+    """Elin rastgele rakiplere karşı equity'sini hesapla.
+
+    Args:
+        hole_cards: İki hole kart
+        community_cards: Açılmış masa kartları (0, 3, 4 veya 5)
+        num_opponents: Rakip sayısı
+        dead_cards: Oyunda olmadığı bilinen kartlar
+        target_se: Monte Carlo için hedef standart hata
+        max_samples: Monte Carlo örnek üst sınırı
+        batch_size: Paket başına örnek sayısı
+        seed: Paket tohumlarını üreten kök tohum
+        executor: Paketleri paralel çalıştıracak süreç havuzu (opsiyonel)
+    Returns:
+        equity, std_error, samples ve exact alanlarını içeren sözlük
+    """
+    if len(hole_cards) != 2:
+        raise ValueError("Tam olarak iki hole kart gerekli")
+    if len(community_cards) > 5 or num_opponents < 1:
+        raise ValueError("Geçersiz masa kartı veya rakip sayısı")
+
+    hole_ids = [card.id for card in hole_cards]
+    board_ids = [card.id for card in community_cards]
+    remaining = _remaining_ids(hole_ids + board_ids + [card.id for card in dead_cards])
+    if len(remaining) < 5 - len(board_ids) + 2 * num_opponents:
+        raise ValueError("Destede yeterli kart yok")
+
+    if num_opponents == 1 and len(board_ids) >= 3:
+        return _exact_equity(hole_ids, board_ids, remaining)
+    return _monte_carlo_equity(hole_ids, board_ids, remaining, num_opponents, target_se,
+                               max_samples, batch_size, seed, executor)
+
+def create_executor(workers):
+    """Monte Carlo için süreç havuzu (workers <= 1 ise None)"""
+    if workers and workers > 1:
+        return ProcessPoolExecutor(max_workers=workers)
+    return None
@@ -1,9 +1,14 @@
-import random
-import copy
 from enum import Enum
-from treys import Card as TreysCard, Evaluator
 
+import board_texture
+import preflop_equity
 from poker import Player
+from hand_evaluator import el_gucu_hesapla, evaluate_mask
+
+# treys skor sınırları: bu değerden kötü eller yalnızca yüksek kart,
+# bu değerden iyi eller en az straight
+HIGH_CARD_SCORE = 6185
+STRAIGHT_SCORE = 1609
 
 class NodeType(Enum):
     MAX = 1      # Bizim hamlemiz
@@ -16,12 +21,12 @@ class ExpectiminimaxNode:
         self.node_type = node_type
         self.depth = depth
         self.player_id = player_id  # MAX node için oyuncu ID'si
-        self.parent_action = parent_action  # Bu düğüme gelmek için yapılan aksiyon
+        self.parent_action = parent_action  # Bu düğüme gelmek için yapılan (aksiyon, miktar)
         self.children = []
         
-    def get_possible_actions(self):
-        # Mevcut durumda yapılabilecek aksiyonlar
-        return ["fold", "call", "raise"]
+    def get_possible_actions(self, bet_sizes=None):
+        # Mevcut durumda yapılabilecek (aksiyon, miktar) çiftleri
+        return self.game_state.legal_actions(bet_sizes)
         
     def is_terminal(self):
         # Oyun durumu terminal mi (oyun bitti mi)
@@ -29,48 +34,69 @@ class ExpectiminimaxNode:
         return self.game_state.is_terminal() or self.depth <= 0
 
 class ExpectiminimaxAgent(Player):
-    def __init__(self, name, stack, max_depth=3):
+    def __init__(self, name, stack, max_depth=3, bet_sizes=None):
         super().__init__(name, stack)
         self.max_depth = max_depth
-        self.evaluator = Evaluator()
+        self.bet_sizes = bet_sizes  # None: süreç geneli pot oranları (bkz. bet_abstraction.py)
+        self.chosen_raise = None  # Son kararda seçilen raise miktarı
         self.player_id = None  # Oyun başladığında atanacak
         
     def get_action(self, game_state):
         # Expectiminimax algoritması ile en iyi aksiyonu seç
+        self.chosen_raise = None
         try:
             self.player_id = game_state.current_player_id
-            root = ExpectiminimaxNode(copy.deepcopy(game_state), NodeType.MAX, self.max_depth, self.player_id)
+            # Tüm arama tek bir durum üzerinde apply/undo ile yapılır
+            state = game_state.export_state()
+            root = ExpectiminimaxNode(state, NodeType.MAX, self.max_depth, self.player_id)
             
             # Her bir aksiyonun değerini hesapla
             best_value = -float('inf')
-            best_action = "fold"  # Varsayılan aksiyon
+            best_action = None
             
-            for action in root.get_possible_actions():
-                new_game_state = self.simulate_action(root.game_state, action)
+            for action in self.get_candidate_actions(state):
+                token = self.apply_action(state, action)
                 
                 # Aksiyonu değerlendir
-                if action == "fold":
+                if action[0] == "fold":
                     # Fold aksiyonu - Pot'u kaybederiz, stack değişmez
-                    value = self.evaluate_folding(new_game_state)
+                    value = self.evaluate_folding(state)
                 else:
-                    # Call veya raise aksiyonu - Expectiminimax değerini hesapla
-                    next_node_type = NodeType.MIN if new_game_state.current_player_id != self.player_id else NodeType.MAX
-                    child = ExpectiminimaxNode(new_game_state, next_node_type, self.max_depth-1, new_game_state.current_player_id, action)
+                    # Check, call veya raise aksiyonu - Expectiminimax değerini hesapla
+                    next_node_type = NodeType.MIN if state.current_player_id != self.player_id else NodeType.MAX
+                    child = ExpectiminimaxNode(state, next_node_type, self.max_depth-1, state.current_player_id, action)
                     value = self.expectiminimax(child)
+                state.undo(token)
                 
                 # En iyi aksiyonu seç
                 if value > best_value:
                     best_value = value
                     best_action = action
                     
-            return best_action
+            action, amount = best_action
+            if action == "raise":
+                self.chosen_raise = amount
+            return action
         except Exception as e:
             # Herhangi bir hata durumunda güvenli bir varsayılan aksiyon döndür
             print(f"ExpectiminimaxAgent hatası: {e}")
             return "call"
     
+    def get_candidate_actions(self, game_state):
+        # Kendi hamlelerimiz: çekilişi olmayan yüksek kart ellerde raise dallarını buda
+        actions = game_state.legal_actions(self.bet_sizes)
+        if len(game_state.board) < 3:
+            return actions
+        analysis = board_texture.HandAnalysis(self.hand_mask, game_state.board_mask)
+        if not analysis.has_draw() and self.current_hand_score(game_state) > HIGH_CARD_SCORE:
+            actions = [action for action in actions if action[0] != "raise"]
+        return actions
+    
     def get_raise_amount(self, game_state):
-        # Basit bir heuristik: pot'un %60'ı
+        # Aramada seçilen raise miktarı
+        if self.chosen_raise is not None:
+            return self.chosen_raise
+        # Arama yapılmadıysa basit bir heuristik: pot'un %60'ı
         needed_to_call = game_state.current_bet - self.bet
         raise_amount = needed_to_call + int(0.6 * game_state.pot)
         
@@ -84,16 +110,18 @@ class ExpectiminimaxAgent(Player):
         if node.is_terminal():
             return self.evaluate_terminal(node.game_state)
             
-        # Düğüm tipine göre farklı hesapla
+        # Düğüm tipine göre farklı hesapla; çocuklar aynı durumu paylaşır
+        state = node.game_state
         if node.node_type == NodeType.MAX:
             # En yüksek değeri seç (bizim hamlemiz)
             value = -float('inf')
             
-            for action in node.get_possible_actions():
-                new_game_state = self.simulate_action(node.game_state, action)
-                next_node_type = NodeType.MIN if new_game_state.current_player_id != self.player_id else NodeType.MAX
-                child = ExpectiminimaxNode(new_game_state, next_node_type, node.depth-1, new_game_state.current_player_id, action)
+            for action in self.get_candidate_actions(state):
+                token = self.apply_action(state, action)
+                next_node_type = NodeType.MIN if state.current_player_id != self.player_id else NodeType.MAX
+                child = ExpectiminimaxNode(state, next_node_type, node.depth-1, state.current_player_id, action)
                 value = max(value, self.expectiminimax(child))
+                state.undo(token)
                 
             return value
             
@@ -101,17 +129,18 @@ class ExpectiminimaxAgent(Player):
             # En düşük değeri seç (rakip hamlesi)
             value = float('inf')
             
-            for action in node.get_possible_actions():
-                new_game_state = self.simulate_action(node.game_state, action)
+            for action in node.get_possible_actions(self.bet_sizes):
+                token = self.apply_action(state, action)
                 
                 # Bir sonraki kart açılacaksa CHANCE, değilse MAX/MIN
-                if self.is_next_community_card(new_game_state):
+                if self.is_next_community_card(state):
                     next_node_type = NodeType.CHANCE
                 else:
-                    next_node_type = NodeType.MAX if new_game_state.current_player_id == self.player_id else NodeType.MIN
+                    next_node_type = NodeType.MAX if state.current_player_id == self.player_id else NodeType.MIN
                     
-                child = ExpectiminimaxNode(new_game_state, next_node_type, node.depth-1, new_game_state.current_player_id, action)
+                child = ExpectiminimaxNode(state, next_node_type, node.depth-1, state.current_player_id, action)
                 value = min(value, self.expectiminimax(child))
+                state.undo(token)
                 
             return value
             
@@ -121,109 +150,96 @@ class ExpectiminimaxAgent(Player):
             num_scenarios = min(5, node.depth*2)  # Hesaplama maliyeti için sınırlı sayıda senaryo
             
             for _ in range(num_scenarios):
-                new_game_state = copy.deepcopy(node.game_state)
-                self.simulate_next_community_card(new_game_state)
+                token = self.simulate_next_community_card(state)
                 
-                next_node_type = NodeType.MAX if new_game_state.current_player_id == self.player_id else NodeType.MIN
-                child = ExpectiminimaxNode(new_game_state, next_node_type, node.depth-1, new_game_state.current_player_id)
+                next_node_type = NodeType.MAX if state.current_player_id == self.player_id else NodeType.MIN
+                child = ExpectiminimaxNode(state, next_node_type, node.depth-1, state.current_player_id)
                 
                 # Her senaryonun eşit olasılığı var
                 value += self.expectiminimax(child) / num_scenarios
+                state.undo(token)
                 
             return value
     
-    def simulate_action(self, game_state, action):
-        # Aksiyonu simüle et
-        new_game_state = copy.deepcopy(game_state)
-        current_player = new_game_state.get_current_player()
-        
-        # Aksiyonu uygula
-        if action == "fold":
-            # Fold aksiyonu - oyuncu eli bırakır
-            current_player.is_folded = True
-        elif action == "call":
-            # Call aksiyonu - mevcut bet kadar çağırır
-            call_amount = new_game_state.current_bet - current_player.bet
-            if call_amount > 0:
-                current_player.stack -= call_amount
-                current_player.bet += call_amount
-                new_game_state.pot += call_amount
-        elif action == "raise":
-            # Raise aksiyonu - yeni bet miktarı
-            raise_amount = self.get_raise_amount(new_game_state)
-            current_player.stack -= raise_amount
-            current_player.bet += raise_amount
-            new_game_state.current_bet = current_player.bet
-            new_game_state.pot += raise_amount
-        
-        # Bir sonraki oyuncuya geç
-        new_game_state.next_player()
-        
-        return new_game_state
+    def apply_action(self, game_state, action):
+        # (aksiyon, miktar) çiftini durum üzerinde yerinde uygula; geri alma jetonu döndür
+        return game_state.apply(*action)
     
     def is_next_community_card(self, game_state):
         # Bir sonraki aşamada community card açılacak mı
         # Bahis turu tamamlandıysa ve henüz 5 kart açılmadıysa
-        if game_state.is_betting_round_done() and len(game_state.community_cards) < 5:
+        if game_state.is_betting_round_done() and len(game_state.board) < 5:
             return True
             
         # Flop öncesiyse (preflop aşaması bitmiş)
-        if len(game_state.community_cards) == 0 and game_state.is_preflop_done():
+        if len(game_state.board) == 0 and game_state.is_preflop_done():
             return True
             
         # Turn öncesiyse (flop aşaması bitmiş)
-        if len(game_state.community_cards) == 3 and game_state.is_flop_done():
+        if len(game_state.board) == 3 and game_state.is_flop_done():
             return True
             
         # River öncesiyse (turn aşaması bitmiş)
-        if len(game_state.community_cards) == 4 and game_state.is_turn_done():
+        if len(game_state.board) == 4 and game_state.is_turn_done():
             return True
             
         return False
     
     def simulate_next_community_card(self, game_state):
-        # Bir sonraki community card'ı simüle et
-        # Önce mevcut dağıtılmış kartları belirle
-        used_cards = []
-        
-        # Oyuncuların elindeki kartlar
-        for player in game_state.players:
-            for card in player.hand:
-                used_cards.append(card)
-        
-        # Masa kartları
-        for card in game_state.community_cards:
-            used_cards.append(card)
-        
-        # Kullanılmayan kartlardan rastgele seç
-        available_cards = [card for card in game_state.deck.cards if card not in used_cards]
+        # Bir sonraki community card'ı simüle et; geri alma jetonu döndür
+        # Önce mevcut dağıtılmış kartları belirle (oyuncuların elleri ve masa)
+        used_mask = game_state.board_mask
+        for hand_mask in game_state.hands:
+            used_mask |= hand_mask
         
+        new_cards = []
         # Flop (3 kart)
-        if len(game_state.community_cards) == 0:
-            if len(available_cards) >= 3:
-                flop_cards = random.sample(available_cards, 3)
-                game_state.community_cards.extend(flop_cards)
-        # Turn (1 kart)
-        elif len(game_state.community_cards) == 3:
-            if len(available_cards) >= 1:
-                turn_card = random.choice(available_cards)
-                game_state.community_cards.append(turn_card)
-        # River (1 kart)
-        elif len(game_state.community_cards) == 4:
-            if len(available_cards) >= 1:
-                river_card = random.choice(available_cards)
-                game_state.community_cards.append(river_card)
+        if len(game_state.board) == 0:
+            flop_cards = game_state.sample_cards(3, used_mask, self.rng)
+            if len(flop_cards) == 3:
+                new_cards = flop_cards
+        # Turn ve River (1 kart)
+        elif len(game_state.board) in (3, 4):
+            new_cards = game_state.sample_cards(1, used_mask, self.rng)
+        return game_state.apply_community_cards(new_cards)
                 
     def evaluate_terminal(self, game_state):
         # Terminal düğümün değerini hesapla
         if self.is_showdown(game_state):
             # Showdown - el gücüne göre değerlendir
-            hand_score = self.calculate_hand_score(self.hand, game_state.community_cards)
+            hand_score = self.current_hand_score(game_state)
             return self.convert_hand_score_to_value(hand_score)
+        elif not game_state.is_terminal() and len(game_state.board) >= 3:
+            # Derinlik sınırı - eldeki skor ve çekilişlerin tamamlanma olasılığı
+            return self.evaluate_cutoff(game_state)
+        elif not game_state.is_terminal() and preflop_equity.is_available():
+            # Flop öncesi derinlik sınırı - rastgele rakiplere karşı preflop equity
+            return self.evaluate_preflop_cutoff(game_state)
         else:
             # Fold durumu - kalan oyuncu sayısına göre değerlendir
             return self.evaluate_non_showdown(game_state)
     
+    def evaluate_cutoff(self, game_state):
+        # Henüz açılmamış kartlar varken elin değeri; çekiliş tamamlanırsa
+        # el en az straight seviyesine çıkar
+        value = self.convert_hand_score_to_value(self.current_hand_score(game_state))
+        analysis = board_texture.HandAnalysis(self.hand_mask, game_state.board_mask)
+        if analysis.has_draw():
+            draw_value = self.convert_hand_score_to_value(STRAIGHT_SCORE)
+            if draw_value > value:
+                equity = analysis.draw_equity()
+                value = equity * draw_value + (1.0 - equity) * value
+        return value
+    
+    def evaluate_preflop_cutoff(self, game_state):
+        # Equity'yi showdown değerleriyle aynı [-1, 1] aralığına taşı
+        equity = preflop_equity.equity_vs_random(self.hand, len(game_state.active_seats()) - 1)
+        return 2.0 * equity - 1.0
+    
+    def current_hand_score(self, game_state):
+        # Simüle edilen masa kartlarıyla birlikte kendi elimizin skoru
+        return evaluate_mask(self.hand_mask | game_state.board_mask)
+    
     def evaluate_folding(self, game_state):
         # Fold aksiyonunun değerini hesapla
         # Bu genellikle en kötü değerdir, çünkü pot'u kaybederiz
@@ -231,7 +247,7 @@ class ExpectiminimaxAgent(Player):
     
     def is_showdown(self, game_state):
         # Showdown aşamasında mıyız
-        return len(game_state.community_cards) == 5 and not game_state.is_terminal()
+        return len(game_state.board) == 5 and not game_state.is_terminal()
     
     def evaluate_non_showdown(self, game_state):
         # Fold durumunda değerlendirme
@@ -249,36 +265,9 @@ class ExpectiminimaxAgent(Player):
         return normalized_score
     
     def calculate_hand_score(self, hole_cards, community_cards):
-        # Treys evaluator kullanarak el skorunu hesapla
-        evaluator = Evaluator()
-        
-        # Kartları Treys formatına dönüştür
-        treys_hole_cards = []
-        for card in hole_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            treys_hole_cards.append(treys_card)
-        
-        treys_community_cards = []
-        for card in community_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            treys_community_cards.append(treys_card)
-        
-        # El skorunu hesapla (1 en iyi, 7462 en kötü)
-        score = evaluator.evaluate(treys_community_cards, treys_hole_cards)
-        return score
+        # Ortak evaluator ile el skorunu hesapla (1 en iyi, 7462 en kötü)
+        return el_gucu_hesapla(hole_cards, community_cards)
     
     def is_folded(self, player_id, game_state):
-        for player in game_state.players:
-            if player.id == player_id:
-                return player.is_folded
-        return False 
\ No newline at end of file
+        seat = game_state.seat_of(player_id)
+        return seat is not None and bool(game_state.folded[seat]) 
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""Flop'ta el gücü dağılımı (E[HS], E[HS²]) tabloları.
+
+Ham el skoru yalnızca o anki eli ölçer; flush/straight çekilişlerini ve
+elin gelişme potansiyelini görmez. Bu modül her kanonik flop (1755 adet,
+bkz. isomorphism.py) ve her hole kart çifti için turn + river'ın tüm
+tamamlamaları üzerinden şu değerleri önceden hesaplar:
+
+* HS: river'da rastgele tek bir rakip ele karşı kazanma oranı (beraberlik
+  yarım sayılır), kart çakışmaları hariç tutularak tam sayılır
+* E[HS] ve E[HS²]: tüm turn/river tamamlamaları üzerinden ortalamalar
+* HS dağılımının HISTOGRAM_BINS eşit aralıklı histogramı
+
+Tablo düzeni (uint16, değer * 65535):
+
+    [flop indeksi][kart çifti indeksi][E[HS], E[HS²], histogram...]
+
+Kart çifti indeksi iki kart ID'sinden (a < b) `b * (b - 1) / 2 + a` ile
+hesaplanır; flop ile çakışan çiftlerin kayıtları sıfırdır. Dosya
+`python flop_strength.py` ile (isteğe bağlı olarak birden fazla süreçte)
+geçici bir dosyaya üretilir ve tamamlandığında yerine taşınır; yarıda kalan
+bir üretim tablo dosyası bırakmaz. Dosya ilk sorguda boyutu doğrulanarak
+memory-map edilir; sorgular tek bir dizi okumasıdır.
+"""
+import os
+import sys
+import mmap
+import argparse
+import itertools
+
+import numpy as np
+
+from cards import cards_to_mask, mask_to_cards
+from isomorphism import apply_permutation, canonical_permutation
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables", "flop_strength.bin")
+
+NUM_FLOPS = 1755  # Kanonik flop sayısı
+NUM_PAIRS = 52 * 51 // 2
+HISTOGRAM_BINS = 8
+FIELDS = 2 + HISTOGRAM_BINS
+SCALE = 65535
+TABLE_BYTES = NUM_FLOPS * NUM_PAIRS * FIELDS * 2
+
+# River'da rakibin alabileceği el sayısı: masanın 5 kartı ve hero'nun 2
+# kartı dışındaki 45 karttan C(45, 2)
+NUM_OPPONENT_HANDS = 45 * 44 // 2
+
+def pair_index(first_id, second_id):
+    """İki kart ID'sinden kart çifti indeksi (0..1325)"""
+    low, high = min(first_id, second_id), max(first_id, second_id)
+    return high * (high - 1) // 2 + low
+
+FLOPS = None
+FLOP_INDEX = None
+
+def canonical_flops():
+    """Kanonik flop maskeleri (sıralı) ve maske -> indeks sözlüğü"""
+    global FLOPS, FLOP_INDEX
+    if FLOPS is None:
+        masks = set()
+        for ids in itertools.combinations(range(52), 3):
+            mask = (1 << ids[0]) | (1 << ids[1]) | (1 << ids[2])
+            masks.add(apply_permutation(mask, canonical_permutation(0, mask)))
+        FLOPS = sorted(masks)
+        FLOP_INDEX = {mask: index for index, mask in enumerate(FLOPS)}
+    return FLOPS, FLOP_INDEX
+
+TABLE = None
+
+def _check_size(path):
+    # Eksik ya da başka düzende üretilmiş tablo sessizce yanlış değer vermesin
+    size = os.path.getsize(path)
+    if size != TABLE_BYTES:
+        raise ValueError(f"Flop el gücü tablosu '{path}' {size} bayt, {TABLE_BYTES} bayt olmalı; "
+                         "`python flop_strength.py` ile yeniden üretin")
+
+def load(path=TABLE_PATH):
+    """Tabloyu ilk kullanımda (boyutunu doğrulayarak) memory-map et"""
+    global TABLE
+    if TABLE is None:
+        _check_size(path)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        TABLE = memoryview(mapped).cast("H")
+    return TABLE
+
+def is_available(path=TABLE_PATH):
+    """Tablo dosyası mevcut mu; dosya varsa ama boyutu yanlışsa ValueError"""
+    if TABLE is not None:
+        return True
+    if not os.path.exists(path):
+        return False
+    _check_size(path)
+    return True
+
+def _record_offset(hole_cards, community_cards):
+    # Eli ve flop'u kanonik renklere taşıyıp kaydın başlangıç indeksini bul
+    _, flop_index = canonical_flops()
+    board_mask = cards_to_mask(community_cards)
+    perm = canonical_permutation(0, board_mask)
+    first, second = (perm[card.suit_index] * 13 + card.rank_index for card in hole_cards)
+    record = flop_index[apply_permutation(board_mask, perm)] * NUM_PAIRS + pair_index(first, second)
+    return record * FIELDS
+
+def expected_strength(hole_cards, community_cards):
+    """Flop'taki elin (E[HS], E[HS²]) değerleri"""
+    table = load()
+    offset = _record_offset(hole_cards, community_cards)
+    return table[offset] / SCALE, table[offset + 1] / SCALE
+
+def strength_histogram(hole_cards, community_cards):
+    """River'daki HS dağılımının histogramı (oranlar, toplamı ~1)"""
+    table = load()
+    offset = _record_offset(hole_cards, community_cards)
+    return [table[offset + 2 + k] / SCALE for k in range(HISTOGRAM_BINS)]
+
+def expected_strength_batch(hole_ids, flop_ids):
+    """(N, 2) hole ve (N, 3) flop kart ID'leri için (E[HS], E[HS²]) dizileri.
+
+    Renk permütasyonu `canonical_permutation(0, flop)` ile aynıdır: renkler
+    flop'taki rank maskelerine göre (eşitlikte renk sırasıyla) büyükten
+    küçüğe dizilir.
+    """
+    flops, _ = canonical_flops()
+    hole_ids = np.asarray(hole_ids, dtype=np.int64)
+    flop_ids = np.asarray(flop_ids, dtype=np.int64)
+    rows = np.arange(len(flop_ids))[:, None]
+
+    suit_bits = np.zeros((len(flop_ids), 4), dtype=np.int64)
+    for k in range(flop_ids.shape[1]):
+        np.bitwise_or.at(suit_bits, (rows[:, 0], flop_ids[:, k] // 13), 1 << (flop_ids[:, k] % 13))
+    order = np.argsort(-suit_bits, axis=1, kind="stable")
+    perm = np.empty_like(order)
+    perm[rows, order] = np.arange(4)
+
+    canonical_flop = perm[rows, flop_ids // 13] * 13 + flop_ids % 13
+    flop_masks = np.bitwise_or.reduce(np.left_shift(1, canonical_flop), axis=1)
+    flop_index = np.searchsorted(np.array(flops, dtype=np.int64), flop_masks)
+
+    canonical_hole = perm[rows, hole_ids // 13] * 13 + hole_ids % 13
+    high, low = canonical_hole.max(axis=1), canonical_hole.min(axis=1)
+    offsets = (flop_index * NUM_PAIRS + high * (high - 1) // 2 + low) * FIELDS
+
+    table = np.frombuffer(load(), dtype=np.uint16)
+    return table[offsets] / SCALE, table[offsets + 1] / SCALE
+
+def _sorted_counts(rows, values, row_index):
+    # Her satır sıralıyken, değerden büyük ve değere eşit eleman sayıları.
+    # Satırlar ofsetlenerek tek bir searchsorted çağrısında birleştirilir.
+    width = rows.shape[-1]
+    stride = 1 << 13  # Tüm skorlardan (<= 7462) büyük
+    flat = (np.sort(rows, axis=-1) + np.arange(rows.shape[0])[:, None] * stride).ravel()
+    keys = values + row_index * stride
+    right = np.searchsorted(flat, keys, side="right")
+    left = np.searchsorted(flat, keys, side="left")
+    return (row_index + 1) * width - right, right - left
+
+def flop_records(flop_ids):
+    """Tek bir flop için (NUM_PAIRS, FIELDS) float kayıt dizisi"""
+    import batch_evaluator
+
+    remaining = np.array([card_id for card_id in range(52) if card_id not in flop_ids], dtype=np.int64)
+    local = np.array(list(itertools.combinations(range(len(remaining)), 2)), dtype=np.int64)
+    pairs = remaining[local]
+    num_pairs = len(pairs)
+    boards = np.hstack([np.tile(np.array(flop_ids, dtype=np.int64), (num_pairs, 1)), pairs])
+
+    # ranks[b, p]: b. turn/river tamamlamasında p. elin skoru; çakışanlar 0
+    valid = ~batch_evaluator.overlap_mask(pairs, pairs).T
+    ranks = np.where(valid, batch_evaluator.evaluate_matrix(pairs, boards).T, 0)
+
+    # Masadaki tüm eller arasında daha kötü ve eşit skorlu eller
+    board_index = np.broadcast_to(np.arange(num_pairs)[:, None], ranks.shape)
+    worse, equal = _sorted_counts(ranks, ranks, board_index)
+
+    # Hero'nun kartlarından birini içeren eller rakip olamaz: kart başına
+    # (masa, kart, diğer kart) skor matrisi üzerinden bu elleri çıkar
+    by_card = np.zeros((num_pairs, len(remaining), len(remaining)), dtype=np.int64)
+    by_card[:, local[:, 0], local[:, 1]] = ranks
+    by_card[:, local[:, 1], local[:, 0]] = ranks
+    by_card = by_card.reshape(-1, len(remaining))
+    worse_first, equal_first = _sorted_counts(by_card, ranks, board_index * len(remaining) + local[:, 0])
+    worse_second, equal_second = _sorted_counts(by_card, ranks, board_index * len(remaining) + local[:, 1])
+
+    wins = worse - worse_first - worse_second
+    ties = equal - equal_first - equal_second + 1
+    strength = (wins + 0.5 * ties) / NUM_OPPONENT_HANDS
+
+    runouts = valid.sum(axis=0)
+    records = np.zeros((NUM_PAIRS, FIELDS), dtype=np.float64)
+    indices = pairs[:, 1] * (pairs[:, 1] - 1) // 2 + pairs[:, 0]
+    records[indices, 0] = np.where(valid, strength, 0.0).sum(axis=0) / runouts
+    records[indices, 1] = np.where(valid, strength * strength, 0.0).sum(axis=0) / runouts
+    bins = np.minimum((strength * HISTOGRAM_BINS).astype(np.int64), HISTOGRAM_BINS - 1)
+    for k in range(HISTOGRAM_BINS):
+        records[indices, 2 + k] = ((bins == k) & valid).sum(axis=0) / runouts
+    return records
+
+def _build_flops(path, flop_indices):
+    # Verilen flop'ları hesaplayıp tablo dosyasındaki yerlerine yaz
+    flops, _ = canonical_flops()
+    table = np.memmap(path, dtype=np.uint16, mode="r+", shape=(len(flops), NUM_PAIRS, FIELDS))
+    for index in flop_indices:
+        flop_ids = [card.id for card in mask_to_cards(flops[index])]
+        table[index] = np.round(flop_records(flop_ids) * SCALE).astype(np.uint16)
+    table.flush()
+    return len(flop_indices)
+
+def build_table(path=TABLE_PATH, workers=1, chunk_size=16):
+    """Tabloyu üret ve diske yaz; flop'lar süreçler arasında paylaştırılır.
+
+    Tablo `path`.tmp dosyasına yazılır ve tamamlandığında `path`'e taşınır.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    flops, _ = canonical_flops()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    np.memmap(temp_path, dtype=np.uint16, mode="w+", shape=(len(flops), NUM_PAIRS, FIELDS)).flush()
+
+    chunks = [list(range(start, min(start + chunk_size, len(flops))))
+              for start in range(0, len(flops), chunk_size)]
+    done = 0
+    if workers <= 1:
+        for chunk in chunks:
+            done += _build_flops(temp_path, chunk)
+            print(f"Flop: {done}/{len(flops)} tamamlandı", file=sys.stderr)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_build_flops, temp_path, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                done += future.result()
+                print(f"Flop: {done}/{len(flops)} tamamlandı", file=sys.stderr)
+    os.replace(temp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Flop el gücü dağılımı tablolarını üret")
+    parser.add_argument("--output", default=TABLE_PATH, help="Tablo dosyası")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Paralel süreç sayısı")
+    args = parser.parse_args()
+
+    build_table(args.output, args.workers)
+    print(f"Flop el gücü tablosu '{args.output}' dosyasına yazıldı.")
+
+if __name__ == "__main__":
+    main()
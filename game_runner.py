@@ -0,0 +1,242 @@
+"""Oyun oynatma; python motorunda tek süreçte veya süreç havuzunda.
+
+CLI modları (`run_ai_comparison`, `benchmark_agents`) oyunlarını bu modülün
+`simulate(config)` üretecinden alır; üreteç oyun kayıtlarını oyun sırasıyla
+döndürür (kayıt türleri için bkz. results_stream.py) ve hiçbir oyunu
+bellekte tutmaz. Vektörel motorda oyunlar `BatchEngine` ile paketler
+halinde oynanır; paketin aksiyon sayaçları masa başına değil toplam
+tutulduğundan paket sonunda ayrı bir "counts" kaydı üretilir.
+
+`play_game` python motorunda tek bir oyunu baştan sona oynar ve özetini
+küçük, pickle edilebilir bir sözlük olarak döndürür: koltuk başına son
+stack'ler, elenme elleri ve aksiyon sayaçları, istenirse oyunun kodlanmış
+el geçmişi (bkz. hand_history.encode_hand). Ajanlar ve oyun nesnesi oyunun
+oynandığı süreçte oluşturulur; süreçler arasında yalnızca bu özet taşınır.
+
+`run_games` oyunları `workers` süreçlik bir havuza paketler halinde dağıtır
+ve özetleri oyun indeksi sırasıyla döndürür; havuzda aynı anda süreç
+başına en fazla `MAX_PENDING_PER_WORKER` paket bekler. Her oyunun
+rastgelelik akışı kök tohum ve oyun indeksinden türetildiği için
+(bkz. rng_streams.py) sonuçlar süreç sayısından ve paket boyutundan
+bağımsızdır. Alt süreçlerdeki el değerlendirme önbelleği sayaçları ana
+süreçteki `SHOWDOWN_CACHE`'e eklenir.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import bet_abstraction
+from poker import PokerGame
+from agents import create_agent
+from batch_engine import BatchEngine
+from hand_engine import HandEngine
+from hand_evaluator import configure_cache, SHOWDOWN_CACHE
+from hand_history import encode_hand
+from results_stream import COUNTERS
+from rng_streams import seed_table, table_sequence
+
+DEFAULT_CHUNK_SIZE = 1
+MAX_PENDING_PER_WORKER = 2
+DEFAULT_TABLES_PER_BATCH = 10000
+
+def record_hand_stats(events, stats, agent_types):
+    """Bir elin olaylarından aksiyon istatistiklerini günceller.
+
+    Fold ve raise her bahis turunda oyuncu başına bir kez, all-in tur
+    sonunda, kazanç (fold veya showdown ile pot alma) el başına bir kez sayılır.
+    """
+    folded, raised, winners = set(), set(), set()
+    for event in events:
+        if event["type"] == "action":
+            if event["action"] == "fold":
+                folded.add(event["player"].id)
+            elif event["action"] == "raise":
+                raised.add(event["player"].id)
+        elif event["type"] == "round_end":
+            for player_id in folded:
+                stats["fold_count"][agent_types[player_id]] += 1
+            for player_id in raised:
+                stats["raise_count"][agent_types[player_id]] += 1
+            for player in event["all_in"]:
+                stats["all_in_count"][agent_types[player.id]] += 1
+            folded, raised = set(), set()
+        elif event["type"] == "win" and event["amount"] > 0:
+            winners.add(event["player"].id)
+
+    # Turu tamamlanmadan (tek oyuncu kalarak) biten turdaki aksiyonlar
+    for player_id in folded:
+        stats["fold_count"][agent_types[player_id]] += 1
+    for player_id in raised:
+        stats["raise_count"][agent_types[player_id]] += 1
+    for player_id in winners:
+        stats["showdown_wins"][agent_types[player_id]] += 1
+
+def play_game(game_index, agent_types, player_names, starting_stack, max_round, small_blind,
+              seed=None, record_history=False):
+    """Bir oyunu oyna; oyunun özetini döndürür.
+
+    Özet: type ("game"), game_index, final_stacks, rounds_played,
+    eliminated_round (koltuk başına elendiği el; elenmediyse max_round),
+    koltuk başına aksiyon sayaçları (COUNTERS), history (kodlanmış eller
+    veya None) ve hands.
+    """
+    num_seats = len(agent_types)
+    game = PokerGame(player_names, agent_types, starting_stack, max_round, small_blind)
+
+    # Oyuncuları AI agentlar ile değiştir
+    game.players = []
+    for i, agent_type in enumerate(agent_types):
+        agent = create_agent(agent_type, player_names[i], starting_stack)
+        agent.is_human = False
+        agent.id = i  # ID ata
+        game.players.append(agent)
+    seed_table(game, seed, game_index)  # Masa akışları (seed None ise global random)
+
+    # Eller ortak durum makinesiyle oynanır (bkz. hand_engine.py)
+    engine = HandEngine(game)
+    counts = {name: [0] * num_seats for name in COUNTERS}
+    eliminated_round = [max_round] * num_seats
+    history = bytearray() if record_history else None
+    hands = 0
+    current_round = 0
+
+    # Tüm elleri oyna
+    while current_round < max_round:
+        current_round += 1
+
+        # Elenen oyuncuların elendikleri eli kaydet
+        for seat, player in enumerate(game.players):
+            if player.stack <= 0 and eliminated_round[seat] == max_round:
+                eliminated_round[seat] = current_round
+
+        # Aktif oyuncuları belirle (Stack > 0)
+        if sum(1 for player in game.players if player.stack > 0) <= 1:
+            break  # Yeterli aktif oyuncu yoksa oyunu bitir
+
+        # Eli oyna ve olaylardan koltuk başına aksiyon sayaçlarını topla
+        stacks_before = [player.stack for player in game.players]
+        events = engine.play_hand(current_round)
+        record_hand_stats(events, counts, range(num_seats))
+        if history is not None:
+            encode_hand(history, game_index, current_round, game.players, stacks_before, events)
+        hands += 1
+
+    return {
+        "type": "game",
+        "game_index": game_index,
+        "final_stacks": [player.stack for player in game.players],
+        "rounds_played": current_round,
+        "eliminated_round": eliminated_round,
+        **counts,
+        "history": bytes(history) if history is not None else None,
+        "hands": hands
+    }
+
+# Alt süreçlerde bir kez ayarlanan oyun ayarları
+_CONFIG = None
+
+def _init_worker(config, cache_size, bet_sizes):
+    global _CONFIG
+    _CONFIG = config
+    configure_cache(cache_size)
+    bet_abstraction.configure_bet_sizes(bet_sizes)
+
+def _play_chunk(game_indices):
+    # Paketteki oyunları oyna; (özetler, önbellek sayaç farkları) döndür
+    before = (SHOWDOWN_CACHE.hits, SHOWDOWN_CACHE.misses, SHOWDOWN_CACHE.evictions)
+    records = [play_game(game_index, **_CONFIG) for game_index in game_indices]
+    after = (SHOWDOWN_CACHE.hits, SHOWDOWN_CACHE.misses, SHOWDOWN_CACHE.evictions)
+    return records, [b - a for a, b in zip(before, after)]
+
+def _chunks(game_indices, chunk_size):
+    chunk = []
+    for game_index in game_indices:
+        chunk.append(game_index)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_games(game_indices, config, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Oyunları oyna; özetleri oyun indeksi sırasıyla döndüren üreteç.
+
+    config: `play_game`'in oyun indeksi dışındaki argümanları.
+    """
+    if workers <= 1:
+        for game_index in game_indices:
+            yield play_game(game_index, **config)
+        return
+
+    initargs = (config, SHOWDOWN_CACHE.capacity, bet_abstraction.BET_SIZES)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        pending = deque()
+
+        def collect():
+            records, cache_counts = pending.popleft().result()
+            SHOWDOWN_CACHE.add_counts(*cache_counts)
+            return records
+
+        for chunk in _chunks(game_indices, chunk_size):
+            pending.append(executor.submit(_play_chunk, chunk))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                yield from collect()
+        while pending:
+            yield from collect()
+
+def run_vectorized_games(game_indices, agent_types, starting_stack, max_round, small_blind, seed=None,
+                         tables_per_batch=DEFAULT_TABLES_PER_BATCH):
+    """Oyunları vektörel motorda paketler halinde oynat; kayıtları sırayla döndüren üreteç.
+
+    game_indices: ardışık oyun indeksleri (range). Oyunlar `tables_per_batch`'lik
+    paketlere bölünür; seed verildiğinde her paket kök tohumun paket indeksli
+    akışını kullanır, aynı tohum ve paket boyutu aynı sonuçları verir.
+    """
+    for start in range(game_indices.start, game_indices.stop, tables_per_batch):
+        num_tables = min(tables_per_batch, game_indices.stop - start)
+        batch_seed = None if seed is None else table_sequence(seed, start // tables_per_batch)
+        engine = BatchEngine(agent_types, num_tables, starting_stack, small_blind, seed=batch_seed)
+        final_stacks = engine.run(max_round).tolist()
+        rounds_played = engine.rounds_played.tolist()
+        # Vektörel motorda 0: elenmedi
+        eliminated_round = [[eliminated or max_round for eliminated in row]
+                            for row in engine.eliminated_round.tolist()]
+        for table in range(num_tables):
+            yield {
+                "type": "game",
+                "game_index": start + table,
+                "final_stacks": final_stacks[table],
+                "rounds_played": rounds_played[table],
+                "eliminated_round": eliminated_round[table]
+            }
+        yield {
+            "type": "counts",
+            **{name: getattr(engine, name).tolist() for name in COUNTERS},
+            "hands": engine.hands_played
+        }
+
+def simulate(config, start_game=0):
+    """Ayarlardaki oyunları oyna; oyun kayıtlarını oyun sırasıyla döndüren üreteç.
+
+    config: engine ("python" veya "vectorized"), agent_types, player_names,
+    num_games, starting_stack, max_round, small_blind; isteğe bağlı seed,
+    workers ve record_history (python motoru), tables_per_batch (vektörel motor).
+    start_game: ilk oynanacak oyun (devam eden çalışmalar için; vektörel
+    motorda paket başı olmalı).
+    """
+    game_indices = range(start_game, config["num_games"])
+    if config.get("engine", "python") == "vectorized":
+        yield from run_vectorized_games(game_indices, config["agent_types"], config["starting_stack"],
+                                        config["max_round"], config["small_blind"], config.get("seed"),
+                                        config.get("tables_per_batch", DEFAULT_TABLES_PER_BATCH))
+        return
+
+    game_config = {
+        "agent_types": config["agent_types"],
+        "player_names": config["player_names"],
+        "starting_stack": config["starting_stack"],
+        "max_round": config["max_round"],
+        "small_blind": config["small_blind"],
+        "seed": config.get("seed"),
+        "record_history": config.get("record_history", False)
+    }
+    yield from run_games(game_indices, game_config, config.get("workers", 1))
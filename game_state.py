@@ -0,0 +1,260 @@
+"""Arama ajanları için kompakt oyun durumu.
+
+`PokerGame` her oyuncu için bir `Player` nesnesi, kart listeleri ve bir
+deste tutar; arama ağacında her dal için bunu `copy.deepcopy` ile kopyalamak
+pahalıdır. `GameState` aynı bilgiyi koltuk (seat) başına küçük dizilerde
+tutar:
+
+* stacks, bets: `array("q")`
+* folded: `bytearray`
+* hands: koltuk başına 64 bitlik kart maskesi (`array("q")`)
+* masa kartları: ID demeti + maske, deste: kalan kartların maskesi
+* acted: bu bahis turunda (son raise'den beri) aksiyon almış koltukların
+  maskesi; bahis turu aksiyon alabilen herkes aksiyon alıp bahisler
+  eşitlendiğinde biter
+
+Masa kartı açmak (`add_community_cards`) yeni sokağı başlatır: bahisler,
+en yüksek bahis, son raise artışı ve `acted` sıfırlanır (`HandEngine` gibi).
+
+`clone()` yalnızca bu birkaç diziyi kopyalar. Derinlik öncelikli arama için
+`apply()` / `apply_community_cards()` durumu yerinde değiştirip bir geri alma
+jetonu döndürür, `undo(jeton)` durumu birebir geri yükler; böylece tek bir
+durum nesnesi üzerinde kopyasız arama yapılabilir. Koltuk indeksi
+`PokerGame.players` listesindeki sıradır; `ids` koltuktan oyuncu ID'sine
+eşlemedir. `PokerGame.export_state()` / `import_state()` ile dönüştürülür.
+"""
+import random
+from array import array
+
+from bet_abstraction import legal_actions
+from cards import CARDS
+from hand_evaluator import evaluate_mask
+
+class GameState:
+    __slots__ = ("ids", "stacks", "bets", "folded", "hands", "board", "board_mask",
+                 "deck_mask", "pot", "current_bet", "current_player_id", "small_blind", "last_raise", "acted")
+
+    def __init__(self, ids, stacks, bets, folded, hands, board=(), deck_mask=0,
+                 pot=0, current_bet=0, current_player_id=0, small_blind=0, last_raise=0, acted=0):
+        self.ids = tuple(ids)
+        self.stacks = array("q", stacks)
+        self.bets = array("q", bets)
+        self.folded = bytearray(folded)
+        self.hands = array("q", hands)
+        self.board = tuple(board)
+        self.board_mask = 0
+        for card_id in self.board:
+            self.board_mask |= 1 << card_id
+        self.deck_mask = deck_mask
+        self.pot = pot
+        self.current_bet = current_bet
+        self.current_player_id = current_player_id
+        self.small_blind = small_blind
+        self.last_raise = last_raise  # Bu sokaktaki son tam raise artışı (bkz. PokerGame.min_raise)
+        self.acted = acted
+
+    @classmethod
+    def from_game(cls, game):
+        """PokerGame'in anlık görüntüsü"""
+        players = game.players
+        return cls(
+            ids=[player.id for player in players],
+            stacks=[player.stack for player in players],
+            bets=[player.bet for player in players],
+            folded=[player.is_folded for player in players],
+            hands=[player.hand_mask for player in players],
+            board=[card.id for card in game.community_cards],
+            deck_mask=game.deck.remaining,
+            pot=game.pot,
+            current_bet=game.current_bet,
+            current_player_id=game.current_player_id,
+            small_blind=game.small_blind,
+            last_raise=game.last_raise,
+            acted=game.acted
+        )
+
+    def clone(self):
+        """Bağımsız kopya; yalnızca koltuk dizileri kopyalanır"""
+        other = GameState.__new__(GameState)
+        other.ids = self.ids
+        other.stacks = self.stacks[:]
+        other.bets = self.bets[:]
+        other.folded = self.folded[:]
+        other.hands = self.hands[:]
+        other.board = self.board
+        other.board_mask = self.board_mask
+        other.deck_mask = self.deck_mask
+        other.pot = self.pot
+        other.current_bet = self.current_bet
+        other.current_player_id = self.current_player_id
+        other.small_blind = self.small_blind
+        other.last_raise = self.last_raise
+        other.acted = self.acted
+        return other
+
+    @property
+    def community_cards(self):
+        return [CARDS[card_id] for card_id in self.board]
+
+    @property
+    def num_players(self):
+        return len(self.ids)
+
+    def min_raise(self):
+        """Raise'de call üzerine en az eklenmesi gereken miktar (bkz. PokerGame.min_raise)"""
+        return max(self.small_blind * 2, self.last_raise)
+
+    def seat_of(self, player_id):
+        """Oyuncu ID'sinin koltuk indeksi (yoksa None)"""
+        for seat, seat_id in enumerate(self.ids):
+            if seat_id == player_id:
+                return seat
+        return None
+
+    def active_seats(self):
+        """Fold yapmamış koltuklar"""
+        return [seat for seat in range(len(self.ids)) if not self.folded[seat]]
+
+    # Aksiyonlar
+    def fold(self, seat):
+        self.folded[seat] = 1
+
+    def place_bet(self, seat, amount):
+        self.stacks[seat] -= amount
+        self.bets[seat] += amount
+        self.pot += amount
+
+    def next_player(self):
+        # Bir sonraki aksiyon alabilen (fold yapmamış, all-in olmayan) koltuğa geç
+        num_seats = len(self.ids)
+        seat = self.current_player_id
+        for _ in range(num_seats):
+            seat = (seat + 1) % num_seats
+            if not self.folded[seat] and self.stacks[seat] > 0:
+                break
+        self.current_player_id = seat
+        return seat
+
+    # Yerinde uygulama / geri alma
+    def _undo_token(self, seat):
+        # Yeni sokak tüm bahisleri sıfırladığından bahis dizisinin kopyası saklanır
+        return (seat, self.stacks[seat], self.bets[:], self.folded[seat], self.pot, self.current_bet,
+                self.last_raise, self.acted, self.current_player_id, self.board, self.board_mask, self.deck_mask)
+
+    def apply(self, action, amount=0):
+        """Sıradaki oyuncunun aksiyonunu uygula ve sırayı ilerlet; geri alma jetonu döndürür.
+
+        raise için `amount` oyuncunun ortaya koyduğu toplam miktardır; en az
+        call + `min_raise()` olur ve stack ile sınırlıdır (all-in).
+        """
+        seat = self.current_player_id
+        token = self._undo_token(seat)
+        needed = self.current_bet - self.bets[seat]
+        if action == "raise":
+            amount = min(max(amount, needed + self.min_raise()), self.stacks[seat])
+            if amount <= needed:
+                action = "call"  # Stack call'a ancak yetiyor
+        if action == "fold":
+            self.folded[seat] = 1
+        elif action == "check":
+            pass
+        elif action == "call":
+            call_amount = min(needed, self.stacks[seat])
+            if call_amount > 0:
+                self.place_bet(seat, call_amount)
+        elif action == "raise":
+            if amount - needed >= self.min_raise():
+                self.last_raise = amount - needed  # Eksik (all-in) raise artışı değiştirmez
+            self.place_bet(seat, amount)
+            self.current_bet = self.bets[seat]
+            self.acted = 0  # Raise sonrası diğer herkes tekrar aksiyon almalı
+        else:
+            raise ValueError(f"Geçersiz aksiyon: {action}")
+        self.acted |= 1 << seat
+        self.next_player()
+        return token
+
+    def legal_actions(self, bet_sizes=None):
+        """Sıradaki oyuncunun geçerli (aksiyon, miktar) listesi (bkz. bet_abstraction.py)"""
+        seat = self.current_player_id
+        return legal_actions(self.current_bet - self.bets[seat], self.stacks[seat],
+                             self.pot, self.min_raise(), bet_sizes)
+
+    def apply_community_cards(self, card_ids):
+        """Masaya kart aç; geri alma jetonu döndürür"""
+        token = self._undo_token(self.current_player_id)
+        self.add_community_cards(card_ids)
+        return token
+
+    def undo(self, token):
+        """`apply` / `apply_community_cards` öncesindeki duruma dön"""
+        (seat, self.stacks[seat], self.bets, self.folded[seat], self.pot, self.current_bet,
+         self.last_raise, self.acted, self.current_player_id, self.board, self.board_mask, self.deck_mask) = token
+
+    # Kartlar
+    def set_hand(self, seat, hand_mask):
+        self.hands[seat] = hand_mask
+
+    def add_community_cards(self, card_ids):
+        # Yeni sokak: bahisler ve raise sırası baştan başlar
+        for seat in range(len(self.bets)):
+            self.bets[seat] = 0
+        self.current_bet = 0
+        self.last_raise = 0
+        self.acted = 0
+        self.board += tuple(card_ids)
+        for card_id in card_ids:
+            self.board_mask |= 1 << card_id
+            self.deck_mask &= ~(1 << card_id)
+
+    def sample_cards(self, num_cards, exclude_mask=0, rng=random):
+        # Destedeki (dışlananlar hariç) kartlardan rastgele ID'ler seç; deste değişmez
+        available = self.deck_mask & ~exclude_mask
+        sampled = []
+        while len(sampled) < num_cards and available:
+            card_id = rng.randrange(52)
+            if available >> card_id & 1:
+                sampled.append(card_id)
+                available ^= 1 << card_id
+        return sampled
+
+    def hand_score(self, seat):
+        """Koltuktaki elin masa ile skoru (1 en iyi, 7462 en kötü)"""
+        return evaluate_mask(self.hands[seat] | self.board_mask)
+
+    # Durum sorguları (PokerGame ile aynı anlamda)
+    def is_betting_round_done(self):
+        # Aksiyon alabilen herkes (son raise'den beri) aksiyon aldıysa ve bahisler eşitse
+        bet_values = set()
+        active = 0
+        can_act = []
+        for seat in range(len(self.ids)):
+            if not self.folded[seat]:
+                active += 1
+                if self.stacks[seat] > 0:  # All-in olmayan oyuncular için
+                    bet_values.add(self.bets[seat])
+                    can_act.append(seat)
+        if active <= 1 or not can_act:
+            return True
+        if len(can_act) == 1 and self.bets[can_act[0]] >= self.current_bet:
+            return True  # Karşısında aksiyon alabilen kimse yok
+        acted = self.acted
+        return len(bet_values) <= 1 and all(acted >> seat & 1 for seat in can_act)
+
+    def is_terminal(self):
+        if len(self.ids) - sum(self.folded) <= 1:
+            return True
+        return len(self.board) == 5 and self.is_betting_round_done()
+
+    def is_preflop_done(self):
+        return len(self.board) == 0 and self.is_betting_round_done()
+
+    def is_flop_done(self):
+        return len(self.board) == 3 and self.is_betting_round_done()
+
+    def is_turn_done(self):
+        return len(self.board) == 4 and self.is_betting_round_done()
+
+    def is_last_player_standing(self, player_id):
+        active = self.active_seats()
+        return len(active) == 1 and self.ids[active[0]] == player_id
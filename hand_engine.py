@@ -0,0 +1,335 @@
+"""Tek bir elin olay güdümlü durum makinesi.
+
+CLI modları (`run_ai_comparison`, `benchmark_agents`), `PokerGame.play_round`
+ve UI aynı el akışını bu motor üzerinden yürütür. Motor bir `PokerGame`
+üzerinde çalışır (ajanlar oyunu eskisi gibi görür) ve şu durumu tutar:
+
+* street: PREFLOP, FLOP, TURN, RIVER; el bittiğinde `hand_over` True olur
+* to_act: sıradaki oyuncunun koltuk indeksi (`game.players` sırası)
+* to_act_count: bu bahis turunda hâlâ aksiyon alması gereken oyuncu sayısı
+* pots: el boyunca her koltuğun pota koyduğu toplam (bkz. pot_manager.py)
+
+Aksiyon alabilen (fold yapmamış, all-in olmayan) koltuklar `next_seat` /
+`prev_seat` dizileriyle çift yönlü bir halka oluşturur; fold ve all-in
+olan koltuk halkadan O(1) ile çıkar. Bekleyen oyuncular her zaman halkada
+sıradaki oyuncudan başlayan ardışık bir dilimdir (raise dilimi raise
+yapandan sonraki herkese genişletir), bu yüzden sıradaki oyuncu
+`next_seat[to_act]`, tur sonu `to_act_count == 0` olur. En yüksek bahis
+`game.current_bet`, eldeki oyuncu sayısı `players_in_hand` olarak aksiyon
+başına güncellenir; aksiyon başına maliyet masa büyüklüğünden bağımsızdır.
+Bu bahis turunda (son raise'den beri) aksiyon almış koltukların maskesi
+`game.acted`'te tutulur; arama ajanlarının kompakt durumu tur sonunu buna
+göre belirler (bkz. game_state.py).
+
+`start_hand()` eli başlatır (kartlar, blind'lar), `step(action, amount)`
+sıradaki oyuncunun aksiyonunu uygular; bahis turu bittiğinde masa kartları
+açılır, el bittiğinde pot dağıtılır. Her çağrı gerçekleşen olayların
+listesini döndürür (sözlükler, "type" alanıyla):
+
+* blind (small/big), action: oyuncu, koltuğu, aksiyon ve pota konan miktar
+* round_end: biten bahis turu ve o anda all-in olan oyuncular
+* street: açılan sokak ve kartlar
+* showdown: elini gösteren oyuncular ve skorları
+* win: potu (veya yan potu) kazanan oyuncu, koltuğu, miktar ve skor
+* hand_over
+
+Raise miktarı, oyuncunun o aksiyonda ortaya koyduğu toplam chiptir (call
+dahil); en az call + `game.min_raise()` (big blind veya bu sokaktaki son
+raise artışı) olur ve stack ile sınırlıdır (all-in). Call'dan fazla ama
+tam raise'den az bir all-in son raise artışını değiştirmez.
+`legal_actions()` sıradaki oyuncunun geçerli aksiyonlarını ayrık raise
+miktarlarıyla birlikte verir (bkz. bet_abstraction.py).
+"""
+import logging
+
+from bet_abstraction import legal_actions
+from pot_manager import PotManager
+
+PREFLOP, FLOP, TURN, RIVER = 0, 1, 2, 3
+STREET_NAMES = ("preflop", "flop", "turn", "river")
+
+# Sokak -> o sokakta açılan masa kartı sayısı
+STREET_CARDS = (0, 3, 1, 1)
+
+class HandEngine:
+    def __init__(self, game, max_actions=50):
+        self.game = game
+        self.max_actions = max_actions  # Bahis turu başına aksiyon sınırı
+        self.street = PREFLOP
+        self.to_act = None
+        self.to_act_count = 0
+        self.next_seat = []
+        self.prev_seat = []
+        self.ring_size = 0
+        self.players_in_hand = 0
+        self.pots = PotManager(0)
+        self.dealer_seat = None
+        self.actions_this_round = 0
+        self.hand_over = True
+
+    @property
+    def current_player(self):
+        """Sırası gelen oyuncu (el bittiyse None)"""
+        if self.hand_over or self.to_act is None:
+            return None
+        return self.game.players[self.to_act]
+
+    # El akışı
+    def start_hand(self, round_number):
+        """Yeni eli başlat: kartları dağıt, blind'ları al, ilk bahis turunu aç.
+
+        Pozisyonlar stack'i olan oyuncular arasında belirlenir: dealer =
+        el numarası % aktif oyuncu sayısı, ardından small ve big blind.
+        """
+        game = self.game
+        game.round = round_number
+        game.reset_round()
+        players = game.players
+        for player in players:
+            player.is_folded = player.stack <= 0  # Stack'i bitenler eli oynamaz
+        active = [seat for seat, player in enumerate(players) if player.stack > 0]
+        if len(active) < 2:
+            raise ValueError("El için en az iki aktif oyuncu gerekli")
+
+        self.pots = PotManager(len(players))
+        self.players_in_hand = len(active)
+        self._build_ring(active)
+        self.street = PREFLOP
+        self.hand_over = False
+        game.deal_hole_cards()
+
+        active_count = len(active)
+        dealer_idx = round_number % active_count
+        self.dealer_seat = active[dealer_idx]
+        sb_seat = active[(dealer_idx + 1) % active_count]
+        bb_seat = active[(dealer_idx + 2) % active_count]
+
+        events = []
+        sb_amount = min(game.small_blind, players[sb_seat].stack)
+        self._put(sb_seat, sb_amount)
+        events.append({"type": "blind", "blind": "small", "player": players[sb_seat], "seat": sb_seat, "amount": sb_amount})
+        bb_amount = min(game.small_blind * 2, players[bb_seat].stack)
+        self._put(bb_seat, bb_amount)
+        events.append({"type": "blind", "blind": "big", "player": players[bb_seat], "seat": bb_seat, "amount": bb_amount})
+        game.current_bet = max(sb_amount, bb_amount)
+        for seat in (sb_seat, bb_seat):
+            if players[seat].stack == 0 and self.next_seat[seat] >= 0:
+                self._leave_ring(seat)  # Blind ile all-in
+
+        # Preflop big blind'dan sonraki oyuncuyla başlar
+        self._start_betting_round(active[(dealer_idx + 3) % active_count], events)
+        return events
+
+    def legal_actions(self, bet_sizes=None):
+        """Sıradaki oyuncunun geçerli (aksiyon, miktar) listesi"""
+        game = self.game
+        player = game.players[self.to_act]
+        return legal_actions(game.current_bet - player.bet, player.stack, game.pot, game.min_raise(), bet_sizes)
+
+    def normalize(self, action, amount=0):
+        """Aksiyonu sıradaki oyuncu için geçerli hale getir; (aksiyon, miktar) döndürür"""
+        game = self.game
+        player = game.players[self.to_act]
+        needed = game.current_bet - player.bet
+        if action == "check" and needed > 0:
+            action = "call"  # Ödenecek miktar varken check call demektir
+        if action == "raise":
+            amount = min(max(amount, needed + game.min_raise()), player.stack)
+            if amount <= needed:
+                action = "call"  # Stack call'a ancak yetiyor
+        if action == "call" and needed <= 0:
+            action = "check"
+        return action, amount
+
+    def step(self, action, amount=0):
+        """Sıradaki oyuncunun aksiyonunu uygula; gerçekleşen olayları döndür.
+
+        action: "fold", "check", "call" veya "raise" (raise için `amount`
+        ortaya konan toplam miktardır).
+        """
+        if self.hand_over:
+            raise ValueError("El bitti; önce start_hand çağrılmalı")
+        game = self.game
+        seat = self.to_act
+        player = game.players[seat]
+        needed = game.current_bet - player.bet
+        action, amount = self.normalize(action, amount)
+
+        # Sıradaki oyuncu, koltuk halkadan çıkmadan önce belirlenir
+        next_seat = self.next_seat[seat]
+        if action == "fold":
+            player.is_folded = True
+            amount = 0
+            self.players_in_hand -= 1
+            self._leave_ring(seat)
+            self.to_act_count -= 1
+        elif action == "check":
+            amount = 0
+            self.to_act_count -= 1
+        elif action == "call":
+            amount = min(needed, player.stack)
+            self._put(seat, amount)
+            self.to_act_count -= 1
+        elif action == "raise":
+            if amount - needed >= game.min_raise():
+                game.last_raise = amount - needed
+            self._put(seat, amount)
+            game.current_bet = player.bet
+            # Raise sonrası halkadaki diğer herkesin tekrar aksiyon alması gerekir
+            self.to_act_count = self.ring_size - 1
+            game.acted = 0
+        else:
+            raise ValueError(f"Geçersiz aksiyon: {action}")
+        game.acted |= 1 << seat
+        all_in = player.stack == 0 and not player.is_folded
+        if all_in:
+            self._leave_ring(seat)
+
+        events = [{"type": "action", "player": player, "seat": seat, "action": action, "amount": amount,
+                   "all_in": all_in}]
+        self.actions_this_round += 1
+
+        if self.players_in_hand == 1:
+            self._award_uncontested(events)
+        elif self.to_act_count == 0:
+            self._finish_betting_round(events)
+        elif self.actions_this_round >= self.max_actions:
+            logging.warning(f"Maksimum bahis turu iterasyonu ({self.max_actions}) aşıldı. Bahis turu zorla sonlandırılıyor.")
+            self._equalize_bets(next_seat)
+            self._finish_betting_round(events)
+        else:
+            self._set_to_act(next_seat)
+        return events
+
+    def decide(self):
+        """Sıradaki oyuncunun (ajanın) kararını sor; geçerli (aksiyon, miktar) döndürür"""
+        game = self.game
+        player = game.players[self.to_act]
+        action = player.get_action(game)
+        if action == "fold" and game.current_bet <= player.bet:
+            action = "check"  # Ödenecek bir şey yokken fold yerine check
+        amount = player.get_raise_amount(game) if action == "raise" else 0
+        return self.normalize(action, amount)
+
+    def step_agent(self):
+        """Sıradaki oyuncunun (ajanın) kararını sor ve uygula"""
+        return self.step(*self.decide())
+
+    def play_hand(self, round_number):
+        """Eli baştan sona ajanların kararlarıyla oyna; tüm olayları döndür"""
+        events = self.start_hand(round_number)
+        while not self.hand_over:
+            events.extend(self.step_agent())
+        return events
+
+    # Bahis turu
+    def _build_ring(self, seats):
+        # Verilen koltuklardan (masa sırasıyla) çift yönlü halka kur
+        num_seats = len(self.game.players)
+        self.next_seat = [-1] * num_seats
+        self.prev_seat = [-1] * num_seats
+        for index, seat in enumerate(seats):
+            self.next_seat[seat] = seats[(index + 1) % len(seats)]
+            self.prev_seat[seat] = seats[index - 1]
+        self.ring_size = len(seats)
+
+    def _leave_ring(self, seat):
+        # Fold veya all-in olan koltuk artık aksiyon almaz
+        following, previous = self.next_seat[seat], self.prev_seat[seat]
+        self.next_seat[previous] = following
+        self.prev_seat[following] = previous
+        self.next_seat[seat] = self.prev_seat[seat] = -1
+        self.ring_size -= 1
+
+    def _first_in_ring(self, seat):
+        # Koltuktan itibaren (koltuk dahil) halkadaki ilk koltuk; sokak başına bir kez
+        num_seats = len(self.next_seat)
+        for offset in range(num_seats):
+            candidate = (seat + offset) % num_seats
+            if self.next_seat[candidate] >= 0:
+                return candidate
+        return None
+
+    def _set_to_act(self, seat):
+        self.to_act = seat
+        self.game.current_player_id = seat
+
+    def _start_betting_round(self, first_seat, events):
+        # Halkadaki herkes aksiyon alır; tek kişi kaldıysa ve ödeyeceği yoksa tur oynanmaz
+        game = self.game
+        self.actions_this_round = 0
+        game.acted = 0
+        self.to_act_count = self.ring_size
+        first = self._first_in_ring(first_seat)
+        if self.ring_size == 1 and game.players[first].bet >= game.current_bet:
+            self.to_act_count = 0
+        if self.to_act_count == 0:
+            self._finish_betting_round(events, played=False)
+            return
+        self._set_to_act(first)
+
+    def _equalize_bets(self, seat):
+        # Aksiyon sınırında bekleyen oyuncular (seat'ten başlayarak) en yüksek
+        # bahsi stack'leri yettiğince öder
+        game = self.game
+        for _ in range(self.to_act_count):
+            player = game.players[seat]
+            following = self.next_seat[seat]
+            self._put(seat, min(game.current_bet - player.bet, player.stack))
+            if player.stack == 0:
+                self._leave_ring(seat)
+            seat = following
+        self.to_act_count = 0
+
+    def _finish_betting_round(self, events, played=True):
+        game = self.game
+        if played:
+            all_in = [player for player in game.players if not player.is_folded and player.stack == 0]
+            events.append({"type": "round_end", "street": self.street, "all_in": all_in})
+        if self.street == RIVER:
+            self._showdown(events)
+            return
+
+        # Sonraki sokak: bahisler sıfırlanır, masa kartları açılır
+        for player in game.players:
+            player.bet = 0
+        game.current_bet = 0
+        game.last_raise = 0
+        self.street += 1
+        num_community = len(game.community_cards)
+        game.deal_community_cards(STREET_CARDS[self.street])
+        events.append({"type": "street", "street": self.street, "cards": game.community_cards[num_community:]})
+
+        # Flop ve sonrası dealer'dan sonraki ilk oyuncuyla başlar
+        self._start_betting_round((self.dealer_seat + 1) % len(game.players), events)
+
+    # Pot dağıtımı
+    def _put(self, seat, amount):
+        self.game.place_bet(self.game.players[seat], amount)
+        self.pots.add(seat, amount)
+
+    def _end_hand(self, events):
+        self.game.pot = 0
+        self.hand_over = True
+        self.to_act = None
+        self.to_act_count = 0
+        events.append({"type": "hand_over"})
+
+    def _award_uncontested(self, events):
+        # Tek kalan oyuncu potun tamamını alır
+        seat = next(seat for seat, player in enumerate(self.game.players) if not player.is_folded)
+        winner = self.game.players[seat]
+        winner.stack += self.game.pot
+        events.append({"type": "win", "player": winner, "seat": seat, "amount": self.game.pot, "score": None})
+        self._end_hand(events)
+
+    def _showdown(self, events):
+        # Yan potlar el boyunca konan toplam miktarlardan çözülür (bkz. pot_manager.py)
+        game = self.game
+        players = game.players
+        scores = {seat: player.hand_state.score() for seat, player in enumerate(players) if not player.is_folded}
+        events.append({"type": "showdown", "hands": [(players[seat], score) for seat, score in scores.items()]})
+        for seat, won, score in self.pots.resolve(scores):
+            players[seat].stack += won
+            events.append({"type": "win", "player": players[seat], "seat": seat, "amount": won, "score": score})
+        self._end_hand(events)
@@ -0,0 +1,210 @@
+"""Ortak el değerlendirme modülü.
+
+Oyun modları, UI ve tüm agentlar el gücünü bu modül üzerinden hesaplar.
+treys Evaluator'ı (ve lookup tabloları) süreç boyunca yalnızca bir kez
+oluşturulur, kartların treys karşılıkları da modül yüklenirken 52 elemanlı
+bir tabloya (kart ID'si ile indekslenen) yazılır.
+
+5-7 kartlık eller, lookup tablosu yüklenebildiyse `lookup_evaluator`
+üzerinden değerlendirilir; tablo yoksa treys'e geri dönülür. Her iki
+backend de aynı skor ölçeğini (1 en iyi, 7462 en kötü) kullanır.
+
+Skorlar, elin ve masanın birleşik 64 bitlik kart maskesi ile anahtarlanan
+sınırlı bir LRU önbellekte tutulur (skor yalnızca kart kümesine bağlıdır).
+Anahtar, renk izomorfizmine göre kanonikleştirilmiş maskedir; böylece
+renkleri yer değiştirmiş eller aynı kaydı paylaşır.
+"""
+from collections import OrderedDict
+
+from treys import Card as TreysCard, Evaluator
+
+import lookup_evaluator
+from cards import CARDS, SUIT_MASK, cards_to_mask, mask_to_cards, popcount
+from isomorphism import canonical_mask
+
+SUIT_CHARS = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
+RANK_CHARS = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8",
+              "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
+
+# Süreç boyunca paylaşılan tek evaluator
+EVALUATOR = Evaluator()
+
+# Kart ID'si (0..51) -> treys kart tamsayısı
+TREYS_CARDS = [TreysCard.new(RANK_CHARS[card.rank] + SUIT_CHARS[card.suit]) for card in CARDS]
+
+def to_treys(cards):
+    """Kartları treys formatına dönüştür"""
+    return [TREYS_CARDS[card.id] for card in cards]
+
+# Lookup tablosu import sırasında memory-map edilir (yoksa üretilir)
+try:
+    lookup_evaluator.load()
+    BACKEND = "lookup"
+except OSError:
+    BACKEND = "treys"
+
+def set_backend(backend):
+    """Evaluator backend'ini seç ("lookup" veya "treys")"""
+    global BACKEND
+    if backend == "lookup":
+        lookup_evaluator.load()
+    elif backend != "treys":
+        raise ValueError(f"Bilinmeyen evaluator backend'i: {backend}")
+    BACKEND = backend
+
+DEFAULT_CACHE_CAPACITY = 1 << 16
+
+class ShowdownCache:
+    """Kart maskesi -> skor eşlemesi tutan sınırlı kapasiteli LRU önbellek"""
+    def __init__(self, capacity=DEFAULT_CACHE_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, mask):
+        score = self.entries.get(mask)
+        if score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(mask)
+        return score
+
+    def put(self, mask, score):
+        if self.capacity <= 0:
+            return
+        self.entries[mask] = score
+        if len(self.entries) > self.capacity:
+            # En uzun süredir kullanılmayan kaydı çıkar
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, capacity):
+        self.capacity = capacity
+        while len(self.entries) > max(capacity, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def add_counts(self, hits, misses, evictions):
+        # Başka süreçlerdeki önbelleklerin sayaçlarını ekle
+        self.hits += hits
+        self.misses += misses
+        self.evictions += evictions
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+# Süreç boyunca paylaşılan showdown önbelleği
+SHOWDOWN_CACHE = ShowdownCache()
+
+def configure_cache(capacity):
+    """Önbellek kapasitesini ayarla (0 önbelleği kapatır)"""
+    SHOWDOWN_CACHE.resize(capacity)
+
+def _evaluate(mask, hole_cards, community_cards):
+    # Önbellekten oku, yoksa aktif backend ile hesaplayıp kaydet
+    key = canonical_mask(mask)
+    score = SHOWDOWN_CACHE.get(key)
+    if score is None:
+        if BACKEND == "lookup" and 5 <= len(hole_cards) + len(community_cards) <= 7:
+            score = lookup_evaluator.evaluate_mask(mask)
+        else:
+            score = EVALUATOR.evaluate(to_treys(community_cards), to_treys(hole_cards))
+        SHOWDOWN_CACHE.put(key, score)
+    return score
+
+def el_gucu_hesapla(hole_cards, community_cards):
+    """El gücünü hesapla (1 en iyi, 7462 en kötü)"""
+    return _evaluate(cards_to_mask(hole_cards) | cards_to_mask(community_cards), hole_cards, community_cards)
+
+def evaluate_many(hands, community_cards):
+    """Aynı masa kartları için birden fazla eli tek seferde değerlendir.
+
+    Masa maskesi yalnızca bir kez hesaplanır; skorlar `hands` ile aynı
+    sırada döner.
+    """
+    board_mask = cards_to_mask(community_cards)
+    return [_evaluate(cards_to_mask(hole_cards) | board_mask, hole_cards, community_cards)
+            for hole_cards in hands]
+
+def evaluate_mask(mask):
+    """Bitmask ile verilen kart kümesinin skoru (1 en iyi, 7462 en kötü)"""
+    if BACKEND == "lookup" and 5 <= popcount(mask) <= 7:
+        return lookup_evaluator.evaluate_mask(mask)
+    cards = mask_to_cards(mask)
+    return _evaluate(mask, cards[:2], cards[2:])
+
+class IncrementalHand:
+    """Sokak sokak (flop -> turn -> river) güncellenen el değerlendirme durumu.
+
+    Rank anahtar toplamı, renk sayaçları ve kart maskesi her yeni kartla O(1)
+    işlemle ileri taşınır; skor lookup tablosundan tek okuma ile alınır.
+    """
+    __slots__ = ("key", "suits", "mask", "count")
+
+    def __init__(self, cards=()):
+        self.key = 0
+        self.suits = 0
+        self.mask = 0
+        self.count = 0
+        self.add_cards(cards)
+
+    def add(self, card):
+        card_id = card.id
+        self.key += lookup_evaluator.CARD_RANK_KEYS[card_id]
+        self.suits += lookup_evaluator.CARD_SUIT_KEYS[card_id]
+        self.mask |= card.mask
+        self.count += 1
+
+    def add_cards(self, cards):
+        for card in cards:
+            self.add(card)
+
+    def remove(self, card):
+        card_id = card.id
+        self.key -= lookup_evaluator.CARD_RANK_KEYS[card_id]
+        self.suits -= lookup_evaluator.CARD_SUIT_KEYS[card_id]
+        self.mask &= ~card.mask
+        self.count -= 1
+
+    def clear(self):
+        self.key = 0
+        self.suits = 0
+        self.mask = 0
+        self.count = 0
+
+    def copy(self):
+        other = IncrementalHand.__new__(IncrementalHand)
+        other.key = self.key
+        other.suits = self.suits
+        other.mask = self.mask
+        other.count = self.count
+        return other
+
+    def score(self):
+        """Mevcut kartların skoru (1 en iyi, 7462 en kötü)"""
+        if BACKEND == "lookup" and 5 <= self.count <= 7:
+            table = lookup_evaluator.TABLE
+            flush = (self.suits + lookup_evaluator.FLUSH_CHECK_ADD) & lookup_evaluator.FLUSH_CHECK_MASK
+            if flush:
+                suit_index = (flush.bit_length() - 4) // 4
+                return table[(self.mask >> (13 * suit_index)) & SUIT_MASK]
+            return table[lookup_evaluator.OFFSETS[self.count] + self.key]
+        cards = mask_to_cards(self.mask)
+        return _evaluate(self.mask, cards[:2], cards[2:])
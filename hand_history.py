@@ -0,0 +1,303 @@
+"""Kompakt ikili el geçmişi (hand history) kaydı.
+
+CLI modları yalnızca oyun sonu stack'lerini saklar; bu modül oynanan her eli
+olaylarıyla birlikte (bkz. hand_engine.py) küçük bir ikili formatta yazar
+ve geri okur. Tüm tam sayılar işaretsiz varint (LEB128) olarak, kartlar tek
+baytlık kart ID'si (bkz. cards.py) olarak kodlanır.
+
+Dosya: MAGIC + VERSION, ardından eller. Her el:
+
+* başlık: oyun indeksi, el numarası, koltuk sayısı, koltuk başına elin
+  başındaki stack; ardından koltuk başına iki hole kart (kartı olmayan
+  koltuk için NO_CARD)
+* olaylar, her biri bir tür baytıyla başlar:
+    - EVENT_BLIND: blind (0 small, 1 big), koltuk, miktar
+    - EVENT_ACTION: aksiyon kodu (ACTIONS indeksi, all-in ise + 4), koltuk, miktar
+    - EVENT_STREET: kart sayısı, kartlar
+    - EVENT_SHOWDOWN: oyuncu sayısı, (koltuk, skor) çiftleri
+    - EVENT_WIN: koltuk, miktar, skor (rakipsiz kazançta 0)
+* EVENT_END
+
+`round_end` olayları yazılmaz; all-in bilgisi aksiyon kodunda bulunur.
+`encode_hand` bir eli herhangi bir bytearray'e kodlar (ör. alt süreçlerde).
+Yazıcı kayıtları bellekteki bir tamponda biriktirip toplu yazar; dosya adı
+.gz veya .xz ile bitiyorsa akış gzip / lzma ile sıkıştırılır. Okuyucu
+sıkıştırmayı dosyanın ilk baytlarından tanır ve dosyayı sabit boyutlu
+bloklar halinde okur; bellek kullanımı dosya boyutundan bağımsızdır.
+"""
+import os
+import gzip
+import lzma
+
+MAGIC = b"PKHH"
+VERSION = 1
+NO_CARD = 52
+
+EVENT_BLIND, EVENT_ACTION, EVENT_STREET, EVENT_SHOWDOWN, EVENT_WIN, EVENT_END = range(6)
+ACTIONS = ("fold", "check", "call", "raise")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+ALL_IN_FLAG = 4
+BLINDS = ("small", "big")
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+READ_SIZE = 1 << 16  # Okuyucunun blok boyutu
+
+def encode_varint(value, out):
+    """İşaretsiz tam sayıyı `out` bytearray'ine varint olarak ekle"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _extend_varints(out, values):
+    # Birden fazla değeri tek çağrıda ekle
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+def decode_varint(data, position):
+    """`data[position:]`'daki varint'i çöz; (değer, sonraki pozisyon) döndürür"""
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+def _open(path, mode, compression):
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=1)
+    if compression == "lzma":
+        return lzma.open(path, mode, preset=1) if "r" not in mode else lzma.open(path, mode)
+    return open(path, mode)
+
+def compression_for(path):
+    """Dosya uzantısından sıkıştırma türü (None, "gzip" veya "lzma")"""
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".xz"):
+        return "lzma"
+    return None
+
+def encode_hand(out, game_index, round_number, players, stacks_before, events):
+    """Bir eli `out` bytearray'ine kodla.
+
+    players: koltuk sırasıyla oyuncular (el sonundaki haliyle, hole
+    kartları hâlâ elde), stacks_before: elin başındaki stack'ler,
+    events: `HandEngine.play_hand` olayları.
+    """
+    append = out.append
+    header = [game_index, round_number, len(players)]
+    header.extend(stacks_before)
+    _extend_varints(out, header)
+    for player in players:
+        hand = player.hand
+        if len(hand) == 2:
+            append(hand[0].id)
+            append(hand[1].id)
+        else:
+            append(NO_CARD)
+            append(NO_CARD)
+
+    # Sık olaylar önce; küçük değerler (< 128) tek çağrıda doğrudan yazılır
+    for event in events:
+        kind = event["type"]
+        if kind == "action":
+            code = ACTION_CODES[event["action"]] | (ALL_IN_FLAG if event["all_in"] else 0)
+            seat, amount = event["seat"], event["amount"]
+            if amount < 0x80 and seat < 0x80:
+                out.extend((EVENT_ACTION, code, seat, amount))
+            else:
+                out.extend((EVENT_ACTION, code))
+                _extend_varints(out, (seat, amount))
+        elif kind == "blind":
+            out.extend((EVENT_BLIND, 0 if event["blind"] == "small" else 1))
+            _extend_varints(out, (event["seat"], event["amount"]))
+        elif kind == "street":
+            cards = event["cards"]
+            append(EVENT_STREET)
+            append(len(cards))
+            for card in cards:
+                append(card.id)
+        elif kind == "showdown":
+            values = [len(event["hands"])]
+            for player, score in event["hands"]:
+                values.append(players.index(player))
+                values.append(score)
+            append(EVENT_SHOWDOWN)
+            _extend_varints(out, values)
+        elif kind == "win":
+            append(EVENT_WIN)
+            _extend_varints(out, (event["seat"], event["amount"], event["score"] or 0))
+    append(EVENT_END)
+
+class HandHistoryWriter:
+    """El kayıtlarını tamponlayarak dosyaya yazan akış yazıcısı"""
+
+    def __init__(self, path, compression=None, buffer_size=DEFAULT_BUFFER_SIZE, resume_offset=None,
+                 hands_written=0):
+        if compression is None:
+            compression = compression_for(path)
+        self.path = path
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.hands_written = hands_written
+        if resume_offset is None:
+            self.file = _open(path, "wb", compression)
+            self.buffer = bytearray(MAGIC)
+            self.buffer.append(VERSION)
+        else:
+            # Kontrol noktasından sonra yazılmış elleri at, sonuna ekle
+            with open(path, "r+b") as f:
+                f.truncate(resume_offset)
+            self.file = _open(path, "ab", compression)
+            self.buffer = bytearray()
+
+    def write_hand(self, game_index, round_number, players, stacks_before, events):
+        """Bir eli yaz (bkz. `encode_hand`)"""
+        encode_hand(self.buffer, game_index, round_number, players, stacks_before, events)
+        self.hands_written += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_encoded(self, data, num_hands):
+        """`encode_hand` ile başka bir yerde (ör. alt süreçte) kodlanmış elleri ekle"""
+        self.buffer += data
+        self.hands_written += num_hands
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    def checkpoint(self):
+        """Yazılanları diske boşalt; dosyanın o anki boyutunu (devam noktası) döndür.
+
+        Sıkıştırılmış akış kapatılıp dosyanın sonuna yeni bir akış olarak
+        yeniden açılır; gzip / lzma ardışık akışları tek akış gibi okunur.
+        """
+        self.close()
+        offset = os.path.getsize(self.path)
+        self.file = _open(self.path, "ab", self.compression)
+        return offset
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _open_for_reading(path):
+    # Sıkıştırma türü dosyanın ilk baytlarından tanınır
+    with open(path, "rb") as f:
+        head = f.read(6)
+    if head.startswith(b"\x1f\x8b"):
+        compression = "gzip"
+    elif head.startswith(b"\xfd7zXZ\x00"):
+        compression = "lzma"
+    else:
+        compression = None
+    return _open(path, "rb", compression)
+
+def decode_hand(data, position):
+    """`data[position:]`'daki eli çöz; (el, sonraki pozisyon) döndürür.
+
+    El verinin sonunda yarım kalıyorsa IndexError fırlatır.
+    """
+    game_index, position = decode_varint(data, position)
+    round_number, position = decode_varint(data, position)
+    num_seats, position = decode_varint(data, position)
+    stacks, hole = [], []
+    for _ in range(num_seats):
+        stack, position = decode_varint(data, position)
+        stacks.append(stack)
+    for _ in range(num_seats):
+        cards = data[position], data[position + 1]
+        position += 2
+        hole.append(None if cards[0] == NO_CARD else cards)
+
+    events = []
+    while True:
+        kind = data[position]
+        position += 1
+        if kind == EVENT_END:
+            break
+        if kind == EVENT_ACTION:
+            code = data[position]
+            seat, position = decode_varint(data, position + 1)
+            amount, position = decode_varint(data, position)
+            events.append({"type": "action", "seat": seat, "action": ACTIONS[code & 3],
+                           "amount": amount, "all_in": bool(code & ALL_IN_FLAG)})
+        elif kind == EVENT_BLIND:
+            blind = BLINDS[data[position]]
+            seat, position = decode_varint(data, position + 1)
+            amount, position = decode_varint(data, position)
+            events.append({"type": "blind", "blind": blind, "seat": seat, "amount": amount})
+        elif kind == EVENT_STREET:
+            count = data[position]
+            if position + count >= len(data):
+                raise IndexError("yarım kart listesi")
+            cards = list(data[position + 1:position + 1 + count])
+            position += 1 + count
+            events.append({"type": "street", "cards": cards})
+        elif kind == EVENT_SHOWDOWN:
+            count, position = decode_varint(data, position)
+            hands = []
+            for _ in range(count):
+                seat, position = decode_varint(data, position)
+                score, position = decode_varint(data, position)
+                hands.append((seat, score))
+            events.append({"type": "showdown", "hands": hands})
+        elif kind == EVENT_WIN:
+            seat, position = decode_varint(data, position)
+            amount, position = decode_varint(data, position)
+            score, position = decode_varint(data, position)
+            events.append({"type": "win", "seat": seat, "amount": amount, "score": score or None})
+        else:
+            raise ValueError(f"Bilinmeyen olay türü: {kind}")
+
+    return {"game": game_index, "round": round_number, "stacks": stacks, "hole": hole, "events": events}, position
+
+def read_history(path, read_size=READ_SIZE):
+    """Kayıttaki elleri sırayla döndüren üreteç.
+
+    Her el bir sözlüktür: game, round, stacks (elin başındaki), hole (koltuk
+    başına iki kart ID'si veya None) ve events. Olaylar `HandEngine`
+    olaylarıyla aynı alanları taşır; oyuncu yerine "seat", kart yerine kart
+    ID'si bulunur. Dosya `read_size`'lık bloklar halinde okunur; tampon yalnızca
+    el sınırlarında, yarım kalan el ile yeni blok birleştirilerek yenilenir.
+    """
+    with _open_for_reading(path) as f:
+        header = f.read(len(MAGIC) + 1)
+        if len(header) != len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"El geçmişi dosyası değil: {path}")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"Desteklenmeyen el geçmişi sürümü: {header[len(MAGIC)]}")
+
+        data = b""
+        position = 0
+        while True:
+            try:
+                hand, end = decode_hand(data, position)
+            except IndexError:
+                # Tamponda tam bir el yok: kalan baytlara yeni bloğu ekle
+                block = f.read(read_size)
+                if not block:
+                    if position < len(data):
+                        raise ValueError(f"El geçmişi yarım bir elle bitiyor: {path}") from None
+                    return
+                data = data[position:] + block
+                position = 0
+                continue
+            yield hand
+            position = end
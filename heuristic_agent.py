@@ -1,9 +1,62 @@
-import random
-from treys import Card as TreysCard, Evaluator
-
+import board_texture
+import flop_strength
+import preflop_equity
 from poker import Player
+from hand_evaluator import evaluate_mask
+
+class HeuristicAgent(Player):
+    """Heuristik ajanların ortak yardımcıları; alt sınıflar yalnızca eşikleri ve
+    `bluff_chance`/`alpha` parametrelerini belirler"""
 
-class BasicHeuristicAgent(Player):
+    def get_raise_amount(self, game_state):
+        # Pot odaklı raise miktarı
+        needed_to_call = game_state.current_bet - self.bet
+        raise_amount = needed_to_call + int(self.alpha * game_state.pot)
+        
+        # Raise miktarı stack'ten büyük olamaz
+        raise_amount = min(raise_amount, self.stack)
+        
+        return raise_amount
+            
+    def calculate_rank_sum(self):
+        # İki hole kartın rank toplamını hesapla
+        rank_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, 
+                      "jack": 11, "queen": 12, "king": 13, "ace": 14}
+        
+        rank_sum = 0
+        for card in self.hand:
+            rank_sum += rank_values.get(card.rank, 0)
+            
+        return rank_sum
+        
+    def calculate_preflop_equity(self, game_state):
+        # Rastgele rakiplere karşı preflop equity (tablo yoksa None)
+        if not preflop_equity.is_available():
+            return None
+        num_opponents = self.count_players_in_hand(game_state) - 1
+        return preflop_equity.equity_vs_random(self.hand, num_opponents)
+    
+    def calculate_flop_strength(self, game_state):
+        # Flop'ta potansiyeli de içeren beklenen el gücü (tablo yoksa None).
+        # Tek rakibe karşı E[HS], kalan rakip sayısı kadar üs alınarak ölçeklenir.
+        if len(game_state.community_cards) != 3 or not flop_strength.is_available():
+            return None
+        ehs, _ = flop_strength.expected_strength(self.hand, game_state.community_cards)
+        return ehs ** (self.count_players_in_hand(game_state) - 1)
+    
+    def analyze_hand(self, game_state):
+        # Masa dokusu ve out sayıları (masa özellikleri tüm ajanlar arasında önbellekte)
+        return board_texture.HandAnalysis(self.hand_mask, game_state.board_mask)
+    
+    def count_players_in_hand(self, game_state):
+        # Fold yapmamış oyuncu sayısı
+        return sum(1 for player in game_state.players if not player.is_folded)
+        
+    def calculate_hand_score(self, game_state):
+        # El ve masa maskelerinden skor (1 en iyi, 7462 en kötü); kart listesi dönüştürülmez
+        return evaluate_mask(self.hand_mask | game_state.board_mask)
+
+class BasicHeuristicAgent(HeuristicAgent):
     def __init__(self, name, stack):
         super().__init__(name, stack)
         self.bluff_chance = 0.05
@@ -11,12 +64,23 @@ class BasicHeuristicAgent(Player):
         
     def get_action(self, game_state):
         # Blöf yapacak mıyız kontrol et
-        if random.random() < self.bluff_chance:
+        if self.rng.random() < self.bluff_chance:
             return "raise"
             
         # Preflop/postflop ayrımı
         if len(game_state.community_cards) == 0:
             # Preflop karar mantığı
+            equity = self.calculate_preflop_equity(game_state)
+            if equity is not None:
+                # Equity'nin adil paya oranı; eşikler heads-up'ta rank toplamı 20/15 eşiklerine denk
+                equity_ratio = equity * self.count_players_in_hand(game_state)
+                if equity_ratio >= 1.13:
+                    return "raise"
+                elif equity_ratio >= 0.93:
+                    return "call"
+                else:
+                    return "fold"
+            
             rank_sum = self.calculate_rank_sum()
             
             if rank_sum >= 20:
@@ -27,11 +91,24 @@ class BasicHeuristicAgent(Player):
                 return "fold"
         else:
             # Postflop karar mantığı
-            hand_score = self.calculate_hand_score(game_state)
+            strength = self.calculate_flop_strength(game_state)
+            if strength is not None:
+                # Eşikler heads-up'ta skor 2000/4000 eşikleriyle aynı oranda eli seçer
+                strong, playable = strength >= 0.93, strength >= 0.71
+            else:
+                hand_score = self.calculate_hand_score(game_state)
+                strong, playable = hand_score < 2000, hand_score < 4000
             
-            if hand_score < 2000:
+            # Masa dokusu ve çekilişler
+            analysis = self.analyze_hand(game_state)
+            if strength is None and strong and analysis.board.is_wet() and not (analysis.made_flush or analysis.made_straight):
+                strong = False  # Flush/straight ihtimali olan masada raise yerine call
+            if analysis.outs >= 8:
+                playable = True  # Açık uçlu straight veya flush çekilişi
+            
+            if strong:
                 return "raise"
-            elif hand_score < 4000:
+            elif playable:
                 return "call"
             else:
                 # Eğer call bedava ise (current_bet == player.bet), call yap
@@ -39,58 +116,8 @@ class BasicHeuristicAgent(Player):
                     return "call"  # Bu durumda "check" yapmış oluyoruz
                 else:
                     return "fold"
-    
-    def get_raise_amount(self, game_state):
-        # Pot odaklı raise miktarı
-        needed_to_call = game_state.current_bet - self.bet
-        raise_amount = needed_to_call + int(self.alpha * game_state.pot)
-        
-        # Raise miktarı stack'ten büyük olamaz
-        raise_amount = min(raise_amount, self.stack)
-        
-        return raise_amount
-            
-    def calculate_rank_sum(self):
-        # İki hole kartın rank toplamını hesapla
-        rank_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, 
-                      "jack": 11, "queen": 12, "king": 13, "ace": 14}
-        
-        rank_sum = 0
-        for card in self.hand:
-            rank_sum += rank_values.get(card.rank, 0)
-            
-        return rank_sum
-        
-    def calculate_hand_score(self, game_state):
-        # Treys evaluator kullanarak el skorunu hesapla
-        evaluator = Evaluator()
-        
-        # Kartları Treys formatına dönüştür
-        hole_cards = []
-        for card in self.hand:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            hole_cards.append(treys_card)
-        
-        community_cards = []
-        for card in game_state.community_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            community_cards.append(treys_card)
-        
-        # El skorunu hesapla (1 en iyi, 7462 en kötü)
-        score = evaluator.evaluate(community_cards, hole_cards)
-        return score
 
-class AggressiveHeuristicAgent(Player):
+class AggressiveHeuristicAgent(HeuristicAgent):
     def __init__(self, name, stack):
         super().__init__(name, stack)
         self.bluff_chance = 0.15  # Daha yüksek blöf şansı
@@ -98,12 +125,23 @@ class AggressiveHeuristicAgent(Player):
         
     def get_action(self, game_state):
         # Blöf yapacak mıyız kontrol et
-        if random.random() < self.bluff_chance:
+        if self.rng.random() < self.bluff_chance:
             return "raise"
             
         # Preflop/postflop ayrımı
         if len(game_state.community_cards) == 0:
             # Preflop karar mantığı - daha agresif
+            equity = self.calculate_preflop_equity(game_state)
+            if equity is not None:
+                # Equity'nin adil paya oranı; eşikler heads-up'ta rank toplamı 18/12 eşiklerine denk
+                equity_ratio = equity * self.count_players_in_hand(game_state)
+                if equity_ratio >= 1.06:
+                    return "raise"
+                elif equity_ratio >= 0.81 or self.rng.random() < 0.2:
+                    return "call"
+                else:
+                    return "fold"
+            
             rank_sum = self.calculate_rank_sum()
             
             if rank_sum >= 18:  # Daha düşük eşik
@@ -112,71 +150,34 @@ class AggressiveHeuristicAgent(Player):
                 return "call"
             else:
                 # Zayıf ellerle bile %20 ihtimalle call
-                if random.random() < 0.2:
+                if self.rng.random() < 0.2:
                     return "call"
                 else:
                     return "fold"
         else:
             # Postflop karar mantığı - daha agresif
-            hand_score = self.calculate_hand_score(game_state)
+            strength = self.calculate_flop_strength(game_state)
+            if strength is not None:
+                # Eşikler heads-up'ta skor 3000/5000 eşikleriyle aynı oranda eli seçer
+                strong, playable = strength >= 0.84, strength >= 0.59
+            else:
+                hand_score = self.calculate_hand_score(game_state)
+                strong, playable = hand_score < 3000, hand_score < 5000  # Daha yüksek eşik
+            
+            # Çekilişler: kombine çekilişle semi-blöf raise
+            analysis = self.analyze_hand(game_state)
+            if analysis.outs >= 12:
+                strong = True
+            elif analysis.outs >= 8:
+                playable = True
             
-            if hand_score < 3000:  # Daha yüksek eşik
+            if strong:
                 return "raise"
-            elif hand_score < 5000:  # Daha yüksek eşik
+            elif playable:
                 return "call"
             else:
                 # Kötü elle bile %30 ihtimalle call, diğer durumlarda fold
-                if random.random() < 0.3 or game_state.current_bet == self.bet:
+                if self.rng.random() < 0.3 or game_state.current_bet == self.bet:
                     return "call"
                 else:
                     return "fold"
-    
-    def get_raise_amount(self, game_state):
-        # Pot odaklı raise miktarı - daha yüksek
-        needed_to_call = game_state.current_bet - self.bet
-        raise_amount = needed_to_call + int(self.alpha * game_state.pot)
-        
-        # Raise miktarı stack'ten büyük olamaz
-        raise_amount = min(raise_amount, self.stack)
-        
-        return raise_amount
-            
-    def calculate_rank_sum(self):
-        # İki hole kartın rank toplamını hesapla
-        rank_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, 
-                      "jack": 11, "queen": 12, "king": 13, "ace": 14}
-        
-        rank_sum = 0
-        for card in self.hand:
-            rank_sum += rank_values.get(card.rank, 0)
-            
-        return rank_sum
-        
-    def calculate_hand_score(self, game_state):
-        # Treys evaluator kullanarak el skorunu hesapla
-        evaluator = Evaluator()
-        
-        # Kartları Treys formatına dönüştür
-        hole_cards = []
-        for card in self.hand:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            hole_cards.append(treys_card)
-        
-        community_cards = []
-        for card in game_state.community_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            community_cards.append(treys_card)
-        
-        # El skorunu hesapla (1 en iyi, 7462 en kötü)
-        score = evaluator.evaluate(community_cards, hole_cards)
-        return score 
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Renk (suit) izomorfizmi ile el/masa kanonikleştirme.
+
+Renklerin yer değiştirmesi bir elin gücünü değiştirmez; örneğin A♠K♠ ile
+A♥K♥ stratejik olarak aynıdır. Bu modül herhangi bir (el, masa) çiftini
+renkleri belirli bir sıraya dizerek tek bir temsilciye indirger ve
+kullanılan renk permütasyonunu döndürür. Böylece önbellekler, equity
+tabloları ve arama tabloları kanonik formu anahtar olarak kullanabilir
+(preflop'ta 169, flop'ta 1755 farklı durum kalır).
+
+Maskeler cards.py'deki düzeni kullanır: her renk ardışık 13 bittir.
+"""
+from cards import SUIT_MASK, cards_to_mask
+
+IDENTITY = (0, 1, 2, 3)
+
+def suit_bits(mask, suit_index):
+    """Maskteki bir rengin 13 bitlik rank maskesi"""
+    return (mask >> (13 * suit_index)) & SUIT_MASK
+
+def apply_permutation(mask, perm):
+    """Renkleri perm[eski_renk] = yeni_renk olacak şekilde yer değiştir"""
+    result = 0
+    for suit_index in range(4):
+        result |= ((mask >> (13 * suit_index)) & SUIT_MASK) << (13 * perm[suit_index])
+    return result
+
+def invert(perm):
+    """Permütasyonun tersini döndür"""
+    inverse = [0, 0, 0, 0]
+    for old_suit, new_suit in enumerate(perm):
+        inverse[new_suit] = old_suit
+    return tuple(inverse)
+
+def canonical_permutation(hole_mask, board_mask=0):
+    """Kanonik forma götüren renk permütasyonu.
+
+    Renkler önce masadaki, sonra eldeki rank maskelerine göre büyükten
+    küçüğe sıralanır. Aynı imzaya sahip renkler birbirinin yerine geçebilir,
+    dolayısıyla sonuç bu renklerin sırasından bağımsızdır.
+    """
+    signatures = [(suit_bits(board_mask, s), suit_bits(hole_mask, s)) for s in range(4)]
+    order = sorted(range(4), key=signatures.__getitem__, reverse=True)
+    perm = [0, 0, 0, 0]
+    for new_suit, old_suit in enumerate(order):
+        perm[old_suit] = new_suit
+    return tuple(perm)
+
+def canonicalize(hole_mask, board_mask=0):
+    """(el, masa) çiftini kanonik temsilcisine dönüştür.
+
+    Returns:
+        (kanonik el maskesi, kanonik masa maskesi, permütasyon)
+    """
+    perm = canonical_permutation(hole_mask, board_mask)
+    return apply_permutation(hole_mask, perm), apply_permutation(board_mask, perm), perm
+
+def canonical_mask(mask):
+    """Tek bir kart kümesinin kanonik maskesi (el gücü gibi yalnızca kümeye bağlı değerler için)"""
+    return apply_permutation(mask, canonical_permutation(0, mask))
+
+def canonicalize_cards(hole_cards, community_cards=()):
+    """Kart listeleri için `canonicalize`"""
+    return canonicalize(cards_to_mask(hole_cards), cards_to_mask(community_cards))
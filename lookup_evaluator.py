@@ -0,0 +1,164 @@
+"""5-7 kartlık eller için lookup tablosu tabanlı evaluator.
+
+treys 7 kartlık bir eli 21 farklı 5'li alt kümeyi deneyerek değerlendirir.
+Bu modül ise her el için sonucu önceden hesaplanmış bir tablodan okur:
+
+* Her rank'e, 7 karta kadar tüm rank çoklu kümelerinin toplamları farklı
+  olacak şekilde seçilmiş bir anahtar atanır (perfect hash). Renk (flush)
+  olmayan ellerde skor `tablo[offset[n] + anahtar toplamı]` ile okunur.
+* Renk sayıları 4 bitlik alanlarda toplanır; 5 veya daha fazla aynı renk
+  varsa skor, o rengin 13 bitlik rank maskesi ile flush tablosundan okunur.
+
+Tablo ilk kullanımda treys'in kendi 5 kartlık tablolarından üretilip diske
+yazılır, sonraki çalıştırmalarda doğrudan memory-map edilir. Skorlar
+`el_gucu_hesapla` ile aynı ölçektedir (1 en iyi, 7462 en kötü).
+"""
+import os
+import mmap
+import itertools
+from array import array
+
+from treys import Card as TreysCard
+from treys.lookup import LookupTable
+
+from cards import CARDS, SUIT_MASK
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables", "hand_ranks.bin")
+
+# Her rank için anahtar (2 -> 0, ..., ace -> 1479181); 5, 6 ve 7 kartlık
+# tüm rank çoklu kümelerinin anahtar toplamları birbirinden farklıdır
+RANK_KEYS = [0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181]
+
+# Kart ID'si -> rank anahtarı, renk sayacı (4 bitlik alan) ve rank biti
+CARD_RANK_KEYS = [RANK_KEYS[card.rank_index] for card in CARDS]
+CARD_SUIT_KEYS = [1 << (4 * card.suit_index) for card in CARDS]
+CARD_RANK_BITS = [1 << card.rank_index for card in CARDS]
+
+# Renk sayacında 5 veya daha fazla kart olan alanı yakalar (her alana 3 eklenir)
+FLUSH_CHECK_ADD = 0x3333
+FLUSH_CHECK_MASK = 0x8888
+
+FLUSH_TABLE_SIZE = 1 << 13
+
+def _max_key_sum(num_cards):
+    # Büyük ranklerden başlayarak her rank'ten en fazla 4 kart al
+    total = 0
+    for key in reversed(RANK_KEYS):
+        count = min(4, num_cards)
+        total += key * count
+        num_cards -= count
+        if num_cards == 0:
+            break
+    return total
+
+# Tablo düzeni: [flush tablosu][5 kart][6 kart][7 kart]
+OFFSETS = {}
+_offset = FLUSH_TABLE_SIZE
+for _n in (5, 6, 7):
+    OFFSETS[_n] = _offset
+    _offset += _max_key_sum(_n) + 1
+TABLE_SIZE = _offset
+
+def _best_unsuited(ranks, lookup):
+    # Rank çoklu kümesinin en iyi 5 kartlık (renksiz) skoru
+    best = 7462
+    for subset in itertools.combinations(ranks, 5):
+        product = 1
+        for rank in subset:
+            product *= TreysCard.PRIMES[rank]
+        best = min(best, lookup[product])
+    return best
+
+def build_table(path=TABLE_PATH, lookup_table=None):
+    """Lookup tablosunu üret ve diske yaz"""
+    if lookup_table is None:
+        lookup_table = LookupTable()
+    table = array("H", bytes(2 * TABLE_SIZE))
+
+    # Flush tablosu: 5-7 bitlik her rank maskesi için en iyi 5'li alt küme
+    for bits in range(FLUSH_TABLE_SIZE):
+        ranks = [rank for rank in range(13) if bits >> rank & 1]
+        if 5 <= len(ranks) <= 7:
+            best = 7462
+            for subset in itertools.combinations(ranks, 5):
+                product = 1
+                for rank in subset:
+                    product *= TreysCard.PRIMES[rank]
+                best = min(best, lookup_table.flush_lookup[product])
+            table[bits] = best
+
+    # Renksiz tablolar: her kart sayısı için tüm rank çoklu kümeleri
+    for num_cards in (5, 6, 7):
+        offset = OFFSETS[num_cards]
+        for ranks in itertools.combinations_with_replacement(range(13), num_cards):
+            if any(ranks.count(rank) > 4 for rank in set(ranks)):
+                continue
+            key = sum(RANK_KEYS[rank] for rank in ranks)
+            table[offset + key] = _best_unsuited(ranks, lookup_table.unsuited_lookup)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        table.tofile(f)
+    os.replace(tmp_path, path)
+
+def load_table(path=TABLE_PATH):
+    """Tabloyu memory-map ederek yükle; dosya yoksa veya bozuksa önce üret"""
+    if not os.path.exists(path) or os.path.getsize(path) != 2 * TABLE_SIZE:
+        build_table(path)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast("H")
+
+TABLE = None
+
+def load(path=TABLE_PATH):
+    """Modül genelinde kullanılan tabloyu yükle"""
+    global TABLE
+    if TABLE is None:
+        TABLE = load_table(path)
+    return TABLE
+
+def evaluate_ids(card_ids):
+    """5-7 kart ID'sinden oluşan eli değerlendir"""
+    key = 0
+    suits = 0
+    for card_id in card_ids:
+        key += CARD_RANK_KEYS[card_id]
+        suits += CARD_SUIT_KEYS[card_id]
+
+    flush = (suits + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        # 4 bitlik alanın en üst biti -> renk indeksi
+        suit_index = (flush.bit_length() - 4) // 4
+        bits = 0
+        for card_id in card_ids:
+            if card_id // 13 == suit_index:
+                bits |= CARD_RANK_BITS[card_id]
+        return TABLE[bits]
+    return TABLE[OFFSETS[len(card_ids)] + key]
+
+def evaluate_mask(mask):
+    """5-7 kartlık bitmaski değerlendir"""
+    key = 0
+    num_cards = 0
+    remaining = mask
+    while remaining:
+        low_bit = remaining & -remaining
+        key += CARD_RANK_KEYS[low_bit.bit_length() - 1]
+        num_cards += 1
+        remaining ^= low_bit
+
+    for suit_index in range(4):
+        bits = (mask >> (13 * suit_index)) & SUIT_MASK
+        if bits and bin(bits).count("1") >= 5:
+            return TABLE[bits]
+    return TABLE[OFFSETS[num_cards] + key]
+
+def evaluate(hole_cards, community_cards):
+    """El gücünü hesapla (1 en iyi, 7462 en kötü)"""
+    return evaluate_ids([card.id for card in hole_cards] + [card.id for card in community_cards])
+
+if __name__ == "__main__":
+    build_table()
+    print(f"Lookup tablosu '{TABLE_PATH}' dosyasına yazıldı.")
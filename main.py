@@ -1,8 +1,8 @@
 import sys
-import os
 import argparse
 import json
 import time
+import random
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
@@ -10,225 +10,140 @@ import pandas as pd
 from collections import defaultdict
 import logging
 
-from poker import PokerGame, Player
-from heuristic_agent import BasicHeuristicAgent, AggressiveHeuristicAgent
-from mcts_agent import MCTSAgent
-from expectiminimax_agent import ExpectiminimaxAgent
+from hand_evaluator import configure_cache, SHOWDOWN_CACHE
+import bet_abstraction
+from cards import parse_card
+import equity
+from batch_engine import POLICIES
+from game_runner import simulate
+from results_stream import JsonlWriter, RunSummary
+from hand_history import HandHistoryWriter
+from checkpoint import Checkpointer, load_checkpoint, DEFAULT_INTERVAL
+import replay
 
 # Logging ayarları
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def create_agent(agent_type, name, stack):
-    """Belirtilen tipte bir AI agent oluşturur"""
-    if agent_type == "basic_heuristic":
-        return BasicHeuristicAgent(name, stack)
-    elif agent_type == "aggressive_heuristic":
-        return AggressiveHeuristicAgent(name, stack)
-    elif agent_type == "mcts":
-        return MCTSAgent(name, stack)
-    elif agent_type == "expectiminimax":
-        return ExpectiminimaxAgent(name, stack)
+def play_games(config, games_file=None, history_file=None, checkpointer=None, resume=None):
+    """Ayarlardaki oyunları oynatır (bkz. game_runner.simulate) ve akıştan özetler.
+    
+    Oyun kayıtları bellekte tutulmaz: verilirse `games_file`'a JSONL olarak
+    akış halinde yazılır (bkz. results_stream.py), kodlanmış el geçmişi
+    `history_file`'a eklenir. `checkpointer` verilirse periyodik kontrol
+    noktası yazılır; `resume` (yüklenmiş kontrol noktası) verilirse çalışma
+    kaldığı oyundan devam eder (bkz. checkpoint.py).
+    Returns:
+        (RunSummary, süre)
+    """
+    num_games = config["num_games"]
+    vectorized = config["engine"] == "vectorized"
+    if checkpointer and config["seed"] is None:
+        # Devam edilebilmesi için akışlar bir kök tohumdan türetilmeli
+        config["seed"] = random.SystemRandom().randrange(1 << 63)
+        print(f"Kontrol noktası için kök tohum üretildi: {config['seed']}")
+    
+    if resume:
+        summary = RunSummary.from_state(config["agent_types"], config["max_round"], resume["summary"])
+        SHOWDOWN_CACHE.add_counts(*resume["evaluator_cache"])
+        writer = JsonlWriter(games_file, resume_offset=resume["games_offset"]) if games_file else None
+        history = HandHistoryWriter(history_file, resume_offset=resume["history_offset"],
+                                    hands_written=resume["hands_written"]) if history_file else None
+        elapsed_before = resume["elapsed"]
+        print(f"Kontrol noktasından devam ediliyor: {summary.games}/{num_games} oyun tamamlanmış.")
     else:
-        # Bilinmeyen agent tipi için varsayılan Player
-        return Player(name, stack)
+        summary = RunSummary(config["agent_types"], config["max_round"])
+        writer = JsonlWriter(games_file) if games_file else None
+        history = HandHistoryWriter(history_file) if history_file else None
+        elapsed_before = 0.0
+        if writer:
+            writer.write({"type": "config", **config})
+    start_time = time.time()
+    
+    def save_checkpoint():
+        cache_stats = SHOWDOWN_CACHE.stats()
+        checkpointer.save(
+            config=config,
+            games_file=games_file,
+            history_file=history_file,
+            next_game=summary.games,
+            summary=summary.state(),
+            games_offset=writer.checkpoint() if writer else None,
+            history_offset=history.checkpoint() if history else None,
+            hands_written=history.hands_written if history else 0,
+            evaluator_cache=[cache_stats["hits"], cache_stats["misses"], cache_stats["evictions"]],
+            elapsed=elapsed_before + time.time() - start_time
+        )
+    
+    try:
+        for record in simulate(config, start_game=summary.games):
+            summary.update(record)
+            if writer:
+                writer.write(record)
+            if history and record["type"] == "game":
+                history.write_encoded(record["history"], record["hands"])
+            # Vektörel motorda ilerleme ve kontrol noktası paket sonunda
+            if record["type"] == ("counts" if vectorized else "game"):
+                print(f"Oyun {summary.games}/{num_games} oynandı...")
+                if checkpointer and checkpointer.due():
+                    save_checkpoint()
+        if checkpointer:
+            save_checkpoint()
+    finally:
+        if writer:
+            writer.close()
+        if history:
+            history.close()
+    
+    elapsed = elapsed_before + time.time() - start_time
+    if games_file:
+        print(f"Oyun kayıtları '{games_file}' dosyasına yazıldı ({summary.games} oyun).")
+    if history:
+        print(f"El geçmişi '{history_file}' dosyasına yazıldı ({history.hands_written} el).")
+    print(f"Oynanan El: {summary.hands_played} ({summary.hands_played / max(elapsed, 1e-9) * 60:.0f} el/dakika)")
+    return summary, elapsed
 
-def run_ai_comparison(agent_types, num_games, starting_stack, max_round, small_blind, output_file):
+def run_ai_comparison(agent_types, num_games, starting_stack, max_round, small_blind, output_file, seed=None,
+                      history_file=None, workers=1, engine="python", games_file=None, checkpointer=None, resume=None):
     """AI agentların performansını karşılaştırır ve sonuçları bir dosyaya yazar"""
-    print(f"AI Performans Karşılaştırması Başlıyor...")
+    print(f"AI Performans Karşılaştırması Başlıyor{' (vektörel motor)' if engine == 'vectorized' else ''}...")
     print(f"Agent Tipleri: {', '.join(agent_types)}")
     print(f"Oyun Sayısı: {num_games}")
     print(f"Her biri {max_round} el, {starting_stack} chip başlangıç ile oynanacak.")
     
-    # Sonuçları toplamak için bir sözlük
+    config = {
+        "engine": engine,
+        "agent_types": agent_types,
+        "player_names": [f"AI-{i+1}-{agent_type}" for i, agent_type in enumerate(agent_types)],
+        "num_games": num_games,
+        "starting_stack": starting_stack,
+        "max_round": max_round,
+        "small_blind": small_blind,
+        "seed": seed,
+        "workers": workers,
+        "bet_sizes": list(bet_abstraction.BET_SIZES),
+        "record_history": bool(history_file)
+    }
+    summary, elapsed = play_games(config, games_file, history_file, checkpointer, resume)
+    
+    # Oyun başına sonuçlar `games_file`'da; burada yalnızca özet tutulur
     results = {
-        "config": {
-            "agent_types": agent_types,
-            "num_games": num_games,
-            "starting_stack": starting_stack,
-            "max_round": max_round,
-            "small_blind": small_blind
-        },
-        "games": [],
+        "config": {**config, "games_file": games_file},
         "summary": {
-            "wins": {agent_type: 0 for agent_type in agent_types},
+            "wins": summary.wins,
             "avg_stack": {agent_type: 0 for agent_type in agent_types},
-            "total_stack": {agent_type: 0 for agent_type in agent_types}
-        }
+            "total_stack": summary.total_stack
+        },
+        "hands_played": summary.hands_played,
+        "execution_time": elapsed
     }
-    
-    start_time = time.time()
-    
-    # Oyunları çalıştır
-    for game_num in range(num_games):
-        print(f"Oyun {game_num+1}/{num_games} oynanıyor...")
-        
-        # Oyuncuları oluştur
-        player_names = [f"AI-{i+1}-{agent_type}" for i, agent_type in enumerate(agent_types)]
-        player_types = agent_types.copy()
-        
-        # Oyun nesnesini oluştur
-        game = PokerGame(player_names, player_types, starting_stack, max_round, small_blind)
-        
-        # Oyuncuları AI agentlar ile değiştir
-        game.players = []
-        for i, agent_type in enumerate(agent_types):
-            agent = create_agent(agent_type, f"AI-{i+1}-{agent_type}", starting_stack)
-            agent.is_human = False
-            agent.id = i  # ID ata
-            game.players.append(agent)
-        
-        # El takibi
-        current_round = 0
-        
-        # Tüm elleri oyna
-        while current_round < max_round:
-            current_round += 1
-            game.round = current_round
-            
-            # Eğer 0. el ise sonraki ele geç
-            if game.round == 0:
-                continue
-            
-            # Aktif oyuncuları belirle (Stack > 0)
-            active_players = [p for p in game.players if p.stack > 0]
-            if len(active_players) <= 1:
-                break  # Yeterli aktif oyuncu yoksa oyunu bitir
-                
-            # Önceki eli temizle
-            game.reset_round()
-            
-            # Oyuncuların all-in durumlarını temizle
-            for player in game.players:
-                if player.stack <= 0:
-                    player.is_folded = True  # Stack 0 olanlar fold olsun
-                else:
-                    player.is_folded = False  # Diğerleri aktif
-            
-            # Desteyi karıştır ve kartları dağıt
-            game.deck.shuffle()
-            game.deal_hole_cards()
-            
-            # Aktif oyuncular arasından dealer, small blind ve big blind pozisyonlarını belirle
-            active_count = len(active_players)
-            dealer_idx = current_round % active_count
-            sb_idx = (dealer_idx + 1) % active_count
-            bb_idx = (dealer_idx + 2) % active_count
-            
-            # Small blind ve big blind oyuncularını al
-            small_blind_player = active_players[sb_idx]
-            big_blind_player = active_players[bb_idx]
-            
-            # Small blind
-            small_blind_amount = min(small_blind, small_blind_player.stack)
-            game.place_bet(small_blind_player, small_blind_amount)
-            
-            # Big blind
-            big_blind_amount = min(small_blind * 2, big_blind_player.stack)
-            game.place_bet(big_blind_player, big_blind_amount)
-            
-            # Current bet'i büyük blind olarak ayarla
-            game.current_bet = big_blind_amount
-            
-            # Preflop - Big blind'ın yanındaki oyuncudan başla
-            current_betting_idx = (bb_idx + 1) % active_count
-            play_betting_round(game, active_players, current_betting_idx)
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    game.pot = 0
-                continue
-            
-            # Flop
-            game.deal_community_cards(3)
-            reset_betting_round(game)
-            # Flop için dealer'dan sonraki ilk oyuncu bahis turunu başlatır
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    game.pot = 0
-                continue
-            
-            # Turn
-            game.deal_community_cards(1)
-            reset_betting_round(game)
-            # Turn için dealer'dan sonraki ilk oyuncu bahis turunu başlatır 
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    game.pot = 0
-                continue
-            
-            # River
-            game.deal_community_cards(1)
-            reset_betting_round(game)
-            # River için dealer'dan sonraki ilk oyuncu bahis turunu başlatır
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # Showdown
-            process_showdown(game)
-            
-            # Her durumda potun sıfırlandığından emin ol
-            if game.pot > 0:
-                active_players = [p for p in game.players if not p.is_folded]
-                if active_players:
-                    winner = active_players[0]
-                    winner.stack += game.pot
-                game.pot = 0
-        
-        # Sonuçları kaydet
-        game_result = {
-            "game_number": game_num + 1,
-            "results": []
-        }
-        
-        max_stack = 0
-        winner = None
-        
-        for i, player in enumerate(game.players):
-            agent_type = agent_types[i]
-            game_result["results"].append({
-                "agent_type": agent_type,
-                "name": player.name,
-                "final_stack": player.stack
-            })
-            
-            results["summary"]["total_stack"][agent_type] += player.stack
-            
-            if player.stack > max_stack:
-                max_stack = player.stack
-                winner = agent_type
-        
-        # Kazananı kaydet
-        if winner:
-            results["summary"]["wins"][winner] += 1
-            game_result["winner"] = winner
-            
-        results["games"].append(game_result)
-        
+    report_ai_comparison(results, agent_types, num_games, output_file)
+
+def report_ai_comparison(results, agent_types, num_games, output_file):
+    """Karşılaştırma özetini hesaplar, yazdırır ve sonuçları dosyaya yazar"""
     # Ortalama değerleri hesapla
     for agent_type in agent_types:
         results["summary"]["avg_stack"][agent_type] = results["summary"]["total_stack"][agent_type] / num_games
     
-    end_time = time.time()
-    results["execution_time"] = end_time - start_time
-    
     # Sonuçları yazdır
     print("\nSonuçlar:")
     print("-" * 50)
@@ -249,316 +164,103 @@ def run_ai_comparison(agent_types, num_games, starting_stack, max_round, small_b
     
     print(f"Ayrıntılı sonuçlar '{output_file}' dosyasına kaydedildi.")
 
-def reset_betting_round(game):
-    """Bahis turunu sıfırla"""
-    for player in game.players:
-        player.bet = 0
-    game.current_bet = 0
-
-def play_betting_round(game, active_players, start_idx=0, max_iterations=50):
-    """Bir bahis turunu oyna"""
-    # Bahis yapabilecek oyuncuları belirle (stack > 0 ve fold yapmamış)
-    betting_players = [p for p in active_players if not p.is_folded]
-    if len(betting_players) <= 1:
-        return
-    
-    # Is Check Round - bu turda hiç bahis yapılmamışsa True
-    is_check_round = all(player.bet == 0 for player in betting_players)
-    
-    # Bahis yapacak oyuncuların indekslerini belirle
-    current_idx = start_idx % len(betting_players)
-    
-    # Her oyuncunun aksiyonunu izlemek için sözlük
-    player_acted = {player: False for player in betting_players}
-    
-    # Son raise yapan oyuncuyu takip edelim
-    last_raiser = None
-    
-    # Sonsuz döngüyü önlemek için iterasyon sayacı
-    iteration_count = 0
-    
-    while True:
-        # Maksimum iterasyon kontrolü
-        iteration_count += 1
-        if iteration_count > max_iterations:
-            logging.warning(f"Maksimum bahis turu iterasyonu ({max_iterations}) aşıldı. Bahis turu zorla sonlandırılıyor.")
-            
-            # Mevcut bahisleri eşitleyerek turu sonlandır
-            # Tüm oyuncuların bahislerini en yüksek bahse eşitle
-            max_bet = max(p.bet for p in betting_players)
-            for player in betting_players:
-                if player.bet < max_bet and player.stack > 0:
-                    # Yeterli stack varsa bahislerini eşitle
-                    call_amount = min(max_bet - player.bet, player.stack)
-                    player.stack -= call_amount
-                    player.bet += call_amount
-                    game.pot += call_amount
-            
-            # Bahis turu tamamlandı
-            return
-    
-        # Aktif oyuncular listesini güncelle (fold olanlar çıkarılıyor)
-        betting_players = [p for p in active_players if not p.is_folded]
-        if len(betting_players) <= 1:
-            return  # Sadece bir oyuncu kaldıysa bahis turu bitmiş
-        
-        # Current index kontrol
-        if current_idx >= len(betting_players):
-            current_idx = 0
-            
-        # Aktif oyuncuyu al
-        player = betting_players[current_idx]
-        
-        # Bahis turu tamamlandı mı kontrol et - tüm aktif oyuncular aksiyon aldı mı ve tüm bahisler eşit mi
-        all_acted = all(player_acted.get(p, True) for p in betting_players)
-        if all_acted and is_betting_round_done(game):
-            logging.debug(f"Bahis turu tamamlandı: {[(p.name, p.bet) for p in betting_players]}")
-            return
-                
-        # Stack 0 olan oyuncular (all-in durumunda) aksiyon alamaz
-        if player.stack <= 0:
-            # Bu oyuncuyu acted olarak işaretle
-            player_acted[player] = True
-            current_idx = (current_idx + 1) % len(betting_players)
-            continue
-            
-        action = player.get_action(game)
-        logging.debug(f"{player.name} aksiyon alıyor: {action}")
-        
-        # Check round ise ve call veya fold gelirse check'e çevir
-        if is_check_round and (action == "call" or action == "fold"):
-            action = "check"
-        
-        if action == "fold":
-            player.is_folded = True
-            # Bu oyuncuyu acted olarak işaretle
-            player_acted[player] = True
-        elif action == "check":
-            # Check - hiçbir şey yapma, sıradaki oyuncuya geç
-            player_acted[player] = True
-        elif action == "call":
-            call_amount = game.current_bet - player.bet
-            if call_amount <= 0:
-                # Check - hiçbir şey yapma
-                player_acted[player] = True
-            elif call_amount <= player.stack:
-                # Normal call
-                player.stack -= call_amount
-                player.bet += call_amount
-                game.pot += call_amount
-                player_acted[player] = True
-            else:
-                # All-in (stack yeterli değil)
-                game.pot += player.stack
-                player.bet += player.stack
-                player.stack = 0
-                player_acted[player] = True
-        elif action == "raise":
-            raise_amount = player.get_raise_amount(game)
-            
-            # 0 veya negatif miktarda raise yapılamaz
-            if raise_amount <= 0:
-                # Raise yapamayacaksa check ya da call yap
-                if is_check_round:
-                    # Check yap
-                    player_acted[player] = True
-                else:
-                    # Call yap
-                    call_amount = min(game.current_bet - player.bet, player.stack)
-                    if call_amount > 0:
-                        player.stack -= call_amount
-                        player.bet += call_amount
-                        game.pot += call_amount
-                    player_acted[player] = True
-            else:
-                # Minimum raise kontrolü
-                min_raise = max(game.small_blind, game.current_bet - player.bet)
-                if raise_amount < min_raise:
-                    raise_amount = min_raise
-                    
-                # Stack kontrolü
-                raise_amount = min(raise_amount, player.stack)
-                
-                # Normal raise - call + raise
-                total_amount = raise_amount + (game.current_bet - player.bet)
-                player.stack -= total_amount
-                player.bet = game.current_bet + raise_amount
-                game.current_bet = player.bet
-                game.pot += total_amount
-                
-                # Raise yapıldığında, diğer tüm oyuncuların tekrar aksiyon alması gerekiyor
-                for p in betting_players:
-                    if p != player and p.stack > 0:
-                        player_acted[p] = False
-                
-                # Raise yapan oyuncu aksiyon aldı sayılır
-                player_acted[player] = True
-                
-                # Son raise yapan oyuncuyu kaydet
-                last_raiser = player
-        
-        # Stack'in 0'dan küçük olmasını engelle
-        if player.stack < 0:
-            player.stack = 0
-            
-        # Bir sonraki oyuncuya geç
-        current_idx = (current_idx + 1) % len(betting_players)
-
-def is_betting_round_done(game):
-    """Bahis turu tamamlandı mı kontrol et"""
-    active_players = [p for p in game.players if not p.is_folded]
-    
-    # Sadece bir oyuncu kaldıysa tur tamamlanmıştır
-    if len(active_players) <= 1:
-        logging.debug(f"Sadece bir oyuncu kaldı, tur tamamlandı")
-        return True
-    
-    # Tüm aktif oyuncuların bahisleri eşit olmalı
-    # Önce tüm bahislerin aynı olup olmadığını kontrol et
-    all_in_players = [p for p in active_players if p.stack == 0]  # All-in oyuncular
-    non_all_in_players = [p for p in active_players if p.stack > 0]  # All-in olmayan oyuncular
-    
-    # All-in olmayan oyuncuların bahislerini kontrol et
-    if non_all_in_players:
-        bet_values = set(p.bet for p in non_all_in_players)
-        if len(bet_values) > 1:
-            logging.debug(f"Bahisler eşit değil: {bet_values}")
-            return False
-    
-    # All-in oyuncuların durumu (onların bahisleri farklı olabilir, 
-    # ama non-all-in oyuncuların bahisleri kendi aralarında eşit olmalı)
+def run_equity_queries(input_file, output_file, flush_every=64, workers=1, target_se=equity.DEFAULT_TARGET_SE):
+    """
+    Dosyadaki equity sorgularını sırayla işler ve sonuçları akış halinde yazar.
+    Her satır bir JSON sorgusudur, örneğin:
+        {"hole": ["As", "Kd"], "board": ["Qs", "Js", "2c"], "opponents": 2, "dead": ["3h"]}
+    Sonuç dosyasına her sorgu için sorgu alanları ve equity sonucu bir satır olarak yazılır;
+    hatalı bir sorgu (geçersiz JSON dahil) çalışmayı durdurmaz, yerine bir hata kaydı yazılır.
+    Sonuç dosyası her `flush_every` sorguda bir diske boşaltılır; `workers` > 1 ise
+    her sorgunun Monte Carlo örnek paketleri süreçlere dağıtılır (bkz. equity.py).
+    """
+    print(f"Equity sorguları işleniyor: {input_file}")
+    executor = equity.create_executor(workers)
+    processed = 0
+    start_time = time.time()
     
-    # All-in olmayan oyuncular varsa ve hepsinin bahisleri eşitse, 
-    # all-in oyuncuların bahisleri <= non_all_in oyuncuların bahislerine olmalı
-    if non_all_in_players and all_in_players:
-        max_non_all_in_bet = max(p.bet for p in non_all_in_players)
-        
-        # All-in oyuncuların bahisleri max_non_all_in_bet'ten büyük olmamalı
-        # (all-in oyuncular max_bet'ten daha fazla koyamaz, all-in olmuşlardır zaten)
-        for all_in_player in all_in_players:
-            if all_in_player.bet > max_non_all_in_bet:
-                logging.debug(f"All-in oyuncunun bahsi ({all_in_player.bet}) non-all-in max bahsinden ({max_non_all_in_bet}) büyük")
-                return False
+    def parse_cards(values):
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Kartlar metin listesi olmalı: {values!r}")
+        return [parse_card(value) for value in values]
+    
+    def process(line_number, line):
+        # Sorgunun sonuç satırı; hatalı satırlar (geçersiz JSON dahil) hata kaydı olur
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise ValueError("Sorgu bir JSON nesnesi olmalı")
+        except ValueError as e:
+            return {"line": line_number, "error": str(e)}
+        try:
+            result = equity.calculate_equity(
+                hole_cards=parse_cards(query["hole"]),
+                community_cards=parse_cards(query.get("board", [])),
+                num_opponents=query.get("opponents", 1),
+                dead_cards=parse_cards(query.get("dead", [])),
+                target_se=query.get("target_se", target_se),
+                executor=executor
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            result = {"error": str(e)}
+        return {**query, **result}
     
-    # Sadece all-in oyuncular varsa tur tamamlanmış demektir
-    if all_in_players and not non_all_in_players:
-        logging.debug(f"Sadece all-in oyuncular kaldı, tur tamamlandı")
-        return True
-        
-    # Eğer buraya kadar geldiyse, tüm bahisler eşittir
-    # (player_acted kontrolü play_betting_round içinde yapılıyor)
-    logging.debug(f"Bahisler eşit olduğu için tur tamamlandı")
-    return True
-
-def determine_winner(game):
-    """Şu anki duruma göre kazananı belirle"""
-    active_players = [p for p in game.players if not p.is_folded]
-    if len(active_players) == 0:
-        return None
-    elif len(active_players) == 1:
-        return active_players[0]
-    else:
-        # El gücüne göre karşılaştırma
-        scores = []
-        for player in active_players:
-            score = el_gucu_hesapla(player.hand, game.community_cards)
-            scores.append((player, score))
-        
-        # En düşük skor en iyi el
-        scores.sort(key=lambda x: x[1])
-        return scores[0][0]
+    try:
+        with open(input_file, 'r', encoding='utf-8') as fin, open(output_file, 'w', encoding='utf-8') as fout:
+            for line_number, line in enumerate(fin, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                fout.write(json.dumps(process(line_number, line), ensure_ascii=False) + "\n")
+                processed += 1
+                if processed % flush_every == 0:
+                    fout.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    print(f"{processed} sorgu {time.time() - start_time:.2f} saniyede işlendi.")
+    print(f"Sonuçlar '{output_file}' dosyasına kaydedildi.")
 
-def process_showdown(game):
-    """Showdown işlemini gerçekleştir ve kazananı belirle"""
-    active_players = [p for p in game.players if not p.is_folded]
-    
-    # All-in kontrolü - yan pot hesaplama için gereken bilgileri toplama
-    all_in_players = [p for p in active_players if p.stack == 0]
-    has_all_in = len(all_in_players) > 0
-    
-    if len(active_players) <= 1:
-        # Tek kalan oyuncu varsa pot'u ona ver
-        if active_players:
-            active_players[0].stack += game.pot
-        game.pot = 0
-        return
+def run_replay(history_file, agent_types, output_file, workers=1, seed=None):
+    """Kayıtlı el geçmişindeki karar noktalarında ajanları sorgular (bkz. replay.py).
     
-    # El değerlendirmesi
-    player_hands = []
-    for player in active_players:
-        score = el_gucu_hesapla(player.hand, game.community_cards)
-        player_hands.append((player, score))
-    
-    # En düşük skor en iyi eli belirtir (treys'te 1 en iyi, 7462 en kötü)
-    player_hands.sort(key=lambda x: x[1])  # El gücüne göre sıralama
+    Her ajan için kayıttaki kararla uyum oranı, kayıtlı aksiyona göre ajanın
+    kararlarının dağılımı ve karar süreleri raporlanır.
+    """
+    print(f"El geçmişi yeniden oynatılıyor: {history_file}")
+    print(f"Agent Tipleri: {', '.join(agent_types)}")
+    start_time = time.time()
     
-    # Yan pot hesaplama
-    if has_all_in:
-        calculate_side_pots(game, active_players, player_hands)
-    else:
-        # Normal pot hesaplama
-        winner = player_hands[0][0]
-        winner.stack += game.pot
-        game.pot = 0
-
-def calculate_side_pots(game, active_players, player_hands):
-    """Yan pot hesaplama"""
-    # Önce oyuncuları kartlarına göre sırala
-    player_hand_map = {p[0]: p[1] for p in player_hands}
+    # Karar kayıtları geldikçe özete eklenir, bellekte tutulmaz
+    summary = replay.ReplaySummary(agent_types)
+    for record in replay.replay(history_file, agent_types, workers=workers, seed=seed):
+        summary.update(record)
+        if summary.decisions % 10000 == 0:
+            print(f"{summary.decisions} karar noktası işlendi...")
     
-    # Oyuncuları bet miktarına göre sırala (düşükten yükseğe)
-    players_by_bet = sorted(active_players, key=lambda p: p.bet)
+    results = summary.result()
+    results["config"] = {"input": history_file, "agent_types": agent_types, "workers": workers, "seed": seed,
+                         "bet_sizes": list(bet_abstraction.BET_SIZES)}
+    results["decisions"] = summary.decisions
+    results["execution_time"] = time.time() - start_time
     
-    # Toplam pot ve kümülatif oyuncu grupları
-    total_pot = game.pot
-    remaining_pot = total_pot
-    prev_bet = 0
+    print("\nReplay Sonuçları:")
+    print("-" * 60)
+    print(f"El: {results['hands']}, Karar noktası: {summary.decisions}, Süre: {results['execution_time']:.2f} saniye")
+    for agent_summary in results["agents"]:
+        latency = agent_summary["latency_ms"]
+        print(f"{agent_summary['agent_type']}: Uyum %{agent_summary['agreement_rate'] * 100:.1f} "
+              f"(miktar dahil %{agent_summary['exact_agreement_rate'] * 100:.1f}), "
+              f"Süre ort. {latency['mean']:.2f} ms, p95 {latency['p95']:.2f} ms")
+        for recorded, counts in sorted(agent_summary["by_recorded_action"].items()):
+            choices = ", ".join(f"{action}: {count}" for action, count in sorted(counts.items()))
+            print(f"    kayıtta {recorded} -> {choices}")
     
-    # Her bet seviyesi için pot hesapla
-    for i, player in enumerate(players_by_bet):
-        current_bet = player.bet
-        
-        # Eğer önceki bet'ten farklı bir bet seviyesi varsa, pot hesapla
-        if current_bet > prev_bet:
-            # Bu seviyeye kadar olan farkı hesapla
-            bet_diff = current_bet - prev_bet
-            # Bu seviyede pot'a katılan oyuncu sayısı
-            contributing_players = players_by_bet[i:]  # Bu ve daha büyük bet yapan oyuncular
-            
-            # Pot miktarını hesapla
-            pot_amount = bet_diff * len(contributing_players)
-            pot_amount = min(pot_amount, remaining_pot)  # Toplam pottan fazla olamaz
-            
-            # Kalan potu güncelle
-            remaining_pot -= pot_amount
-            
-            if pot_amount > 0:  # Sadece pozitif pot varsa
-                # Bu pot seviyesinde yarışabilecek oyuncuları bul (fold olmamış)
-                eligible_players = [p for p in contributing_players if not p.is_folded]
-                if eligible_players:
-                    # En güçlü eli olan oyuncu(lar)ı bul
-                    eligible_players.sort(key=lambda p: player_hand_map.get(p, 7462))  # En düşük skor (en iyi el)
-                    best_score = player_hand_map.get(eligible_players[0], 7462)
-                    
-                    # Aynı skora sahip oyuncuları bul (beraberlik durumu)
-                    tied_winners = [p for p in eligible_players if player_hand_map.get(p, 7462) == best_score]
-                    
-                    # Her kazanana eşit pay ver
-                    pot_share = pot_amount // len(tied_winners)
-                    remainder = pot_amount % len(tied_winners)  # Kalan chipler
-                    
-                    for winner in tied_winners:
-                        winner_share = pot_share
-                        if remainder > 0:
-                            winner_share += 1
-                            remainder -= 1
-                            
-                        winner.stack += winner_share
-        
-        prev_bet = current_bet
-                
-    # Pot'u sıfırla
-    game.pot = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"\nSonuçlar '{output_file}' dosyasına kaydedildi.")
+    return results
 
 def start_ui():
     """UI modunu başlatır"""
@@ -570,7 +272,8 @@ def start_ui():
         print("UI modülü bulunamadı. Lütfen ui.py dosyasının olduğundan emin olun.")
         sys.exit(1)
 
-def benchmark_agents(agent_types, num_games, starting_stack, max_round, small_blind):
+def benchmark_agents(agent_types, num_games, starting_stack, max_round, small_blind, seed=None, history_file=None,
+                     workers=1, engine="python", games_file=None, checkpointer=None, resume=None):
     """
     Belirtilen agent tiplerini karşılaştırır ve grafiklerini üretir.
     Args:
@@ -579,262 +282,54 @@ def benchmark_agents(agent_types, num_games, starting_stack, max_round, small_bl
         starting_stack: Başlangıç chip miktarı
         max_round: Her oyunda oynanacak maksimum el sayısı
         small_blind: Küçük blind miktarı
+        seed: Kök tohum; her oyun kendi akışını alır (bkz. rng_streams.py)
+        history_file: Verilirse oynanan eller bu dosyaya ikili el geçmişi olarak yazılır (bkz. hand_history.py)
+        workers: Oyunları paralel oynatan süreç sayısı; sonuçlar süreç sayısından bağımsızdır (bkz. game_runner.py)
+        engine: Oyun motoru, "python" veya "vectorized" (yalnızca heuristic ajanlar)
+        games_file: Verilirse oyun başına kayıtlar bu dosyaya JSONL olarak yazılır (bkz. results_stream.py)
+        checkpointer: Verilirse periyodik kontrol noktası yazılır (bkz. checkpoint.py)
+        resume: Yüklenmiş kontrol noktası; verilirse çalışma kaldığı oyundan devam eder
     Returns:
         stats: Karşılaştırma istatistikleri içeren sözlük
     """
-    print(f"Agent Karşılaştırma Benchmark'ı Başlatılıyor...")
+    print(f"Agent Karşılaştırma Benchmark'ı Başlatılıyor{' (vektörel motor)' if engine == 'vectorized' else ''}...")
     print(f"Agent Tipleri: {', '.join(agent_types)}")
     print(f"Oyun Sayısı: {num_games}, Başlangıç Stack: {starting_stack}, Max El: {max_round}")
     
-    # İstatistikler için veri yapıları
+    config = {
+        "engine": engine,
+        "agent_types": agent_types,
+        "player_names": [f"{agent_type}-{i+1}" for i, agent_type in enumerate(agent_types)],
+        "num_games": num_games,
+        "starting_stack": starting_stack,
+        "max_round": max_round,
+        "small_blind": small_blind,
+        "seed": seed,
+        "workers": workers,
+        "bet_sizes": list(bet_abstraction.BET_SIZES),
+        "record_history": bool(history_file)
+    }
+    summary, elapsed = play_games(config, games_file, history_file, checkpointer, resume)
+    
+    # İstatistikler akıştan hesaplanan özetten; oyun başına kayıtlar `games_file`'da
     stats = {
-        "wins": {agent_type: 0 for agent_type in agent_types},
-        "final_stacks": {agent_type: [] for agent_type in agent_types},
-        "avg_final_stack": {agent_type: 0 for agent_type in agent_types},
+        "wins": summary.wins,
+        "avg_final_stack": {agent_type: summary.avg_final_stack(agent_type) for agent_type in agent_types},
         "win_rate": {agent_type: 0 for agent_type in agent_types},
-        "showdown_wins": {agent_type: 0 for agent_type in agent_types},
-        "all_in_count": {agent_type: 0 for agent_type in agent_types},
-        "fold_count": {agent_type: 0 for agent_type in agent_types},
-        "raise_count": {agent_type: 0 for agent_type in agent_types},
-        "rounds_survived": {agent_type: [] for agent_type in agent_types},
-        "games_history": []
+        **summary.counts,
+        "avg_rounds_survived": {agent_type: summary.avg_rounds_survived(agent_type) for agent_type in agent_types},
+        "final_stack_distribution": {agent_type: summary.stack_distribution(agent_type) for agent_type in agent_types},
+        "hands_played": summary.hands_played,
+        "execution_time": elapsed,
+        "config": {**config, "games_file": games_file}
     }
-    
-    # Her oyun için
-    for game_idx in range(num_games):
-        print(f"Oyun {game_idx+1}/{num_games} oynanıyor...")
-        
-        # Oyun nesnesini oluştur
-        game = PokerGame(
-            player_names=[f"Player-{i}" for i in range(len(agent_types))],
-            player_types=agent_types,
-            starting_stack=starting_stack,
-            max_round=max_round,
-            small_blind=small_blind
-        )
-        
-        # Oyuncuları agent'lar ile değiştir
-        game.players = []
-        for i, agent_type in enumerate(agent_types):
-            agent = create_agent(agent_type, f"{agent_type}-{i+1}", starting_stack)
-            agent.is_human = False
-            agent.id = i
-            # İstatistik verilerini tutacak ekstra alanlar ekle
-            agent.showdown_wins = 0
-            agent.all_in_count = 0
-            agent.fold_count = 0
-            agent.raise_count = 0
-            game.players.append(agent)
-        
-        # Başlangıç round durumu
-        current_round = 0
-        eliminated_round = {agent_type: max_round for agent_type in agent_types}  # Her agent'ın elendiği round
-        
-        # Tüm elleri oyna
-        while current_round < max_round:
-            current_round += 1
-            game.round = current_round
-            
-            # Aktif oyuncuları belirle (Stack > 0)
-            active_players = [p for p in game.players if p.stack > 0]
-            
-            # Elenen oyuncuların elendikleri turu kaydet
-            for i, player in enumerate(game.players):
-                if player.stack <= 0 and eliminated_round[agent_types[i]] == max_round:
-                    eliminated_round[agent_types[i]] = current_round
-            
-            if len(active_players) <= 1:
-                break  # Yeterli aktif oyuncu yoksa oyunu bitir
-                
-            # Önceki eli temizle
-            game.reset_round()
-            
-            # Oyun mekaniği (mevcut koddan)
-            # ... (mevcut oyun döngüsü kodu)
-            # Desteyi karıştır ve kartları dağıt
-            game.deck.shuffle()
-            game.deal_hole_cards()
-            
-            # Aktif oyuncular arasından dealer, small blind ve big blind pozisyonlarını belirle
-            active_count = len(active_players)
-            dealer_idx = current_round % active_count
-            sb_idx = (dealer_idx + 1) % active_count
-            bb_idx = (dealer_idx + 2) % active_count
-            
-            # Small blind ve big blind oyuncularını al
-            small_blind_player = active_players[sb_idx]
-            big_blind_player = active_players[bb_idx]
-            
-            # Small blind
-            small_blind_amount = min(small_blind, small_blind_player.stack)
-            game.place_bet(small_blind_player, small_blind_amount)
-            
-            # Big blind
-            big_blind_amount = min(small_blind * 2, big_blind_player.stack)
-            game.place_bet(big_blind_player, big_blind_amount)
-            
-            # Current bet'i büyük blind olarak ayarla
-            game.current_bet = big_blind_amount
-            
-            # Aksiyon sayaçlarını takip et
-            # Preflop turunu oynamadan önce sayaçları sıfırla
-            for player in game.players:
-                player.action_this_round = {"fold": 0, "call": 0, "check": 0, "raise": 0, "all_in": 0}
-            
-            # Preflop - Big blind'ın yanındaki oyuncudan başla
-            current_betting_idx = (bb_idx + 1) % active_count
-            play_betting_round(game, active_players, current_betting_idx)
-            
-            # İstatistik güncelleme - aksiyon sayaçları
-            for player in game.players:
-                i = player.id
-                agent_type = agent_types[i]
-                if hasattr(player, 'action_this_round'):
-                    if player.action_this_round.get('fold', 0) > 0:
-                        stats['fold_count'][agent_type] += 1
-                    if player.action_this_round.get('raise', 0) > 0:
-                        stats['raise_count'][agent_type] += 1
-                    if player.stack == 0 and not player.is_folded:
-                        stats['all_in_count'][agent_type] += 1
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    stats['showdown_wins'][agent_types[winner.id]] += 1
-                    game.pot = 0
-                continue
-            
-            # Flop
-            game.deal_community_cards(3)
-            reset_betting_round(game)
-            for player in game.players:
-                player.action_this_round = {"fold": 0, "call": 0, "check": 0, "raise": 0, "all_in": 0}
-            # Flop için dealer'dan sonraki ilk oyuncu bahis turunu başlatır
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # İstatistik güncelleme
-            for player in game.players:
-                i = player.id
-                agent_type = agent_types[i]
-                if hasattr(player, 'action_this_round'):
-                    if player.action_this_round.get('fold', 0) > 0:
-                        stats['fold_count'][agent_type] += 1
-                    if player.action_this_round.get('raise', 0) > 0:
-                        stats['raise_count'][agent_type] += 1
-                    if player.stack == 0 and not player.is_folded:
-                        stats['all_in_count'][agent_type] += 1
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    stats['showdown_wins'][agent_types[winner.id]] += 1
-                    game.pot = 0
-                continue
-            
-            # Turn
-            game.deal_community_cards(1)
-            reset_betting_round(game)
-            for player in game.players:
-                player.action_this_round = {"fold": 0, "call": 0, "check": 0, "raise": 0, "all_in": 0}
-            # Turn için dealer'dan sonraki ilk oyuncu bahis turunu başlatır
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # İstatistik güncelleme
-            for player in game.players:
-                i = player.id
-                agent_type = agent_types[i]
-                if hasattr(player, 'action_this_round'):
-                    if player.action_this_round.get('fold', 0) > 0:
-                        stats['fold_count'][agent_type] += 1
-                    if player.action_this_round.get('raise', 0) > 0:
-                        stats['raise_count'][agent_type] += 1
-                    if player.stack == 0 and not player.is_folded:
-                        stats['all_in_count'][agent_type] += 1
-            
-            # Oyun devam ediyor mu kontrol et
-            if len([p for p in game.players if not p.is_folded]) <= 1:
-                # Showdown - kazanan belirleme
-                winner = determine_winner(game)
-                if winner:
-                    winner.stack += game.pot
-                    stats['showdown_wins'][agent_types[winner.id]] += 1
-                    game.pot = 0
-                continue
-            
-            # River
-            game.deal_community_cards(1)
-            reset_betting_round(game)
-            for player in game.players:
-                player.action_this_round = {"fold": 0, "call": 0, "check": 0, "raise": 0, "all_in": 0}
-            # River için dealer'dan sonraki ilk oyuncu bahis turunu başlatır
-            start_idx = (dealer_idx + 1) % active_count
-            play_betting_round(game, active_players, start_idx)
-            
-            # İstatistik güncelleme
-            for player in game.players:
-                i = player.id
-                agent_type = agent_types[i]
-                if hasattr(player, 'action_this_round'):
-                    if player.action_this_round.get('fold', 0) > 0:
-                        stats['fold_count'][agent_type] += 1
-                    if player.action_this_round.get('raise', 0) > 0:
-                        stats['raise_count'][agent_type] += 1
-                    if player.stack == 0 and not player.is_folded:
-                        stats['all_in_count'][agent_type] += 1
-            
-            # Showdown
-            process_showdown(game)
-        
-        # Oyun sonuçlarını kaydet
-        game_results = {
-            "game_idx": game_idx,
-            "final_stacks": {},
-            "winner": None,
-            "rounds_played": current_round
-        }
-        
-        # En çok stack'e sahip oyuncuyu bul
-        max_stack = -1
-        winner_idx = -1
-        
-        for i, player in enumerate(game.players):
-            agent_type = agent_types[i]
-            
-            # Final stack'i kaydet
-            stats["final_stacks"][agent_type].append(player.stack)
-            game_results["final_stacks"][agent_type] = player.stack
-            
-            # Rounds survived - eğer oyuncu elendiyse
-            if player.stack <= 0:
-                stats["rounds_survived"][agent_type].append(eliminated_round[agent_type])
-            else:
-                stats["rounds_survived"][agent_type].append(max_round)
-            
-            # Kazanan kontrolü
-            if player.stack > max_stack:
-                max_stack = player.stack
-                winner_idx = i
-        
-        # Kazananı kaydet
-        if winner_idx >= 0:
-            winner_type = agent_types[winner_idx]
-            stats["wins"][winner_type] += 1
-            game_results["winner"] = winner_type
-        
-        # Oyun tarihçesini kaydet
-        stats["games_history"].append(game_results)
-        
+    report_benchmark(stats, agent_types, num_games)
+    return stats
+
+def report_benchmark(stats, agent_types, num_games):
+    """Benchmark istatistiklerini hesaplar, yazdırır ve grafiklerini üretir"""
     # İstatistikleri hesapla
     for agent_type in agent_types:
-        stats["avg_final_stack"][agent_type] = np.mean(stats["final_stacks"][agent_type])
         stats["win_rate"][agent_type] = stats["wins"][agent_type] / num_games
     
     # Sonuçları yazdır
@@ -848,14 +343,47 @@ def benchmark_agents(agent_types, num_games, starting_stack, max_round, small_bl
         print(f"  All-in Sayısı: {stats['all_in_count'][agent_type]}")
         print(f"  Fold Sayısı: {stats['fold_count'][agent_type]}")
         print(f"  Raise Sayısı: {stats['raise_count'][agent_type]}")
-        if stats["rounds_survived"][agent_type]:
-            print(f"  Ortalama Hayatta Kalınan Tur: {np.mean(stats['rounds_survived'][agent_type]):.2f}")
+        print(f"  Ortalama Hayatta Kalınan Tur: {stats['avg_rounds_survived'][agent_type]:.2f}")
         print("-" * 30)
     
+    # El değerlendirme önbelleği istatistikleri
+    stats["evaluator_cache"] = SHOWDOWN_CACHE.stats()
+    cache_stats = stats["evaluator_cache"]
+    print("El Değerlendirme Önbelleği:")
+    print(f"  Kapasite: {cache_stats['capacity']}, Boyut: {cache_stats['size']}")
+    print(f"  Hit: {cache_stats['hits']}, Miss: {cache_stats['misses']}, Eviction: {cache_stats['evictions']}")
+    print(f"  Hit Oranı: {cache_stats['hit_rate']:.2%}")
+    print("-" * 30)
+    
     # Grafikleri oluştur
     plot_comparison_charts(stats, agent_types, num_games)
-    
-    return stats
+
+def distribution_box_stats(distribution, label):
+    """Değer -> sayı dağılımından `Axes.bxp` kutu grafiği istatistikleri (ham veri olmadan)"""
+    values = sorted(distribution)
+    cumulative = np.cumsum([distribution[value] for value in values])
+    total = int(cumulative[-1]) if len(values) else 0
+    if total == 0:
+        return {"label": label, "med": 0, "q1": 0, "q3": 0, "whislo": 0, "whishi": 0, "fliers": []}
+    
+    def value_at(rank):
+        return values[int(np.searchsorted(cumulative, rank, side="right"))]
+    
+    def percentile(fraction):
+        # np.percentile ile aynı (doğrusal ara değer)
+        position = fraction * (total - 1)
+        lower = int(position)
+        low, high = value_at(lower), value_at(min(lower + 1, total - 1))
+        return low + (high - low) * (position - lower)
+    
+    q1, med, q3 = percentile(0.25), percentile(0.5), percentile(0.75)
+    iqr = q3 - q1
+    inside = [value for value in values if q1 - 1.5 * iqr <= value <= q3 + 1.5 * iqr]
+    return {
+        "label": label, "med": med, "q1": q1, "q3": q3,
+        "whislo": min(inside), "whishi": max(inside),
+        "fliers": [value for value in values if value < inside[0] or value > inside[-1]]
+    }
 
 def plot_comparison_charts(stats, agent_types, num_games):
     """
@@ -918,7 +446,7 @@ def plot_comparison_charts(stats, agent_types, num_games):
     
     # 4. Hayatta Kalınan Ortalama Tur
     plt.figure(figsize=(10, 6))
-    avg_rounds = [np.mean(stats["rounds_survived"][agent]) for agent in agent_types]
+    avg_rounds = [stats["avg_rounds_survived"][agent] for agent in agent_types]
     bars = plt.bar(agent_types, avg_rounds, color=colors)
     plt.title("Ortalama Hayatta Kalınan Tur", fontsize=14)
     plt.ylabel("Tur Sayısı")
@@ -934,8 +462,9 @@ def plot_comparison_charts(stats, agent_types, num_games):
     
     # 5. Final Stack Dağılımı (Box Plot)
     plt.figure(figsize=(10, 6))
-    box_data = [stats["final_stacks"][agent] for agent in agent_types]
-    plt.boxplot(box_data, labels=agent_types)
+    # Kutu grafiği ham stack listeleri yerine dağılımdan çizilir
+    box_data = [distribution_box_stats(stats["final_stack_distribution"][agent], agent) for agent in agent_types]
+    plt.gca().bxp(box_data)
     plt.title("Final Stack Dağılımı", fontsize=14)
     plt.ylabel("Chip Miktarı")
     plt.grid(axis='y', linestyle='--', alpha=0.7)
@@ -977,7 +506,7 @@ def plot_comparison_charts(stats, agent_types, num_games):
     plt.legend()
     
     plt.subplot(2, 3, 5)
-    plt.boxplot(box_data, labels=agent_types)
+    plt.gca().bxp(box_data)
     plt.title("Stack Dağılımı (Box Plot)")
     plt.ylabel("Chip")
     
@@ -989,8 +518,8 @@ def plot_comparison_charts(stats, agent_types, num_games):
 def main():
     """Ana program - Komut satırı argümanlarını işler ve uygun modu başlatır"""
     parser = argparse.ArgumentParser(description="Poker AI Karşılaştırma Aracı")
-    parser.add_argument("--mode", choices=["ui", "ai_compare", "benchmark"], default="ui",
-                      help="Çalıştırma modu: ui (kullanıcı arayüzü), ai_compare (AI performans karşılaştırması) veya benchmark (grafik üreten detaylı karşılaştırma)")
+    parser.add_argument("--mode", choices=["ui", "ai_compare", "benchmark", "equity", "replay"], default="ui",
+                      help="Çalıştırma modu: ui (kullanıcı arayüzü), ai_compare (AI performans karşılaştırması), benchmark (grafik üreten detaylı karşılaştırma), equity (dosyadan equity sorguları) veya replay (el geçmişindeki kararlarda ajanları sorgulama)")
     
     # AI Karşılaştırma ve Benchmark modu için ek parametreler
     parser.add_argument("--agents", nargs="+", default=["basic_heuristic", "aggressive_heuristic", "mcts", "expectiminimax"],
@@ -1005,80 +534,151 @@ def main():
                       help="Küçük blind miktarı")
     parser.add_argument("--output", default="",
                       help="Sonuçların yazılacağı dosya (belirtilmezse tarih/saat damgalı bir ad oluşturulur)")
+    parser.add_argument("--engine", choices=["python", "vectorized"], default="python",
+                      help="Oyun motoru: python (masa masa) veya vectorized (binlerce masa NumPy ile aynı anda; yalnızca heuristic ajanlar)")
+    parser.add_argument("--seed", type=int, default=None,
+                      help="Kök tohum: aynı tohumla oyunlar birebir tekrarlanır (belirtilmezse rastgele)")
+    parser.add_argument("--games_output", default="",
+                      help="Oyun başına kayıtların akış halinde yazılacağı JSONL dosyası (belirtilmezse oyun kayıtları yazılmaz, yalnızca özet tutulur)")
+    parser.add_argument("--checkpoint", default="",
+                      help="Periyodik kontrol noktasının yazılacağı dosya (belirtilmezse kontrol noktası yazılmaz)")
+    parser.add_argument("--checkpoint_interval", type=float, default=DEFAULT_INTERVAL,
+                      help="Kontrol noktaları arasındaki en kısa süre (saniye; 0 kontrol noktasını kapatır)")
+    parser.add_argument("--resume", default="",
+                      help="Yarıda kalan ai_compare/benchmark çalışmasına bu kontrol noktasından devam et (ayarlar kontrol noktasından alınır)")
+    parser.add_argument("--history", default="",
+                      help="Oynanan ellerin yazılacağı ikili el geçmişi dosyası (.gz / .xz uzantısı sıkıştırır; yalnızca python motoru)")
+    parser.add_argument("--cache_size", type=int, default=1 << 16,
+                      help="El değerlendirme önbelleğinin kapasitesi (0 önbelleği kapatır)")
+    parser.add_argument("--bet_sizes", type=float, nargs="+", default=list(bet_abstraction.DEFAULT_BET_SIZES),
+                      help="Arama ajanlarının dallandığı raise boyutları (pot oranı; all-in her zaman dahil)")
+    
+    # Equity modu için ek parametreler
+    parser.add_argument("--input", default="",
+                      help="Equity sorgularını içeren JSONL dosyası (equity modu) veya el geçmişi dosyası (replay modu)")
+    parser.add_argument("--flush_every", type=int, default=64,
+                      help="Equity modunda sonuç dosyasının kaç sorguda bir diske boşaltılacağı")
+    parser.add_argument("--workers", type=int, default=1,
+                      help="Paralel çalışacak süreç sayısı (ai_compare/benchmark modlarında oyunlar süreçlere dağıtılır; yalnızca python motoru)")
+    parser.add_argument("--target_se", type=float, default=equity.DEFAULT_TARGET_SE,
+                      help="Monte Carlo equity için hedef standart hata")
     
     args = parser.parse_args()
+    resume = load_checkpoint(args.resume) if args.resume else None
+    if resume:
+        args.mode = resume["mode"]  # Devam edilen çalışmanın modu
+    configure_cache(args.cache_size)
+    if any(size <= 0 for size in args.bet_sizes):
+        parser.error("--bet_sizes değerleri pozitif olmalı")
+    bet_abstraction.configure_bet_sizes(args.bet_sizes)
     
     if args.mode == "ui":
         # UI modunu başlat
         start_ui()
-    elif args.mode == "benchmark":
-        # Benchmark modu (grafikli)
-        stats = benchmark_agents(
-            agent_types=args.agents,
-            num_games=args.games,
-            starting_stack=args.stack,
-            max_round=args.max_round,
-            small_blind=args.small_blind
-        )
-        
-        # İstatistikleri JSON olarak kaydet
+    elif args.mode == "equity":
+        # Equity sorgularını dosyadan akış halinde işle
+        if not args.input:
+            parser.error("equity modu için --input gerekli")
         if not args.output:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"benchmark_results_{timestamp}.json"
+            output_file = f"equity_results_{timestamp}.jsonl"
         else:
             output_file = args.output
-            
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=4, ensure_ascii=False)
         
-        print(f"Ayrıntılı sonuçlar '{output_file}' dosyasına kaydedildi.")
-    else:
-        # AI performans karşılaştırma modunu başlat
+        run_equity_queries(
+            input_file=args.input,
+            output_file=output_file,
+            flush_every=args.flush_every,
+            workers=args.workers,
+            target_se=args.target_se
+        )
+    elif args.mode == "replay":
+        # Kayıtlı ellerde ajanların kararlarını kayıtla karşılaştır
+        if not args.input:
+            parser.error("replay modu için --input gerekli")
         if not args.output:
-            # Çıktı dosyası belirtilmemişse, tarih ve saat damgalı bir ad oluştur
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"ai_comparison_{timestamp}.json"
+            output_file = f"replay_results_{timestamp}.json"
         else:
             output_file = args.output
         
-        run_ai_comparison(
+        run_replay(
+            history_file=args.input,
             agent_types=args.agents,
-            num_games=args.games,
-            starting_stack=args.stack,
-            max_round=args.max_round,
-            small_blind=args.small_blind,
-            output_file=output_file
+            output_file=output_file,
+            workers=args.workers,
+            seed=args.seed
         )
-
-def el_gucu_hesapla(hole_cards, community_cards):
-    """Treys kütüphanesini kullanarak el gücünü hesapla"""
-    from treys import Card as TreysCard, Evaluator
-    
-    # Kartları Treys formatına dönüştür
-    treys_hole_cards = []
-    for card in hole_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_hole_cards.append(treys_card)
-    
-    treys_community_cards = []
-    for card in community_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_community_cards.append(treys_card)
-    
-    # El skorunu hesapla (1 en iyi, 7462 en kötü)
-    evaluator = Evaluator()
-    score = evaluator.evaluate(treys_community_cards, treys_hole_cards)
-    return score
+    else:
+        # ai_compare veya benchmark (grafikli) modu
+        if resume:
+            # Ayarlar ve dosyalar kontrol noktasından alınır
+            config = resume["config"]
+            bet_abstraction.configure_bet_sizes(config["bet_sizes"])
+            output_file = resume["output_file"]
+            games_file, history_file = resume["games_file"], resume["history_file"]
+            checkpoint_file = args.resume
+            params = {name: config[name] for name in ("agent_types", "num_games", "starting_stack", "max_round",
+                                                      "small_blind", "seed", "workers", "engine")}
+        else:
+            if not args.output:
+                # Çıktı dosyası belirtilmemişse, tarih ve saat damgalı bir ad oluştur
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                prefix = "benchmark_results" if args.mode == "benchmark" else "ai_comparison"
+                output_file = f"{prefix}_{timestamp}.json"
+            else:
+                output_file = args.output
+            games_file = args.games_output or None
+            history_file = args.history or None
+            checkpoint_file = args.checkpoint or None
+            params = {
+                "agent_types": args.agents,
+                "num_games": args.games,
+                "starting_stack": args.stack,
+                "max_round": args.max_round,
+                "small_blind": args.small_blind,
+                "seed": args.seed,
+                "workers": args.workers,
+                "engine": args.engine
+            }
+        
+        # Motor ve ajan ayarları doğrulanır (devam eden çalışmada kontrol noktasındakiler)
+        if params["engine"] == "vectorized":
+            unsupported = [agent_type for agent_type in params["agent_types"] if agent_type not in POLICIES]
+            if unsupported:
+                parser.error(f"vectorized motor şu ajanları desteklemiyor: {', '.join(unsupported)} "
+                             f"(desteklenenler: {', '.join(POLICIES)})")
+            if history_file:
+                parser.error("--history yalnızca python motoruyla kullanılabilir")
+        
+        checkpointer = None
+        if checkpoint_file and args.checkpoint_interval > 0:
+            checkpointer = Checkpointer(checkpoint_file, args.checkpoint_interval,
+                                        mode=args.mode, output_file=output_file)
+        
+        if args.mode == "benchmark":
+            stats = benchmark_agents(
+                **params,
+                history_file=history_file,
+                games_file=games_file,
+                checkpointer=checkpointer,
+                resume=resume
+            )
+            
+            # İstatistikleri JSON olarak kaydet
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=4, ensure_ascii=False)
+            
+            print(f"Ayrıntılı sonuçlar '{output_file}' dosyasına kaydedildi.")
+        else:
+            run_ai_comparison(
+                **params,
+                output_file=output_file,
+                history_file=history_file,
+                games_file=games_file,
+                checkpointer=checkpointer,
+                resume=resume
+            )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
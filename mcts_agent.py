@@ -1,23 +1,22 @@
-import random
 import math
-import copy
-from treys import Card as TreysCard, Evaluator
 
 from poker import Player
+from hand_evaluator import el_gucu_hesapla
 
 class MCTSNode:
-    def __init__(self, game_state, parent=None, action=None):
+    def __init__(self, game_state, parent=None, action=None, bet_sizes=None):
         self.game_state = game_state
         self.parent = parent
-        self.action = action  # Bu düğüme gelmek için yapılan aksiyon
+        self.action = action  # Bu düğüme gelmek için yapılan (aksiyon, miktar)
+        self.bet_sizes = bet_sizes
         self.children = []
         self.visits = 0
         self.wins = 0
         self.untried_actions = self.get_possible_actions()
         
     def get_possible_actions(self):
-        # Mevcut durumda yapılabilecek aksiyonlar
-        return ["fold", "call", "raise"]
+        # Mevcut durumda yapılabilecek (aksiyon, miktar) çiftleri
+        return self.game_state.legal_actions(self.bet_sizes)
         
     def select_child(self):
         # UCB1 formülüne göre en iyi çocuğu seç
@@ -41,7 +40,7 @@ class MCTSNode:
         
     def add_child(self, action, game_state):
         # Yeni bir çocuk düğüm ekle
-        child = MCTSNode(game_state, self, action)
+        child = MCTSNode(game_state, self, action, self.bet_sizes)
         self.untried_actions.remove(action)
         self.children.append(child)
         return child
@@ -61,14 +60,16 @@ class MCTSNode:
         return self.game_state.is_terminal()
 
 class MCTSAgent(Player):
-    def __init__(self, name, stack, simulation_count=1000):
+    def __init__(self, name, stack, simulation_count=1000, bet_sizes=None):
         super().__init__(name, stack)
         self.simulation_count = simulation_count
-        self.evaluator = Evaluator()
+        self.bet_sizes = bet_sizes  # None: süreç geneli pot oranları (bkz. bet_abstraction.py)
+        self.chosen_raise = None  # Son kararda seçilen raise miktarı
         
     def get_action(self, game_state):
         # Monte Carlo Tree Search ile en iyi aksiyonu seç
-        root = MCTSNode(copy.deepcopy(game_state))
+        root = MCTSNode(game_state.export_state(), bet_sizes=self.bet_sizes)
+        self.chosen_raise = None
         
         # MCTS döngüsü
         for i in range(self.simulation_count):
@@ -76,7 +77,7 @@ class MCTSAgent(Player):
             node = self.select(root)
             
             # 2. Expansion: Yeni bir düğüm ekle
-            if not node.is_terminal() and node.is_fully_expanded():
+            if not node.is_terminal() and not node.is_fully_expanded():
                 node = self.expand(node)
                 
             # 3. Simulation: Oyunu simüle et
@@ -90,12 +91,16 @@ class MCTSAgent(Player):
             # Eğer hiç çocuk düğüm yoksa, varsayılan olarak "call" aksiyonunu döndür
             return "call"
             
-        best_child = self.best_child(root)
-        return best_child.action
+        action, amount = self.best_child(root).action
+        if action == "raise":
+            self.chosen_raise = amount
+        return action
     
     def get_raise_amount(self, game_state):
-        # Monte Carlo Tree Search ile en iyi raise miktarını seç
-        # Şimdilik basit bir heuristik kullanalım: pot'un %75'i
+        # Arama ağacında seçilen raise miktarı
+        if self.chosen_raise is not None:
+            return self.chosen_raise
+        # Arama yapılmadıysa basit bir heuristik: pot'un %75'i
         needed_to_call = game_state.current_bet - self.bet
         raise_amount = needed_to_call + int(0.75 * game_state.pot)
         
@@ -112,22 +117,25 @@ class MCTSAgent(Player):
     
     def expand(self, node):
         # Yeni bir düğüm ekle
-        action = random.choice(node.untried_actions)
+        action = self.rng.choice(node.untried_actions)
         new_game_state = self.simulate_action(node.game_state, action)
         return node.add_child(action, new_game_state)
     
     def simulate(self, node):
-        # Oyunu simüle et
-        game_state = copy.deepcopy(node.game_state)
+        # Oyunu simüle et; rollout kendi kopyası üzerinde yerinde ilerler
+        game_state = node.game_state.clone()
         
         # Rakip kartlarını rastgele ata (kısmi bilgi modellemesi)
         self.assign_random_cards(game_state)
         
-        # Oyunu sonuna kadar rastgele oyna
+        # Oyunu sonuna kadar yasal aksiyonlar arasından rastgele oyna; ödenecek
+        # bir şey kalmadığında (fold yasal değil) bahis turu biter, kartlar açılır
         while not game_state.is_terminal():
-            possible_actions = ["fold", "call", "raise"]
-            action = random.choice(possible_actions)
-            game_state = self.simulate_action(game_state, action)
+            if game_state.is_betting_round_done():
+                self.deal_next_street(game_state)
+            else:
+                action = self.rng.choice(game_state.legal_actions(self.bet_sizes))
+                self.apply_action(game_state, action)
         
         # Sonucu hesapla
         return self.calculate_result(game_state)
@@ -145,56 +153,37 @@ class MCTSAgent(Player):
         return max(node.children, key=lambda c: c.visits)
     
     def simulate_action(self, game_state, action):
-        # Aksiyonu simüle et
-        new_game_state = copy.deepcopy(game_state)
-        current_player = new_game_state.get_current_player()
-        
-        # Aksiyonu uygula
-        if action == "fold":
-            # Fold aksiyonu - oyuncu eli bırakır
-            current_player.is_folded = True
-        elif action == "call":
-            # Call aksiyonu - mevcut bet kadar çağırır
-            call_amount = new_game_state.current_bet - current_player.bet
-            if call_amount > 0:
-                current_player.stack -= call_amount
-                current_player.bet += call_amount
-                new_game_state.pot += call_amount
-        elif action == "raise":
-            # Raise aksiyonu - yeni bet miktarı
-            raise_amount = self.get_raise_amount(new_game_state)
-            current_player.stack -= raise_amount
-            current_player.bet += raise_amount
-            new_game_state.current_bet = current_player.bet
-            new_game_state.pot += raise_amount
-        
-        # Bir sonraki oyuncuya geç
-        new_game_state.next_player()
-        
+        # Aksiyonu durumun bir kopyası üzerinde simüle et
+        new_game_state = game_state.clone()
+        self.apply_action(new_game_state, action)
         return new_game_state
     
+    def apply_action(self, game_state, action):
+        # (aksiyon, miktar) çiftini kompakt durum üzerinde yerinde uygula ve sıradaki oyuncuya geç
+        return game_state.apply(*action)
+    
     def assign_random_cards(self, game_state):
         # Rakip kartlarını rastgele ata
         # Önce mevcut dağıtılmış kartları belirle (elimizde ve masada olanlar)
-        used_cards = []
-        
-        # Bizim kartlarımız
-        for card in self.hand:
-            used_cards.append(card)
-        
-        # Masa kartları
-        for card in game_state.community_cards:
-            used_cards.append(card)
+        used_mask = self.hand_mask | game_state.board_mask
         
         # Diğer oyuncuların kartları (eğer biliyorsak)
-        for player in game_state.players:
-            if player.id != self.id and not player.is_folded:
+        for seat in game_state.active_seats():
+            if game_state.ids[seat] != self.id:
                 # Her oyuncuya 2 rastgele kart ver
-                available_cards = [card for card in game_state.deck.cards if card not in used_cards]
-                if len(available_cards) >= 2:
-                    player_cards = random.sample(available_cards, 2)
-                    player.hand = player_cards
-                    used_cards.extend(player_cards)
+                card_ids = game_state.sample_cards(2, used_mask, self.rng)
+                if len(card_ids) == 2:
+                    hand_mask = (1 << card_ids[0]) | (1 << card_ids[1])
+                    game_state.set_hand(seat, hand_mask)
+                    used_mask |= hand_mask
+    
+    def deal_next_street(self, game_state):
+        # Sıradaki sokağın kartlarını eldeki ve masadaki kartlar dışından rastgele aç
+        used_mask = game_state.board_mask
+        for hand_mask in game_state.hands:
+            used_mask |= hand_mask
+        num_cards = 3 if not game_state.board else 1
+        game_state.add_community_cards(game_state.sample_cards(num_cards, used_mask, self.rng))
     
     def calculate_result(self, game_state):
         # Oyun sonucunu hesapla (kazanç veya kayıp)
@@ -203,56 +192,25 @@ class MCTSAgent(Player):
             return -1
         
         # Showdown (el değerlendirme) yapıyoruz
-        active_players = [p for p in game_state.players if not p.is_folded]
+        active_seats = game_state.active_seats()
         
         # Sadece bir oyuncu kaldıysa, o kazanır
-        if len(active_players) == 1:
-            return 1 if active_players[0].id == self.id else -1
+        if len(active_seats) == 1:
+            return 1 if game_state.ids[active_seats[0]] == self.id else -1
         
         # Birden fazla oyuncu kaldıysa, el gücüne göre kazananı belirle
-        player_scores = []
-        for player in active_players:
-            score = self.calculate_hand_score(player.hand, game_state.community_cards)
-            player_scores.append((player, score))
+        scores = [game_state.hand_score(seat) for seat in active_seats]
         
         # En düşük skor en iyi el (treys'te 1 en iyi, 7462 en kötü)
-        player_scores.sort(key=lambda x: x[1])
-        winner = player_scores[0][0]
+        winner = active_seats[scores.index(min(scores))]
         
-        return 1 if winner.id == self.id else -1
+        return 1 if game_state.ids[winner] == self.id else -1
     
     def calculate_hand_score(self, hole_cards, community_cards):
-        # Treys evaluator kullanarak el skorunu hesapla
-        evaluator = Evaluator()
-        
-        # Kartları Treys formatına dönüştür
-        treys_hole_cards = []
-        for card in hole_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            treys_hole_cards.append(treys_card)
-        
-        treys_community_cards = []
-        for card in community_cards:
-            suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-            rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                       "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-            
-            card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-            treys_card = TreysCard.new(card_str)
-            treys_community_cards.append(treys_card)
-        
-        # El skorunu hesapla (1 en iyi, 7462 en kötü)
-        score = evaluator.evaluate(treys_community_cards, treys_hole_cards)
-        return score
+        # Ortak evaluator ile el skorunu hesapla (1 en iyi, 7462 en kötü)
+        return el_gucu_hesapla(hole_cards, community_cards)
     
     # Yardımcı fonksiyonlar
     def is_folded(self, player_id, game_state):
-        for player in game_state.players:
-            if player.id == player_id:
-                return player.is_folded
-        return False 
\ No newline at end of file
+        seat = game_state.seat_of(player_id)
+        return seat is not None and bool(game_state.folded[seat]) 
\ No newline at end of file
@@ -1,46 +1,119 @@
 import random
-from treys import Card, Evaluator
 
-class Card:
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
-        
-    def __str__(self):
-        return f"{self.rank}_of_{self.suit}"
+from cards import CARDS, FULL_DECK_MASK, cards_to_mask, mask_to_cards, popcount
+from hand_evaluator import IncrementalHand
+from game_state import GameState
+from hand_engine import HandEngine
 
 class Deck:
-    def __init__(self):
-        suits = ["spades", "hearts", "diamonds", "clubs"]
-        ranks = ["ace", "2", "3", "4", "5", "6", "7", "8", "9", "10", "jack", "queen", "king"] 
-        self.cards = [Card(suit, rank) for suit in suits for rank in ranks]
+    """Destede kalan kartlar bitmask olarak tutulur; çekme ve çıkarma O(1).
+
+    Dağıtım kısmi Fisher–Yates ile yapılır: `order` dizisinin ilk `top`
+    elemanı dağıtılmış kartlardır ve her çekilen kart için kalan kısımdan
+    yalnızca bir takas yapılır; el başına 52 kart karıştırılmaz ve deste
+    nesnesi eller arasında `reset` ile yeniden kullanılır.
+
+    rng: `random` modülü veya `random.Random` örneği (bkz. rng_streams.py)
+    """
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.order = list(range(52))
+        self.reset()
         
-    def shuffle(self):
-        random.shuffle(self.cards)
+    def reset(self):
+        # Tüm kartları desteye geri koy; order olduğu gibi kalır (her çekiliş yeniden seçilir)
+        self.remaining = FULL_DECK_MASK
+        self.top = 0
+        self.undealt = FULL_DECK_MASK  # order[top:] içindeki kartların maskesi
+        
+    @property
+    def cards(self):
+        # Destede kalan kartlar (ID sırasıyla)
+        return mask_to_cards(self.remaining)
+    
+    def __len__(self):
+        return popcount(self.remaining)
+        
+    def remove(self, mask):
+        # Bilinen (ölü) kartları desteden çıkar
+        self.remaining &= ~mask
+        
+    def draw_id(self, exclude_mask=0):
+        # Kalan kartlardan rastgele birinin ID'sini seç (desteden çıkarmadan)
+        available = self.remaining & ~exclude_mask
+        if not available:
+            return None
+        while True:
+            card_id = self.rng.randrange(52)
+            if available >> card_id & 1:
+                return card_id
+        
+    def sample(self, num_cards, exclude_mask=0):
+        # Desteyi değiştirmeden rastgele kart seç (simülasyonlar için)
+        sampled = []
+        for i in range(num_cards):
+            card_id = self.draw_id(exclude_mask)
+            if card_id is None:
+                break
+            exclude_mask |= 1 << card_id
+            sampled.append(CARDS[card_id])
+        return sampled
+        
+    def deal_ids(self, num_cards):
+        # Kısmi Fisher–Yates: order[top:] içinden rastgele bir kartı top'a takasla.
+        # remaining dışarıdan değiştirildiyse (undo, import_state) tüm order
+        # yeniden aday olur; remaining'de olmayan kartlar atlanır.
+        if self.remaining & ~self.undealt:
+            self.top, self.undealt = 0, FULL_DECK_MASK
+        order = self.order
+        uniform = self.rng.random  # randrange'den hızlı; 53 bitlik sapma ihmal edilebilir
+        dealt = []
+        while len(dealt) < num_cards and self.top < 52:
+            top = self.top
+            swap = top + int(uniform() * (52 - top))
+            card_id = order[swap]
+            order[swap] = order[top]
+            order[top] = card_id
+            self.top = top + 1
+            bit = 1 << card_id
+            self.undealt ^= bit
+            if self.remaining & bit:
+                self.remaining ^= bit
+                dealt.append(card_id)
+        return dealt
         
     def deal(self, num_cards):
-        dealt_cards = []
-        for i in range(num_cards):
-            if len(self.cards) > 0:
-                card = self.cards.pop()
-                dealt_cards.append(card)
-        return dealt_cards
+        return [CARDS[card_id] for card_id in self.deal_ids(num_cards)]
 
 class Player:
     def __init__(self, name, stack):
         self.name = name
         self.stack = stack
         self.hand = []
+        self.hand_mask = 0  # Eldeki kartların bitmaski
+        self.hand_state = IncrementalHand()  # El + masa kartları için artımlı değerlendirme
         self.bet = 0
         self.is_folded = False
         self.is_human = False
         self.id = None  # Oyuncu ID'si
+        self.rng = random  # Ajanın rastgele sayı akışı (bkz. rng_streams.py)
         
     def add_cards(self, cards):
         self.hand.extend(cards)
+        self.hand_mask |= cards_to_mask(cards)
+        self.hand_state.add_cards(cards)
+        
+    def set_hand(self, cards, community_cards=()):
+        # Eli değiştir; değerlendirme durumu el + masa kartlarıyla yeniden kurulur
+        self.hand = list(cards)
+        self.hand_mask = cards_to_mask(cards)
+        self.hand_state = IncrementalHand(self.hand)
+        self.hand_state.add_cards(community_cards)
         
     def remove_card(self, card):
         self.hand.remove(card)
+        self.hand_mask &= ~card.mask
+        self.hand_state.remove(card)
         
     def get_hand(self):
         return self.hand
@@ -54,12 +127,14 @@ class Player:
         
     def reset(self):
         self.hand = []
+        self.hand_mask = 0
+        self.hand_state.clear()
         self.bet = 0
         self.is_folded = False
         
     def get_action(self, game):
         # Varsayılan aksiyon: rastgele
-        return random.choice(["fold", "call", "raise"])
+        return self.rng.choice(["fold", "call", "raise"])
     
     def get_raise_amount(self, game):
         # Varsayılan raise miktarı: minimum raise (2 * small blind)
@@ -67,15 +142,19 @@ class Player:
 
 class PokerGame:
     def __init__(self, player_names, player_types, starting_stack, max_round, small_blind):
-        self.deck = Deck()
+        self.rng = random  # Deste akışı (bkz. rng_streams.py)
+        self.deck = Deck(self.rng)
         self.players = [Player(name, starting_stack) for name in player_names]
         # Oyunculara ID ata
         for i, player in enumerate(self.players):
             player.id = i
         self.player_types = player_types
         self.community_cards = []
+        self.board_mask = 0  # Masa kartlarının bitmaski
         self.pot = 0
         self.current_bet = 0
+        self.last_raise = 0  # Bu sokaktaki son tam raise artışı (0: henüz raise yok)
+        self.acted = 0  # Bu bahis turunda (son raise'den beri) aksiyon almış koltukların maskesi
         self.round = 0
         self.max_round = max_round
         self.small_blind = small_blind
@@ -88,7 +167,22 @@ class PokerGame:
             
     def deal_community_cards(self, num_cards):
         cards = self.deck.deal(num_cards)
+        self.add_community_cards(cards)
+        
+    def add_community_cards(self, cards):
         self.community_cards.extend(cards)
+        self.board_mask |= cards_to_mask(cards)
+        # Her oyuncunun değerlendirme durumu yeni kartlarla güncellenir
+        for player in self.players:
+            player.hand_state.add_cards(cards)
+        
+    @property
+    def big_blind(self):
+        return self.small_blind * 2
+        
+    def min_raise(self):
+        """Raise'de call üzerine en az eklenmesi gereken miktar: big blind veya bu sokaktaki son raise artışı"""
+        return max(self.big_blind, self.last_raise)
         
     def place_bet(self, player, amount):
         player.place_bet(amount)
@@ -96,11 +190,14 @@ class PokerGame:
         self.pot += amount
         
     def reset_round(self):
-        self.deck = Deck()
-        self.deck.shuffle()
+        self.deck.rng = self.rng
+        self.deck.reset()
         self.community_cards = []
+        self.board_mask = 0
         self.pot = 0
         self.current_bet = 0
+        self.last_raise = 0
+        self.acted = 0
         for player in self.players:
             player.reset()
             
@@ -112,43 +209,9 @@ class PokerGame:
         return len(bankrupt_players) > 0  # Oyuncu çıkarıldı mı
         
     def play_round(self):
-        self.reset_round()
-        self.deal_hole_cards()
-        
-        # Preflop
-        self.place_bet(self.players[0], self.small_blind)
-        self.place_bet(self.players[1], self.small_blind * 2)
-        self.betting_round()
-        
-        # Flop
-        self.deal_community_cards(3)
-        self.betting_round()
-        
-        # Turn
-        self.deal_community_cards(1)
-        self.betting_round()
-        
-        # River
-        self.deal_community_cards(1)
-        self.betting_round()
-        
-        # Showdown
-        self.showdown()
-        
-    def betting_round(self):
-        # Bahis turunu yönet
-        current_player = self.players[0]
-        while not self.is_betting_round_done():
-            if not current_player.is_folded:
-                action = current_player.get_action(self)
-                if action == "fold":
-                    current_player.fold()
-                elif action == "call":
-                    self.place_bet(current_player, self.current_bet - current_player.bet)
-                elif action == "raise":
-                    raise_amount = current_player.get_raise_amount(self)
-                    self.place_bet(current_player, raise_amount)
-            current_player = self.get_next_player(current_player)
+        """Bir sonraki eli ajanların kararlarıyla oyna; el olaylarını döndürür (bkz. hand_engine.py)"""
+        self.round += 1
+        return HandEngine(self).play_hand(self.round)
             
     def is_betting_round_done(self):
         """Bahis turu tamamlandı mı kontrol et"""
@@ -176,31 +239,6 @@ class PokerGame:
             
         return True
     
-    def get_next_player(self, player):
-        # Sıradaki oyuncuyu döndür
-        player_index = self.players.index(player)
-        for i in range(1, len(self.players)):
-            next_player_index = (player_index + i) % len(self.players)
-            if not self.players[next_player_index].is_folded:
-                return self.players[next_player_index]
-        return None
-    
-    def showdown(self):
-        # Kazanan eli belirle ve potları dağıt
-        if self.is_game_over():
-            return
-        
-        players_in_showdown = [player for player in self.players if not player.is_folded]
-        
-        if len(players_in_showdown) == 1:
-            winner = players_in_showdown[0]
-        else:
-            scores = [(player, el_gucu_hesapla(player.hand, self.community_cards)) for player in players_in_showdown]
-            winner = min(scores, key=lambda x: x[1])[0]
-            
-        winner.stack += self.pot
-        self.pot = 0
-        
     def is_game_over(self):
         # Oyun bitti mi kontrol et
         players_in_game = [player for player in self.players if not player.is_folded]
@@ -244,40 +282,101 @@ class PokerGame:
                 found = True
         return self.players[self.current_player_id]
         
+    def apply(self, action, amount=0):
+        """Sıradaki oyuncunun aksiyonunu yerinde uygula ve sırayı ilerlet.
+        
+        raise için `amount` oyuncunun ortaya koyduğu toplam miktardır; en az
+        call + `min_raise()` olur ve stack ile sınırlıdır (all-in). Dönen
+        jeton `undo` ile durumu birebir geri yükler.
+        """
+        seat = self.current_player_id
+        player = self.players[seat]
+        token = (seat, player.stack, player.bet, player.is_folded, self.pot, self.current_bet,
+                 self.last_raise, self.acted, len(self.community_cards), self.deck.remaining)
+        needed = self.current_bet - player.bet
+        if action == "raise":
+            amount = min(max(amount, needed + self.min_raise()), player.stack)
+            if amount <= needed:
+                action = "call"  # Stack call'a ancak yetiyor
+        if action == "fold":
+            player.is_folded = True
+        elif action == "call":
+            call_amount = min(needed, player.stack)
+            if call_amount > 0:
+                player.place_bet(call_amount)
+                self.pot += call_amount
+        elif action == "raise":
+            player.place_bet(amount)
+            self.pot += amount
+            if amount - needed >= self.min_raise():
+                self.last_raise = amount - needed  # Eksik (all-in) raise artışı değiştirmez
+            self.current_bet = player.bet
+            self.acted = 0  # Raise sonrası diğer herkes tekrar aksiyon almalı
+        else:
+            raise ValueError(f"Geçersiz aksiyon: {action}")
+        self.acted |= 1 << seat
+        self.next_player()
+        return token
+        
+    def apply_community_cards(self, cards):
+        """Masaya (desteden) kart aç; `undo` için jeton döndürür"""
+        player = self.players[self.current_player_id]
+        token = (self.current_player_id, player.stack, player.bet, player.is_folded, self.pot, self.current_bet,
+                 self.last_raise, self.acted, len(self.community_cards), self.deck.remaining)
+        self.deck.remove(cards_to_mask(cards))
+        self.add_community_cards(cards)
+        return token
+        
+    def undo(self, token):
+        """`apply` / `apply_community_cards` öncesindeki duruma dön"""
+        (seat, stack, bet, is_folded, self.pot, self.current_bet, self.last_raise, self.acted,
+         num_community, self.deck.remaining) = token
+        player = self.players[seat]
+        player.stack, player.bet, player.is_folded = stack, bet, is_folded
+        self.current_player_id = seat
+        if len(self.community_cards) > num_community:
+            # Açılan kartları masadan ve oyuncuların değerlendirme durumundan çıkar
+            for card in self.community_cards[num_community:]:
+                self.board_mask &= ~card.mask
+                for other in self.players:
+                    other.hand_state.remove(card)
+            del self.community_cards[num_community:]
+        
+    def export_state(self):
+        # Arama ajanları için kompakt kopya (bkz. game_state.py)
+        return GameState.from_game(self)
+        
+    def import_state(self, state):
+        # Kompakt durumu oyuna geri yaz; koltuk sırası players listesiyle aynıdır
+        for seat, player in enumerate(self.players):
+            player.stack = state.stacks[seat]
+            player.bet = state.bets[seat]
+            player.is_folded = bool(state.folded[seat])
+            if state.hands[seat] != player.hand_mask:
+                player.set_hand(mask_to_cards(state.hands[seat]), self.community_cards)
+        if state.board_mask != self.board_mask:
+            self.community_cards = []
+            self.board_mask = 0
+            for player in self.players:
+                player.set_hand(player.hand)
+            self.add_community_cards(state.community_cards)
+        self.deck.remaining = state.deck_mask
+        self.pot = state.pot
+        self.current_bet = state.current_bet
+        self.last_raise = state.last_raise
+        self.acted = state.acted
+        self.current_player_id = state.current_player_id
+        
+    def get_player_by_id(self, player_id):
+        # ID'si verilen oyuncuyu döndür
+        for player in self.players:
+            if player.id == player_id:
+                return player
+        return None
+        
     def is_last_player_standing(self, player_id):
         # Belirli bir oyuncu son aktif oyuncu mu kontrol et
         active_players = [player for player in self.players if not player.is_folded]
         if len(active_players) == 1 and active_players[0].id == player_id:
             return True
         return False
-
-def el_gucu_hesapla(hole_cards, community_cards):
-    # treys kütüphanesini kullanarak el gücünü hesapla
-    from treys import Card as TreysCard, Evaluator
-    evaluator = Evaluator()
-    
-    # Kartları Treys formatına dönüştür
-    treys_hole_cards = []
-    for card in hole_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_hole_cards.append(treys_card)
-    
-    treys_community_cards = []
-    for card in community_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_community_cards.append(treys_card)
-    
-    # El skorunu hesapla (1 en iyi, 7462 en kötü)
-    score = evaluator.evaluate(treys_community_cards, treys_hole_cards)
-    return score
-
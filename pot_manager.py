@@ -0,0 +1,105 @@
+"""Pot ve yan pot (side pot) hesabı.
+
+Her koltuğun el boyunca pota koyduğu toplam (contribution) chip konuldukça
+kaydedilir; sokak başında sıfırlanan `player.bet`'e bakılmaz, bu yüzden
+önceki sokaklarda all-in olan oyuncuların potları doğru ayrılır.
+
+Showdown'da fold yapmamış oyuncuların her farklı katkı seviyesi bir pottur:
+seviyeye kadar (fold yapanlar dahil) herkesin koyduğu chipler, o seviyeye
+ulaşmış oyuncular arasında en iyi ele (en düşük skor) verilir. En yüksek
+seviyeyi aşan (karşılanmamış) chipler son pota eklenir. Eşitlikte pot
+bölünür, artan chipler koltuk sırasıyla ilk kazananlara verilir.
+
+`PotManager.resolve` tek bir el için koltukları katkıya göre bir kez sıralar
+ve tüm potları tek geçişte çözer (O(n log n)). `resolve_batch` aynı
+kuralların vektörel motor için (T, S) dizileri üzerindeki karşılığıdır.
+"""
+import numpy as np
+
+NO_HAND = 1 << 13  # Tüm skorlardan (<= 7462) büyük; showdown'da olmayan koltuklar için
+
+class PotManager:
+    """Bir elde koltuk başına toplam katkı"""
+
+    def __init__(self, num_seats):
+        self.contributions = [0] * num_seats
+        self.total = 0
+
+    def add(self, seat, amount):
+        self.contributions[seat] += amount
+        self.total += amount
+
+    def resolve(self, scores):
+        """Potları dağıt; (koltuk, miktar, skor) listesi döndürür (potlar küçükten büyüğe).
+
+        scores: showdown'daki (fold yapmamış) koltukların skorları {koltuk: skor}
+        """
+        contributions = self.contributions
+        num_seats = len(contributions)
+        order = sorted(range(num_seats), key=contributions.__getitem__)
+        levels = sorted(set(contributions[seat] for seat in scores))
+
+        # Artan seviyeler: seviyenin altında kalan koltuklar kısmen, diğerleri
+        # seviye farkı kadar katkı verir
+        pots = []
+        previous = index = 0
+        for level in levels:
+            pot = 0
+            while index < num_seats and contributions[order[index]] < level:
+                pot += contributions[order[index]] - previous
+                index += 1
+            pots.append(pot + (level - previous) * (num_seats - index))
+            previous = level
+        pots[-1] += sum(contributions[seat] - previous for seat in order[index:])
+
+        # Azalan seviyeler: seviyeye ulaşan canlı koltuklar arasında en iyi skor
+        pot_awards = []
+        best, winners = None, []
+        index = num_seats - 1
+        for level, pot in zip(reversed(levels), reversed(pots)):
+            while index >= 0 and contributions[order[index]] >= level:
+                seat = order[index]
+                index -= 1
+                if seat not in scores:
+                    continue
+                if best is None or scores[seat] < best:
+                    best, winners = scores[seat], [seat]
+                elif scores[seat] == best:
+                    winners.append(seat)
+            share, remainder = divmod(pot, len(winners))
+            pot_awards.append([(seat, share + (1 if position < remainder else 0), best)
+                               for position, seat in enumerate(sorted(winners))])
+
+        # Potlar küçükten büyüğe, her pot içinde koltuk sırasıyla
+        return [award for awards in reversed(pot_awards) for award in awards]
+
+def resolve_batch(contributions, scores, live):
+    """`PotManager.resolve`'un vektörel karşılığı; (T, S) kazanç dizisi döndürür.
+
+    contributions: (T, S) toplam katkılar, scores: (T, S) skorlar,
+    live: (T, S) showdown'daki (fold yapmamış) koltuklar.
+    """
+    num_seats = contributions.shape[1]
+    scores = np.where(live, scores, NO_HAND)
+
+    levels = np.sort(np.where(live, contributions, 0), axis=1)
+    top = levels[:, -1]
+    excess = (contributions - np.minimum(contributions, top[:, None])).sum(axis=1)
+    winnings = np.zeros_like(contributions)
+    previous = np.zeros(len(contributions), dtype=contributions.dtype)
+    for k in range(num_seats):
+        # Tekrarlanan seviyelerin potu boştur; karşılanmamış chipler en yüksek seviyenin potuna
+        level = levels[:, k]
+        capped = np.minimum(contributions, level[:, None]) - np.minimum(contributions, previous[:, None])
+        pot = capped.sum(axis=1)
+        pot += np.where((level == top) & ((level != previous) | (k == 0)), excess, 0)
+        eligible = live & (contributions >= level[:, None])
+        best = np.where(eligible, scores, NO_HAND).min(axis=1)
+        winners = eligible & (scores == best[:, None]) & (pot[:, None] > 0)
+        num_winners = np.maximum(winners.sum(axis=1), 1)
+        share, remainder = pot // num_winners, pot % num_winners
+        # Artan chipler koltuk sırasıyla ilk kazananlara
+        order = np.cumsum(winners, axis=1)
+        winnings += np.where(winners, share[:, None] + (order <= remainder[:, None]), 0)
+        previous = level
+    return winnings
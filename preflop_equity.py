@@ -0,0 +1,187 @@
+"""Önceden hesaplanmış preflop equity tabloları.
+
+169 preflop el sınıfı 13x13 bir ızgara ile indekslenir: köşegen çiftler,
+köşegenin üstü suited, altı offsuit eller (satır/sütun rank indeksleri).
+
+Tablo dosyası iki bölümden oluşur (uint16, equity * 65535):
+
+* 169 x 169 heads-up equity matrisi (satırdaki elin sütundaki ele karşı)
+* 169 x 8 equity tablosu: 1..8 rastgele rakibe karşı equity
+
+Dosya `python preflop_equity.py` ile üretilir ve ilk sorguda memory-map
+edilir; sorgular tek bir dizi okumasıdır.
+"""
+import os
+import sys
+import mmap
+import argparse
+import itertools
+
+import numpy as np
+
+from cards import RANK_CHARS
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables", "preflop_equity.bin")
+
+NUM_CLASSES = 169
+MAX_OPPONENTS = 8
+SCALE = 65535
+
+HEADS_UP_OFFSET = 0
+VS_RANDOM_OFFSET = NUM_CLASSES * NUM_CLASSES
+TABLE_SIZE = VS_RANDOM_OFFSET + NUM_CLASSES * MAX_OPPONENTS
+TABLE_BYTES = TABLE_SIZE * 2
+
+def class_index(rank_a, rank_b, suited):
+    """İki rank indeksi ve suited bilgisinden el sınıfı indeksi (0..168)"""
+    high, low = max(rank_a, rank_b), min(rank_a, rank_b)
+    if suited:
+        return high * 13 + low
+    return low * 13 + high
+
+def hand_class(hole_cards):
+    """İki hole karttan el sınıfı indeksi"""
+    first, second = hole_cards
+    return class_index(first.rank_index, second.rank_index, first.suit_index == second.suit_index)
+
+def class_label(index):
+    """El sınıfı etiketi (ör. "AKs", "T9o", "77")"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_CHARS[row] * 2
+    if row > col:
+        return RANK_CHARS[row] + RANK_CHARS[col] + "s"
+    return RANK_CHARS[col] + RANK_CHARS[row] + "o"
+
+def class_combos(index):
+    """Bir el sınıfına ait tüm somut kart ID çiftleri"""
+    row, col = divmod(index, 13)
+    high, low = max(row, col), min(row, col)
+    combos = []
+    for suit_a, suit_b in itertools.product(range(4), repeat=2):
+        first, second = suit_a * 13 + high, suit_b * 13 + low
+        if row == col:
+            if suit_a < suit_b:
+                combos.append((first, second))
+        elif (row > col) == (suit_a == suit_b):
+            combos.append((first, second))
+    return combos
+
+TABLE = None
+
+def _check_size(path):
+    # Yarım kalmış ya da eski düzende üretilmiş tablo sessizce yanlış değer vermesin
+    size = os.path.getsize(path)
+    if size != TABLE_BYTES:
+        raise ValueError(f"Preflop equity tablosu '{path}' {size} bayt, {TABLE_BYTES} bayt olmalı "
+                         f"({NUM_CLASSES}x{NUM_CLASSES} heads-up ve 1..{MAX_OPPONENTS} rakip tabloları); "
+                         "`python preflop_equity.py` ile yeniden üretin")
+
+def load(path=TABLE_PATH):
+    """Tabloyu ilk kullanımda (boyutunu doğrulayarak) memory-map et"""
+    global TABLE
+    if TABLE is None:
+        _check_size(path)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        TABLE = memoryview(mapped).cast("H")
+    return TABLE
+
+def is_available(path=TABLE_PATH):
+    """Tablo dosyası mevcut mu; dosya varsa ama boyutu yanlışsa ValueError"""
+    if TABLE is not None:
+        return True
+    if not os.path.exists(path):
+        return False
+    _check_size(path)
+    return True
+
+def heads_up_equity(hole_cards, villain_cards):
+    """Bir elin başka bir ele karşı heads-up equity'si (sınıf bazında)"""
+    table = load()
+    return table[HEADS_UP_OFFSET + hand_class(hole_cards) * NUM_CLASSES + hand_class(villain_cards)] / SCALE
+
+def equity_vs_random(hole_cards, num_opponents=1):
+    """Bir elin 1..8 rastgele rakibe karşı equity'si"""
+    num_opponents = min(max(num_opponents, 1), MAX_OPPONENTS)
+    table = load()
+    return table[VS_RANDOM_OFFSET + hand_class(hole_cards) * MAX_OPPONENTS + num_opponents - 1] / SCALE
+
+def equity_vs_random_batch(hole_ids, num_opponents):
+    """(N, 2) kart ID'leri ve (N,) rakip sayıları için equity dizisi"""
+    table = np.frombuffer(load(), dtype=np.uint16)
+    hole_ids = np.asarray(hole_ids, dtype=np.int64)
+    ranks, suits = hole_ids % 13, hole_ids // 13
+    high, low = ranks.max(axis=1), ranks.min(axis=1)
+    index = np.where(suits[:, 0] == suits[:, 1], high * 13 + low, low * 13 + high)
+    num_opponents = np.clip(num_opponents, 1, MAX_OPPONENTS)
+    return table[VS_RANDOM_OFFSET + index * MAX_OPPONENTS + num_opponents - 1] / SCALE
+
+def _random_cards(rng, dead, count, samples):
+    # Her örnek için ölü kartlar hariç `count` rastgele kart seç
+    keys = rng.random((samples, 52))
+    keys[np.arange(samples)[:, None], dead] = 2.0
+    return np.argpartition(keys, count, axis=1)[:, :count]
+
+def _sample_class(rng, index, samples):
+    combos = np.array(class_combos(index), dtype=np.int64)
+    return combos[rng.integers(len(combos), size=samples)]
+
+def build_table(path=TABLE_PATH, heads_up_samples=2000, random_samples=20000, seed=0):
+    """Equity tablolarını Monte Carlo ile üret ve diske yaz"""
+    import batch_evaluator
+    from equity import showdown_share
+
+    rng = np.random.default_rng(seed)
+    table = np.zeros(TABLE_SIZE, dtype=np.float64)
+
+    # Heads-up matris: her sınıf çifti için rastgele somut eller ve masalar
+    heads_up = table[:VS_RANDOM_OFFSET].reshape(NUM_CLASSES, NUM_CLASSES)
+    for hero in range(NUM_CLASSES):
+        for villain in range(hero, NUM_CLASSES):
+            hero_cards = _sample_class(rng, hero, heads_up_samples)
+            villain_cards = _sample_class(rng, villain, heads_up_samples)
+            # Ortak kart içeren eşleşmeleri at
+            valid = (hero_cards[:, :, None] != villain_cards[:, None, :]).all(axis=(1, 2))
+            hero_cards, villain_cards = hero_cards[valid], villain_cards[valid]
+            boards = _random_cards(rng, np.hstack([hero_cards, villain_cards]), 5, len(hero_cards))
+            hero_ranks = batch_evaluator.evaluate_hands(np.hstack([hero_cards, boards]))
+            villain_ranks = batch_evaluator.evaluate_hands(np.hstack([villain_cards, boards]))
+            equity = showdown_share(hero_ranks, villain_ranks[:, None]).mean()
+            heads_up[hero, villain] = equity
+            heads_up[villain, hero] = 1.0 - equity
+        print(f"Heads-up: {class_label(hero)} tamamlandı ({hero + 1}/{NUM_CLASSES})", file=sys.stderr)
+
+    # Rastgele rakiplere karşı equity
+    vs_random = table[VS_RANDOM_OFFSET:].reshape(NUM_CLASSES, MAX_OPPONENTS)
+    for hero in range(NUM_CLASSES):
+        hero_cards = _sample_class(rng, hero, random_samples)
+        for num_opponents in range(1, MAX_OPPONENTS + 1):
+            drawn = _random_cards(rng, hero_cards, 5 + 2 * num_opponents, random_samples)
+            rng.permuted(drawn, axis=1, out=drawn)
+            boards = drawn[:, :5]
+            hero_ranks = batch_evaluator.evaluate_hands(np.hstack([hero_cards, boards]))
+            villain_ranks = np.stack([
+                batch_evaluator.evaluate_hands(np.hstack([drawn[:, 5 + 2 * k:7 + 2 * k], boards]))
+                for k in range(num_opponents)
+            ], axis=1)
+            vs_random[hero, num_opponents - 1] = showdown_share(hero_ranks, villain_ranks).mean()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.round(table * SCALE).astype(np.uint16).tofile(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Preflop equity tablolarını üret")
+    parser.add_argument("--output", default=TABLE_PATH, help="Tablo dosyası")
+    parser.add_argument("--heads_up_samples", type=int, default=2000,
+                        help="Heads-up matristeki her sınıf çifti için örnek sayısı")
+    parser.add_argument("--random_samples", type=int, default=20000,
+                        help="Rastgele rakiplere karşı equity için örnek sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele sayı üreteci tohumu")
+    args = parser.parse_args()
+
+    build_table(args.output, args.heads_up_samples, args.random_samples, args.seed)
+    print(f"Preflop equity tablosu '{args.output}' dosyasına yazıldı.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Kaydedilmiş eller üzerinde ajan değerlendirme (replay).
+
+El geçmişi dosyasındaki (bkz. hand_history.py) her el `HandEngine` ile
+kayıttaki kartlar ve aksiyonlarla yeniden oynatılır. Her kayıtlı aksiyondan
+önce, yani oyuncunun karar verdiği anda, değerlendirilen ajanlar sırayla
+o koltuğa oturtulur ve kararları sorulur; ardından el kayıttaki aksiyonla
+devam eder. Böylece tam oyun simüle etmeden bir ajanın binlerce kayıtlı
+durumdaki kararı, kayıttaki kararla karşılaştırılabilir.
+
+Eller süreçler arasında paketler halinde paylaştırılır. Ajanların
+rastgelelik akışları el indeksinden türetilir (bkz. rng_streams.py), bu
+yüzden sonuçlar süreç sayısından bağımsızdır. Kayıt dosyası, süreç havuzu
+ve özet akış halinde çalışır; bellek kullanımı kayıttaki el sayısıyla
+büyümez. Small blind kayıttaki blind olaylarından çıkarılır.
+"""
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from poker import Deck, PokerGame
+from hand_engine import HandEngine
+from hand_history import read_history
+from agents import create_agent
+from rng_streams import table_streams
+
+DEFAULT_CHUNK_SIZE = 32
+MAX_PENDING_PER_WORKER = 2
+
+class ScriptedDeck(Deck):
+    """Kartları verilen sırayla (önce hole kartlar koltuk sırasıyla, sonra masa) dağıtan deste"""
+
+    def __init__(self, card_ids):
+        self.script = list(card_ids)
+        self.position = 0
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self.position = 0
+
+    def deal_ids(self, num_cards):
+        dealt = self.script[self.position:self.position + num_cards]
+        self.position += len(dealt)
+        for card_id in dealt:
+            self.remaining &= ~(1 << card_id)
+        return dealt
+
+def _small_blind(events):
+    # Blind'lar stack ile sınırlı olabilir; big blind'ın yarısı da hesaba katılır
+    amounts = {event["blind"]: event["amount"] for event in events if event["type"] == "blind"}
+    return max(amounts.get("small", 0), amounts.get("big", 0) // 2)
+
+def decision_points(hand):
+    """Kayıtlı elin karar noktaları: her aksiyondan önce (motor, kayıtlı aksiyon olayı).
+
+    Üreteç her adımdan sonra eli kayıttaki aksiyonla ilerletir; motorun
+    durumu yalnızca o adım sırasında geçerlidir.
+    """
+    events = hand["events"]
+    num_seats = len(hand["stacks"])
+    game = PokerGame([f"Seat-{seat}" for seat in range(num_seats)], None, 0, hand["round"], _small_blind(events))
+    for player, stack in zip(game.players, hand["stacks"]):
+        player.stack = stack
+        player.is_human = False
+    script = [card_id for cards in hand["hole"] if cards for card_id in cards]
+    script += [card_id for event in events if event["type"] == "street" for card_id in event["cards"]]
+    game.deck = ScriptedDeck(script)
+
+    engine = HandEngine(game)
+    engine.start_hand(hand["round"])
+    for event in events:
+        if event["type"] != "action":
+            continue
+        if engine.hand_over or engine.to_act != event["seat"]:
+            raise ValueError(f"Kayıt motorla uyuşmuyor (oyun {hand['game']}, el {hand['round']})")
+        yield engine, event
+        engine.step(event["action"], event["amount"])
+
+def query_agent(engine, agent):
+    """Ajanı sıradaki koltuğa oturtup kararını sor; (aksiyon, miktar, süre) döndürür"""
+    game = engine.game
+    seat = engine.to_act
+    occupant = game.players[seat]
+    agent.stack, agent.bet, agent.is_folded = occupant.stack, occupant.bet, occupant.is_folded
+    agent.id = occupant.id
+    agent.is_human = False
+    agent.set_hand(occupant.hand, game.community_cards)
+    game.players[seat] = agent
+    try:
+        start = time.perf_counter()
+        action, amount = engine.decide()
+        elapsed = time.perf_counter() - start
+    finally:
+        game.players[seat] = occupant
+    return action, amount, elapsed
+
+# Alt süreçlerde bir kez oluşturulan ajanlar
+_AGENTS = None
+_SEED = None
+
+def _init_worker(agent_types, seed):
+    global _AGENTS, _SEED
+    _AGENTS = [create_agent(agent_type, f"Replay-{agent_type}", 0) for agent_type in agent_types]
+    _SEED = seed
+
+def _replay_chunk(chunk):
+    # (el indeksi, el) paketini oynat; karar başına
+    # (el indeksi, street, kayıtlı aksiyon, kayıtlı miktar, [(aksiyon, miktar, süre), ...]) döndür
+    records = []
+    for hand_index, hand in chunk:
+        _, rngs = table_streams(_SEED, hand_index, len(_AGENTS))
+        for agent, rng in zip(_AGENTS, rngs):
+            agent.rng = rng
+        for engine, event in decision_points(hand):
+            answers = [query_agent(engine, agent) for agent in _AGENTS]
+            records.append((hand_index, engine.street, event["action"], event["amount"], answers))
+    return records
+
+def _chunks(history_file, chunk_size):
+    chunk = []
+    for hand_index, hand in enumerate(read_history(history_file)):
+        chunk.append((hand_index, hand))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def replay(history_file, agent_types, workers=1, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Kayıttaki tüm karar noktalarında ajanları sorgula; karar kayıtlarını sırayla döndüren üreteç.
+
+    Havuzda aynı anda süreç başına en fazla `MAX_PENDING_PER_WORKER` paket
+    bekler; el geçmişi dosyası paketler gönderildikçe okunur.
+    """
+    if workers <= 1:
+        _init_worker(agent_types, seed)
+        for chunk in _chunks(history_file, chunk_size):
+            yield from _replay_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(agent_types, seed)) as executor:
+        pending = deque()
+        for chunk in _chunks(history_file, chunk_size):
+            pending.append(executor.submit(_replay_chunk, chunk))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def _latency_bucket(elapsed):
+    # Süre 3 anlamlı basamağa yuvarlanır; farklı değer sayısı karar sayısıyla büyümez
+    return float(f"{elapsed:.3g}")
+
+def _percentile(latency_counts, count, fraction):
+    if not count:
+        return 0.0
+    index = min(count - 1, int(fraction * count))
+    seen = 0
+    for latency in sorted(latency_counts):
+        seen += latency_counts[latency]
+        if seen > index:
+            return latency
+    return 0.0
+
+class ReplaySummary:
+    """Karar kayıtlarından ajan başına uyum ve gecikme özeti; kayıtlar geldikçe güncellenir.
+
+    Kayıtlar el sırasıyla geldiğinden el sayısı son el indeksinden sayılır;
+    gecikme yüzdelikleri yuvarlanmış süre -> karar sayısı eşlemesinden
+    hesaplanır (bkz. `_latency_bucket`), bellek karar sayısıyla büyümez.
+    """
+
+    def __init__(self, agent_types):
+        self.agent_types = list(agent_types)
+        self.decisions = 0
+        self.hands = 0
+        self.last_hand = None
+        self.agents = [{
+            "agent_type": agent_type,
+            "decisions": 0,
+            "agreement": 0,
+            "raise_amount_agreement": 0,
+            "by_recorded_action": {}
+        } for agent_type in agent_types]
+        self.total_latency = [0.0] * len(self.agents)
+        self.latency_counts = [Counter() for _ in self.agents]
+
+    def update(self, record):
+        """Bir karar kaydını özete ekle"""
+        hand_index, street, recorded, recorded_amount, answers = record
+        self.decisions += 1
+        if hand_index != self.last_hand:
+            self.hands += 1
+            self.last_hand = hand_index
+        for agent_index, (action, amount, elapsed) in enumerate(answers):
+            agent_summary = self.agents[agent_index]
+            agent_summary["decisions"] += 1
+            if action == recorded:
+                agent_summary["agreement"] += 1
+                if action != "raise" or amount == recorded_amount:
+                    agent_summary["raise_amount_agreement"] += 1
+            counts = agent_summary["by_recorded_action"].setdefault(recorded, {})
+            counts[action] = counts.get(action, 0) + 1
+            self.total_latency[agent_index] += elapsed
+            self.latency_counts[agent_index][_latency_bucket(elapsed)] += 1
+
+    def result(self):
+        """JSON'a yazılabilir özet"""
+        agents = []
+        for agent_index, agent_summary in enumerate(self.agents):
+            agent_summary = dict(agent_summary)
+            latency_counts = self.latency_counts[agent_index]
+            count = agent_summary["decisions"]
+            decisions = count or 1
+            agent_summary["agreement_rate"] = agent_summary["agreement"] / decisions
+            agent_summary["exact_agreement_rate"] = agent_summary["raise_amount_agreement"] / decisions
+            agent_summary["latency_ms"] = {
+                "mean": self.total_latency[agent_index] / decisions * 1000,
+                "p50": _percentile(latency_counts, count, 0.5) * 1000,
+                "p95": _percentile(latency_counts, count, 0.95) * 1000,
+                "max": max(latency_counts, default=0.0) * 1000
+            }
+            agents.append(agent_summary)
+        return {"hands": self.hands, "agents": agents}
+
+def summarize(records, agent_types):
+    """Karar kayıtlarından ajan başına uyum ve gecikme özeti"""
+    summary = ReplaySummary(agent_types)
+    for record in records:
+        summary.update(record)
+    return summary.result()
@@ -0,0 +1,172 @@
+"""Oyun kayıtlarının JSONL akışı ve akıştan sabit bellekli özet.
+
+`game_runner.simulate` oyun kayıtlarını sırayla üretir; CLI modları her
+kaydı `JsonlWriter` ile satır satır dosyaya yazar ve `RunSummary` ile
+özetler. Kayıtlar bellekte biriktirilmez: yazıcı tamponunu en geç
+`flush_interval` saniyede bir diske boşaltır (yarıda kalan bir çalışmada
+oynanmış oyunlar dosyada kalır), özet yalnızca ajan tipi başına sayaçlar
+tutar. Son stack dağılımı için değer -> oyun sayısı eşlemesi tutulur; farklı
+değer sayısı masadaki toplam chip ile sınırlıdır, oyun sayısıyla büyümez.
+
+Dosyanın ilk satırı çalışmanın ayarlarını taşıyan bir "config" kaydıdır;
+`summarize_file` özeti yalnızca dosyadan yeniden hesaplar.
+
+Kayıt türleri ("type" alanı):
+
+* game: game_index, final_stacks, rounds_played, eliminated_round (koltuk
+  başına), python motorunda ayrıca koltuk başına aksiyon sayaçları ve hands
+* counts: vektörel motorda bir paketin koltuk başına aksiyon sayaçları ve
+  hands (el sayısı)
+"""
+import os
+import json
+import time
+from collections import Counter
+
+COUNTERS = ("showdown_wins", "all_in_count", "fold_count", "raise_count")
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+class JsonlWriter:
+    """Kayıtları satır satır yazan ve periyodik olarak diske boşaltan yazıcı"""
+
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH_INTERVAL, resume_offset=None):
+        self.path = path
+        if resume_offset is None:
+            self.file = open(path, "w", encoding="utf-8")
+        else:
+            # Kontrol noktasından sonra yazılmış kayıtları at, sonuna ekle
+            with open(path, "r+b") as f:
+                f.truncate(resume_offset)
+            self.file = open(path, "a", encoding="utf-8")
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.records_written = 0
+
+    def write(self, record):
+        # Kodlanmış el geçmişi (bytes) ayrı dosyaya yazılır
+        if "history" in record:
+            record = {key: value for key, value in record.items() if key != "history"}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.records_written += 1
+        now = time.monotonic()
+        if now - self.last_flush >= self.flush_interval:
+            self.file.flush()
+            self.last_flush = now
+
+    def flush(self):
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Tamponu diske boşalt; dosyanın o anki boyutunu (devam noktası) döndür"""
+        self.flush()
+        os.fsync(self.file.fileno())
+        return os.path.getsize(self.path)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_jsonl(path):
+    """Dosyadaki kayıtları sırayla döndüren üreteç (yarım kalan son satır atlanır)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            yield json.loads(line)
+
+class RunSummary:
+    """Oyun kayıtlarından ajan tipi başına sabit bellekli özet.
+
+    Aynı tipten birden fazla ajan varsa sayaçları birleştirilir. Kazanan en
+    yüksek son stack'e sahip ilk koltuktur.
+    """
+
+    def __init__(self, agent_types, max_round):
+        self.agent_types = list(agent_types)
+        self.max_round = max_round
+        self.games = 0
+        self.hands_played = 0
+        self.wins = {agent_type: 0 for agent_type in agent_types}
+        self.total_stack = {agent_type: 0 for agent_type in agent_types}
+        self.total_rounds_survived = {agent_type: 0 for agent_type in agent_types}
+        self.stack_counts = {agent_type: Counter() for agent_type in agent_types}
+        self.counts = {name: {agent_type: 0 for agent_type in agent_types} for name in COUNTERS}
+
+    def update(self, record):
+        """Bir kaydı özete ekle"""
+        agent_types = self.agent_types
+        self.hands_played += record.get("hands", 0)
+        for name in COUNTERS:
+            if name in record:
+                for seat, count in enumerate(record[name]):
+                    self.counts[name][agent_types[seat]] += count
+        if record["type"] != "game":
+            return
+
+        self.games += 1
+        final_stacks = record["final_stacks"]
+        for seat, stack in enumerate(final_stacks):
+            agent_type = agent_types[seat]
+            self.total_stack[agent_type] += stack
+            self.stack_counts[agent_type][stack] += 1
+            # Elenen oyuncu elendiği ele kadar, diğerleri tüm eller boyunca hayatta kalır
+            survived = record["eliminated_round"][seat] if stack <= 0 else self.max_round
+            self.total_rounds_survived[agent_type] += survived
+        self.wins[agent_types[final_stacks.index(max(final_stacks))]] += 1
+
+    def state(self):
+        """Kontrol noktası için JSON'a yazılabilir durum"""
+        return {
+            "games": self.games,
+            "hands_played": self.hands_played,
+            "wins": self.wins,
+            "total_stack": self.total_stack,
+            "total_rounds_survived": self.total_rounds_survived,
+            "stack_counts": {agent_type: [[stack, count] for stack, count in counts.items()]
+                             for agent_type, counts in self.stack_counts.items()},
+            "counts": self.counts
+        }
+
+    @classmethod
+    def from_state(cls, agent_types, max_round, state):
+        """`state()` ile kaydedilmiş özetten devam"""
+        summary = cls(agent_types, max_round)
+        summary.games = state["games"]
+        summary.hands_played = state["hands_played"]
+        summary.wins = dict(state["wins"])
+        summary.total_stack = dict(state["total_stack"])
+        summary.total_rounds_survived = dict(state["total_rounds_survived"])
+        summary.stack_counts = {agent_type: Counter({stack: count for stack, count in counts})
+                                for agent_type, counts in state["stack_counts"].items()}
+        summary.counts = {name: dict(counts) for name, counts in state["counts"].items()}
+        return summary
+
+    def entries(self, agent_type):
+        # Tipin tüm oyunlardaki koltuk sayısı
+        return sum(self.stack_counts[agent_type].values())
+
+    def avg_final_stack(self, agent_type):
+        return self.total_stack[agent_type] / max(self.entries(agent_type), 1)
+
+    def avg_rounds_survived(self, agent_type):
+        return self.total_rounds_survived[agent_type] / max(self.entries(agent_type), 1)
+
+    def stack_distribution(self, agent_type):
+        """Son stack -> oyun sayısı (artan stack sırasıyla)"""
+        return dict(sorted(self.stack_counts[agent_type].items()))
+
+def summarize_file(path):
+    """JSONL dosyasındaki kayıtlardan (ayarlar, özet) döndür"""
+    records = read_jsonl(path)
+    config = next(records)
+    summary = RunSummary(config["agent_types"], config["max_round"])
+    for record in records:
+        summary.update(record)
+    return config, summary
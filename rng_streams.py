@@ -0,0 +1,47 @@
+"""Tekrarlanabilir, paralel güvenli rastgele sayı akışları.
+
+Varsayılan olarak deste ve ajanlar global `random` modülünü kullanır; bu
+durumda çalışmalar tekrarlanamaz. Bir kök tohum verildiğinde her masa kendi
+akışını `numpy.random.SeedSequence` ağacından alır:
+
+    kök tohum -> masa i (spawn_key=(i,)) -> [deste, koltuk 0, koltuk 1, ...]
+
+Masa i'nin akışı yalnızca kök tohuma ve i'ye bağlıdır (`SeedSequence.spawn`
+ile üretilen i. çocukla aynıdır); masalar hangi sırayla veya hangi süreçte
+oynanırsa oynansın aynı eller oynanır ve herhangi bir el tek başına yeniden
+oynatılabilir.
+
+Python bileşenleri `random.Random` örnekleri alır. Bu sınıfın arayüzü
+`random` modülüyle aynı olduğundan, akış verilmeyen bileşenler modülün
+kendisini kullanmaya devam eder. Vektörel motor aynı masa tohumundan bir
+`numpy.random.Generator` oluşturur.
+"""
+import random
+
+import numpy as np
+
+def table_sequence(seed, table_index):
+    """Kök tohumdan masanın (veya vektörel motordaki paketin) SeedSequence'i"""
+    return np.random.SeedSequence(seed, spawn_key=(table_index,))
+
+def python_rng(seed_sequence):
+    """SeedSequence'dan 128 bit tohumlu `random.Random`"""
+    state = seed_sequence.generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+def table_streams(seed, table_index, num_seats):
+    """Masanın deste akışı ve koltuk başına ajan akışları.
+
+    seed None ise tüm akışlar global `random` modülüdür.
+    """
+    if seed is None:
+        return random, [random] * num_seats
+    deck_sequence, *seat_sequences = table_sequence(seed, table_index).spawn(1 + num_seats)
+    return python_rng(deck_sequence), [python_rng(sequence) for sequence in seat_sequences]
+
+def seed_table(game, seed, table_index):
+    """Oyunun destesine ve oyuncularına (koltuk sırasıyla) masa akışlarını ata"""
+    deck_rng, seat_rngs = table_streams(seed, table_index, len(game.players))
+    game.rng = game.deck.rng = deck_rng
+    for player, rng in zip(game.players, seat_rngs):
+        player.rng = rng
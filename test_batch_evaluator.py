@@ -0,0 +1,34 @@
+"""NumPy batch evaluator: treys ile aynı skorlar"""
+import numpy as np
+
+import batch_evaluator
+from cards import CARDS
+from hand_evaluator import EVALUATOR, to_treys
+
+def treys_score(card_ids):
+    cards = [CARDS[card_id] for card_id in card_ids]
+    return EVALUATOR.evaluate(to_treys(cards[2:]), to_treys(cards[:2]))
+
+def random_hands(rng, count, num_cards):
+    return np.array([rng.choice(52, num_cards, replace=False) for _ in range(count)])
+
+def test_evaluate_hands_matches_treys():
+    rng = np.random.default_rng(0)
+    for num_cards in (5, 6, 7):
+        hands = random_hands(rng, 2000, num_cards)
+        scores = batch_evaluator.evaluate_hands(hands)
+        assert scores.tolist() == [treys_score(hand) for hand in hands]
+
+def test_evaluate_matrix_matches_treys():
+    rng = np.random.default_rng(1)
+    for board_size in (3, 4, 5):
+        drawn = random_hands(rng, 40, 2 + board_size)
+        hole_cards, boards = drawn[:20, :2], drawn[20:, 2:]
+        scores = batch_evaluator.evaluate_matrix(hole_cards, boards)
+        overlap = batch_evaluator.overlap_mask(hole_cards, boards)
+        assert scores.shape == (20, 20)
+        for i, hole in enumerate(hole_cards):
+            for j, board in enumerate(boards):
+                # Ortak kartlı eşleşmelerin skoru tanımsız
+                if not overlap[i, j]:
+                    assert scores[i, j] == treys_score([*hole, *board])
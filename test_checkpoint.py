@@ -0,0 +1,68 @@
+"""Kontrol noktası: yarıda kesilip devam eden çalışma kesintisiz çalışmayla aynı sonucu verir"""
+import pytest
+
+import main
+from checkpoint import Checkpointer, load_checkpoint
+from hand_history import read_history
+
+def make_config(engine):
+    agent_types = ["basic_heuristic", "aggressive_heuristic", "basic_heuristic"]
+    config = {
+        "engine": engine,
+        "agent_types": agent_types,
+        "player_names": [f"AI-{i+1}-{agent_type}" for i, agent_type in enumerate(agent_types)],
+        "num_games": 40,
+        "starting_stack": 1000,
+        "max_round": 30,
+        "small_blind": 10,
+        "seed": 7,
+        "workers": 1,
+        "record_history": engine == "python"
+    }
+    if engine == "vectorized":
+        config["tables_per_batch"] = 8
+    return config
+
+def run(tmp_path, name, engine, **kwargs):
+    games_file = str(tmp_path / f"{name}_games.jsonl")
+    history_file = str(tmp_path / f"{name}.hh.gz") if engine == "python" else None
+    summary, _ = main.play_games(make_config(engine), games_file, history_file, **kwargs)
+    return summary, games_file, history_file
+
+@pytest.mark.parametrize("engine", ["python", "vectorized"])
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch, engine):
+    full_summary, full_games, full_history = run(tmp_path, "full", engine)
+
+    # İki kayıttan sonra kontrol noktası alınmayan, dördüncü kayıtta kesilen
+    # çalışma; aradaki kayıtlar devamda dosyalardan atılmalı
+    checkpoint_file = str(tmp_path / "run.checkpoint.json")
+    simulate = main.simulate
+    progress_type = "counts" if engine == "vectorized" else "game"
+    progress = []
+
+    def interrupted(config, start_game=0):
+        for record in simulate(config, start_game):
+            yield record
+            if record["type"] == progress_type:
+                progress.append(record)
+                if len(progress) == 4:
+                    raise KeyboardInterrupt
+
+    checkpointer = Checkpointer(checkpoint_file, 0)
+    checkpointer.due = lambda: len(progress) < 2
+    monkeypatch.setattr(main, "simulate", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, "part", engine, checkpointer=checkpointer)
+    monkeypatch.setattr(main, "simulate", simulate)
+
+    resume = load_checkpoint(checkpoint_file)
+    assert 0 < resume["next_game"] < resume["config"]["num_games"]
+    summary, _ = main.play_games(resume["config"], resume["games_file"], resume["history_file"],
+                                 Checkpointer(checkpoint_file, 0), resume)
+
+    assert summary.state() == full_summary.state()
+    with open(full_games) as expected, open(resume["games_file"]) as resumed:
+        assert resumed.read() == expected.read()
+    if full_history:
+        assert list(read_history(resume["history_file"])) == list(read_history(full_history))
+    assert load_checkpoint(checkpoint_file)["next_game"] == resume["config"]["num_games"]
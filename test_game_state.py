@@ -0,0 +1,100 @@
+"""GameState ve PokerGame: apply/undo durumu sokaklar arasında da birebir geri yükler"""
+import random
+from array import array
+
+from cards import CARDS
+from game_state import GameState
+from hand_engine import HandEngine
+from poker import PokerGame
+
+def start_hand(seed):
+    random.seed(seed)
+    game = PokerGame(["a", "b", "c", "d"], None, 1000, 5, 10)
+    for player in game.players:
+        player.is_human = False
+    HandEngine(game).start_hand(1)
+    return game
+
+def snapshot(state):
+    return tuple(tuple(value) if isinstance(value, (array, bytearray)) else value
+                 for value in (getattr(state, name) for name in GameState.__slots__))
+
+def game_snapshot(game):
+    hand_masks = tuple(player.hand_state.mask for player in game.players)
+    return snapshot(game.export_state()), [card.id for card in game.community_cards], hand_masks
+
+def random_walk(current_state, rng, apply, deal):
+    # Terminal duruma kadar rastgele geçerli aksiyonlar; tur bitince masaya kart açılır
+    tokens = []
+    while not current_state().is_terminal() and len(tokens) < 200:
+        state = current_state()
+        if state.is_betting_round_done():
+            tokens.append(deal(3 if not state.board else 1))
+        else:
+            tokens.append(apply(*rng.choice(state.legal_actions())))
+    return tokens
+
+def test_game_state_undo_restores_every_step():
+    streets = set()
+    for seed in range(20):
+        state = start_hand(seed).export_state()
+        rng = random.Random(seed)
+        snapshots = []
+
+        def apply(action, amount):
+            snapshots.append(snapshot(state))
+            return state.apply(action, amount)
+
+        def deal(num_cards):
+            snapshots.append(snapshot(state))
+            return state.apply_community_cards(state.sample_cards(num_cards, rng=rng))
+
+        tokens = random_walk(lambda: state, rng, apply, deal)
+        streets.add(len(state.board))
+        for token, before in zip(reversed(tokens), reversed(snapshots)):
+            state.undo(token)
+            assert snapshot(state) == before
+    assert 5 in streets
+
+def test_new_street_resets_bets_and_undo_restores_them():
+    state = start_hand(0).export_state()
+    while not state.is_betting_round_done():
+        state.apply("call")
+    before = snapshot(state)
+    assert state.current_bet > 0
+
+    token = state.apply_community_cards(state.sample_cards(3, rng=random.Random(0)))
+    assert list(state.bets) == [0] * state.num_players
+    assert state.current_bet == 0 and state.acted == 0
+    assert not state.is_betting_round_done()
+    state.undo(token)
+    assert snapshot(state) == before
+
+def test_clone_is_independent():
+    state = start_hand(1).export_state()
+    before = snapshot(state)
+    other = state.clone()
+    assert snapshot(other) == before
+    other.apply("raise", 100)
+    other.apply_community_cards(other.sample_cards(3))
+    assert snapshot(state) == before
+
+def test_poker_game_undo_restores_every_step():
+    for seed in range(10):
+        game = start_hand(seed)
+        rng = random.Random(seed)
+        snapshots = []
+
+        def apply(action, amount):
+            snapshots.append(game_snapshot(game))
+            return game.apply(action, amount)
+
+        def deal(num_cards):
+            snapshots.append(game_snapshot(game))
+            cards = [CARDS[card_id] for card_id in game.export_state().sample_cards(num_cards, rng=rng)]
+            return game.apply_community_cards(cards)
+
+        tokens = random_walk(game.export_state, rng, apply, deal)
+        for token, before in zip(reversed(tokens), reversed(snapshots)):
+            game.undo(token)
+            assert game_snapshot(game) == before
@@ -0,0 +1,83 @@
+"""El geçmişi: yazılan ellerin birebir geri okunması"""
+import pytest
+
+from agents import create_agent
+from hand_engine import HandEngine
+from hand_history import HandHistoryWriter, read_history
+from poker import PokerGame
+from rng_streams import seed_table
+
+AGENT_TYPES = ["basic_heuristic", "aggressive_heuristic", "random", "basic_heuristic"]
+
+def play_hands(seed, num_hands):
+    # HandEngine ile oynanan eller: (el numarası, elin başındaki stack'ler, oyuncular, olaylar)
+    names = [f"p{i}" for i in range(len(AGENT_TYPES))]
+    game = PokerGame(names, AGENT_TYPES, 1000, num_hands, 10)
+    game.players = []
+    for seat, agent_type in enumerate(AGENT_TYPES):
+        agent = create_agent(agent_type, names[seat], 1000)
+        agent.is_human = False
+        agent.id = seat
+        game.players.append(agent)
+    seed_table(game, seed, 0)
+    engine = HandEngine(game)
+    hands = []
+    for round_number in range(1, num_hands + 1):
+        if sum(1 for player in game.players if player.stack > 0) <= 1:
+            break
+        stacks_before = [player.stack for player in game.players]
+        events = engine.play_hand(round_number)
+        hands.append((round_number, stacks_before, list(game.players), events))
+    return hands
+
+def expected_record(round_number, stacks_before, players, events):
+    # Olayların kayıttaki karşılığı: oyuncu yerine koltuk, kart yerine kart ID'si
+    hole = [(player.hand[0].id, player.hand[1].id) if len(player.hand) == 2 else None for player in players]
+    decoded = []
+    for event in events:
+        kind = event["type"]
+        if kind == "action":
+            decoded.append({"type": "action", "seat": event["seat"], "action": event["action"],
+                            "amount": event["amount"], "all_in": event["all_in"]})
+        elif kind == "blind":
+            decoded.append({"type": "blind", "blind": event["blind"], "seat": event["seat"], "amount": event["amount"]})
+        elif kind == "street":
+            decoded.append({"type": "street", "cards": [card.id for card in event["cards"]]})
+        elif kind == "showdown":
+            decoded.append({"type": "showdown",
+                            "hands": [(players.index(player), score) for player, score in event["hands"]]})
+        elif kind == "win":
+            decoded.append({"type": "win", "seat": event["seat"], "amount": event["amount"], "score": event["score"]})
+    return {"game": 0, "round": round_number, "stacks": stacks_before, "hole": hole, "events": decoded}
+
+@pytest.mark.parametrize("name", ["hands.bin", "hands.gz", "hands.xz"])
+def test_round_trip(tmp_path, name):
+    hands = play_hands(3, 40)
+    path = str(tmp_path / name)
+    with HandHistoryWriter(path, buffer_size=256) as writer:
+        for round_number, stacks_before, players, events in hands:
+            writer.write_hand(0, round_number, players, stacks_before, events)
+    assert writer.hands_written == len(hands)
+
+    # Küçük bloklarla okuma elleri blok sınırlarında böler
+    expected = [expected_record(*hand) for hand in hands]
+    assert list(read_history(path, read_size=7)) == expected
+    assert list(read_history(path)) == expected
+
+def test_resume_discards_hands_after_checkpoint(tmp_path):
+    hands = play_hands(5, 30)
+    path = str(tmp_path / "hands.gz")
+    writer = HandHistoryWriter(path)
+    for round_number, stacks_before, players, events in hands[:10]:
+        writer.write_hand(0, round_number, players, stacks_before, events)
+    offset, written = writer.checkpoint(), writer.hands_written
+    # Kontrol noktasından sonra yazılıp kaybedilen eller
+    for round_number, stacks_before, players, events in hands[10:15]:
+        writer.write_hand(0, round_number, players, stacks_before, events)
+    writer.close()
+
+    with HandHistoryWriter(path, resume_offset=offset, hands_written=written) as writer:
+        for round_number, stacks_before, players, events in hands[10:]:
+            writer.write_hand(0, round_number, players, stacks_before, events)
+    assert writer.hands_written == len(hands)
+    assert list(read_history(path)) == [expected_record(*hand) for hand in hands]
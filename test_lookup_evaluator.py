@@ -0,0 +1,34 @@
+"""Lookup tablosu evaluator'ı: treys ile aynı skorlar"""
+import random
+
+import lookup_evaluator
+from cards import CARDS, cards_to_mask, parse_card
+from hand_evaluator import EVALUATOR, to_treys
+
+def treys_score(cards):
+    return EVALUATOR.evaluate(to_treys(cards[2:]), to_treys(cards[:2]))
+
+def test_lookup_matches_treys():
+    lookup_evaluator.load()
+    rng = random.Random(0)
+    for num_cards in (5, 6, 7):
+        for _ in range(2000):
+            cards = rng.sample(CARDS, num_cards)
+            expected = treys_score(cards)
+            assert lookup_evaluator.evaluate_ids([card.id for card in cards]) == expected
+            assert lookup_evaluator.evaluate_mask(cards_to_mask(cards)) == expected
+            assert lookup_evaluator.evaluate(cards[:2], cards[2:]) == expected
+
+def test_lookup_flushes_and_straights():
+    # Renk ve rank kenar durumları: as-5 straight, straight flush, flush + eş
+    lookup_evaluator.load()
+    hands = [
+        ("As", "2d", "3c", "4h", "5s", "Kd", "Kc"),
+        ("Ah", "2h", "3h", "4h", "5h", "9c", "9d"),
+        ("Td", "Jd", "Qd", "Kd", "Ad"),
+        ("2c", "7c", "9c", "Jc", "Kc", "Kd", "Ks"),
+        ("6s", "6d", "6h", "6c", "Ah")
+    ]
+    for texts in hands:
+        cards = [parse_card(text) for text in texts]
+        assert lookup_evaluator.evaluate_ids([card.id for card in cards]) == treys_score(cards)
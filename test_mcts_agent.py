@@ -0,0 +1,81 @@
+"""MCTSAgent araması: kök çocukları, seçilen raise miktarı ve rollout'lar"""
+import random
+
+from cards import FULL_DECK_MASK, cards_to_mask, parse_card
+from game_state import GameState
+from poker import PokerGame
+from mcts_agent import MCTSAgent, MCTSNode
+from hand_engine import HandEngine
+
+def make_hand(seed, simulation_count=200):
+    # MCTS ajanının ilk koltukta oturduğu, başlamış bir el
+    random.seed(seed)
+    game = PokerGame(["a", "b", "c"], None, 1000, 5, 10)
+    for player in game.players:
+        player.is_human = False
+    agent = MCTSAgent("mcts", 1000, simulation_count=simulation_count)
+    agent.is_human = False
+    agent.id = game.players[0].id
+    agent.rng = random.Random(seed)
+    game.players[0] = agent
+    engine = HandEngine(game)
+    engine.start_hand(1)
+    return game, agent, engine
+
+def test_search_expands_root(monkeypatch):
+    roots = []
+    best_child = MCTSAgent.best_child
+
+    def record_root(self, node):
+        roots.append(node)
+        return best_child(self, node)
+
+    monkeypatch.setattr(MCTSAgent, "best_child", record_root)
+    game, agent, engine = make_hand(0)
+    while engine.to_act != 0:
+        engine.step(*engine.decide())
+    legal = game.export_state().legal_actions()
+    action = agent.get_action(game)
+
+    root = roots[-1]
+    assert root.children
+    assert {child.action for child in root.children} <= set(legal)
+    assert action in {legal_action for legal_action, _ in legal}
+
+def test_search_returns_raise_amount():
+    for seed in range(10):
+        game, agent, engine = make_hand(seed)
+        while engine.to_act != 0:
+            engine.step(*engine.decide())
+        legal = game.export_state().legal_actions()
+        if agent.get_action(game) == "raise":
+            assert ("raise", agent.chosen_raise) in legal
+            assert agent.get_raise_amount(game) == agent.chosen_raise
+            return
+    raise AssertionError("Arama hiç raise seçmedi")
+
+def test_rollout_bets_on_every_street():
+    # Flop'tan başlayan rollout'lar turn ve river'da da bahis aksiyonu oynar
+    hole = [parse_card(text) for text in ("As", "Kd", "7c", "7h", "2s", "3d")]
+    flop = [parse_card(text) for text in ("Qs", "Js", "4c")]
+    used = cards_to_mask(hole + flop)
+    state = GameState(ids=[0, 1, 2], stacks=[900, 900, 900], bets=[0, 0, 0], folded=[0, 0, 0],
+                      hands=[cards_to_mask(hole[i:i + 2]) for i in (0, 2, 4)],
+                      board=[card.id for card in flop], deck_mask=FULL_DECK_MASK & ~used,
+                      pot=300, small_blind=5)
+    agent = MCTSAgent("mcts", 900, simulation_count=1)
+    agent.id = 0
+    agent.rng = random.Random(0)
+    agent.set_hand(hole[:2], flop)
+
+    streets = set()
+    apply_action = agent.apply_action
+
+    def record_street(game_state, action):
+        streets.add(len(game_state.board))
+        return apply_action(game_state, action)
+
+    agent.apply_action = record_street
+    for _ in range(50):
+        agent.simulate(MCTSNode(state))
+    assert {3, 4, 5} <= streets
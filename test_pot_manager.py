@@ -0,0 +1,58 @@
+"""PotManager: yan potlar, bölünen potlar ve vektörel karşılığı"""
+import random
+
+import numpy as np
+
+from pot_manager import PotManager, resolve_batch
+
+def make_pots(contributions):
+    pots = PotManager(len(contributions))
+    for seat, amount in enumerate(contributions):
+        pots.add(seat, amount)
+    return pots
+
+def winnings(awards, num_seats):
+    totals = [0] * num_seats
+    for seat, amount, _ in awards:
+        totals[seat] += amount
+    return totals
+
+def test_short_all_in_wins_only_main_pot():
+    pots = make_pots([100, 300, 300])
+    assert pots.resolve({0: 1, 1: 5, 2: 10}) == [(0, 300, 1), (1, 400, 5)]
+
+def test_folded_chips_stay_in_pots():
+    # Koltuk 3 fold yaptı; katkısı seviyelere göre potlara dağılır
+    pots = make_pots([50, 200, 200, 100])
+    awards = pots.resolve({0: 1, 1: 5, 2: 5})
+    assert awards == [(0, 200, 1), (1, 175, 5), (2, 175, 5)]
+    assert pots.total == 550
+
+def test_split_pot_odd_chip_goes_to_first_seat():
+    pots = make_pots([101, 101, 101])
+    assert winnings(pots.resolve({0: 20, 1: 7, 2: 7}), 3) == [0, 152, 151]
+
+def test_uncalled_chips_return_to_bettor():
+    pots = make_pots([100, 500])
+    assert pots.resolve({0: 1, 1: 9}) == [(0, 200, 1), (1, 400, 9)]
+
+def test_resolve_batch_matches_resolve():
+    rng = random.Random(0)
+    tables = []
+    for _ in range(500):
+        num_seats = rng.randint(2, 6)
+        contributions = [rng.choice((0, 10, 50, 100, 250, 400)) for _ in range(num_seats)]
+        live = [rng.random() < 0.7 for _ in range(num_seats)]
+        if not any(live):
+            live[0] = True
+        scores = [rng.randint(1, 40) for _ in range(num_seats)]
+        tables.append((contributions, live, scores))
+
+    for contributions, live, scores in tables:
+        num_seats = len(contributions)
+        pots = make_pots(contributions)
+        expected = winnings(pots.resolve({seat: scores[seat] for seat in range(num_seats) if live[seat]}), num_seats)
+        assert sum(expected) == sum(contributions)
+
+        result = resolve_batch(np.array([contributions]), np.array([scores]), np.array([live]))
+        assert result[0].tolist() == expected
@@ -2,43 +2,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os
 import sys
-from treys import Card as TreysCard, Evaluator
-import random
 
 from poker import PokerGame, Player
+from hand_engine import HandEngine, FLOP, TURN
 from heuristic_agent import BasicHeuristicAgent, AggressiveHeuristicAgent
 from mcts_agent import MCTSAgent
 from expectiminimax_agent import ExpectiminimaxAgent
 
-def el_gucu_hesapla(hole_cards, community_cards):
-    # Treys evaluator kullanarak el gücünü hesapla
-    evaluator = Evaluator()
-    
-    # Kartları Treys formatına dönüştür
-    treys_hole_cards = []
-    for card in hole_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_hole_cards.append(treys_card)
-    
-    treys_community_cards = []
-    for card in community_cards:
-        suit_map = {"spades": "s", "hearts": "h", "diamonds": "d", "clubs": "c"}
-        rank_map = {"2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", 
-                   "9": "9", "10": "T", "jack": "J", "queen": "Q", "king": "K", "ace": "A"}
-        
-        card_str = rank_map.get(card.rank, "") + suit_map.get(card.suit, "")
-        treys_card = TreysCard.new(card_str)
-        treys_community_cards.append(treys_card)
-    
-    # El skorunu hesapla (1 en iyi, 7462 en kötü)
-    score = evaluator.evaluate(treys_community_cards, treys_hole_cards)
-    return score
-
 class PokerUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -387,8 +357,14 @@ class PokerUI:
             ai_player.is_human = False
             self.game.players.append(ai_player)
             
-        # Oyunu başlat
+        # Oyunculara ID ata
+        for i, player in enumerate(self.game.players):
+            player.id = i
+            
+        # Oyunu başlat; eller ortak durum makinesiyle oynanır (bkz. hand_engine.py)
         self.game.reset_round()
+        self.engine = HandEngine(self.game)
+        self.showdown_reached = False
         
         # Sadece hazırlık aşamasında, next_round() metodu kartları dağıtacak
     
@@ -726,14 +702,8 @@ class PokerUI:
         
         if hasattr(self, "check_btn") and hasattr(self, "call_btn") and hasattr(self, "fold_btn") and hasattr(self, "raise_btn"):
             # İnsan oyuncunun sırasını belirle
-            is_human_turn = False
-            
-            # ÖNEMLİ DEĞİŞİKLİK: Aktif sıranın insan oyuncusuna gelip gelmediğini kontrol et
-            if hasattr(self, "betting_order") and hasattr(self, "current_betting_idx"):
-                if len(self.betting_order) > self.current_betting_idx:
-                    current_player = self.betting_order[self.current_betting_idx]
-                    if current_player.is_human:
-                        is_human_turn = True
+            current_player = self.engine.current_player
+            is_human_turn = current_player is not None and current_player.is_human
             
             # İnsan oyuncu fold yaptıysa tüm butonları devre dışı bırak
             if player.is_folded or player.stack <= 0:
@@ -786,9 +756,9 @@ class PokerUI:
                     self.raise_btn.config(state="disabled", bg=self.disabled_button_style["bg"], 
                                         disabledforeground=self.disabled_button_style["disabledforeground"])
         
-        # Raise spinbox'ı güncelle
+        # Raise spinbox'ı güncelle (değer call dahil ortaya konan toplam miktar)
         if hasattr(self, "raise_entry") and hasattr(self, "min_raise_label"):
-            min_raise = max(self.game.small_blind, self.game.current_bet - player.bet)
+            min_raise = self.game.current_bet - player.bet + self.game.min_raise()
             max_raise = player.stack
             
             # Min raise etiketini güncelle
@@ -808,36 +778,26 @@ class PokerUI:
                 self.raise_var.set(max_raise)
         
         # Sırası gelen oyuncuyu sarı çerçeve ile vurgula
-        if hasattr(self, "betting_order") and hasattr(self, "current_betting_idx"):
-            if self.betting_order and self.current_betting_idx < len(self.betting_order):
-                current_player = self.betting_order[self.current_betting_idx]
+        current_player = self.engine.current_player
+        
+        # Tüm oyuncuların çerçevelerini normal renge çevir
+        for player_idx, player_ui in self.player_frames.items():
+            frame = player_ui.get("frame", None)
+            if frame:
+                frame.configure(style="Green.TLabelframe")
                 
-                # Tüm oyuncuların çerçevelerini normal renge çevir
-                for player_idx, player_ui in self.player_frames.items():
-                    frame = player_ui.get("frame", None)
-                    if frame:
-                        frame.configure(style="Green.TLabelframe")
-                        
-                # Sırası gelen oyuncunun çerçevesini sarı yap
-                for player_idx, player in enumerate(self.game.players):
-                    if player == current_player:
-                        player_ui = self.player_frames.get(player_idx)
-                        if player_ui:
-                            frame = player_ui.get("frame", None)
-                            if frame:
-                                frame.configure(style="ActivePlayer.TLabelframe")
-        
-        # Sonsuz döngüye neden olduğu için kaldırdık
-        # return self.check_allin_showdown()
+        # Sırası gelen oyuncunun çerçevesini sarı yap
+        if current_player is not None:
+            player_ui = self.player_frames.get(self.engine.to_act)
+            if player_ui:
+                frame = player_ui.get("frame", None)
+                if frame:
+                    frame.configure(style="ActivePlayer.TLabelframe")
     
     def is_showdown_state(self):
         """Showdown durumunda mıyız kontrol et"""
-        # Eğer 5 community kart açıldıysa ve bahis turu bittiyse showdown durumundayız
-        if len(self.game.community_cards) == 5:
-            # Eğer bahis turu tamamlandıysa (tüm bahisler eşit ve herkes aksiyon almış)
-            if hasattr(self, "player_acted") and all(self.player_acted.get(p, True) for p in self.game.players if not p.is_folded and p.stack > 0):
-                return True
-        return False
+        # Elin son olayları arasında showdown varsa kartlar açık kalır
+        return self.showdown_reached
     
     def fold_action(self):
         """İnsan oyuncu fold yaptı"""
@@ -847,41 +807,11 @@ class PokerUI:
         if player.is_folded:
             messagebox.showwarning("İşlem Yapılamaz", "Zaten fold yaptınız!")
             return
-            
-        # Fold işlemini uygula
-        player.is_folded = True
-        self.add_log(f"{player.name} fold yaptı.")
-        
-        # Oyuncunun aksiyon aldığını işaretle
-        self.player_acted[player] = True
-        
-        # UI'ı güncelle
-        self.update_game_state()
-        
-        # Aktif oyuncu sayısını kontrol et
-        active_players = [p for p in self.game.players if not p.is_folded]
-        if len(active_players) <= 1:
-            self.add_log("Sadece bir oyuncu kaldığı için el sonlandırıldı.")
-            self.showdown()
-            return
-        
-        # Eğer all-in durumu varsa direk showdown'a geç
-        if self.check_allin_showdown():
-            return
-        
-        # Bahis turu tamamlandı mı kontrol et
-        if self.is_betting_round_complete():
-            self.next_stage()
+        if self.engine.current_player is not player:
             return
         
-        # Bir sonraki oyuncuya geç
-        self.current_betting_idx = (self.current_betting_idx + 1) % len(self.betting_order)
-        
-        # Butonları güncelle
-        self.update_game_state()
-        
-        # AI oyuncularının sırasına geç - İnsan oyuncu işlemlerinin sonunda bu çağrı şart!
-        self.root.after(100, self.ai_turn)
+        self.handle_events(self.engine.step("fold"))
+        self.continue_hand()
     
     def call_action(self):
         """İnsan oyuncu call veya check yaptı"""
@@ -895,57 +825,12 @@ class PokerUI:
         if player.stack <= 0:
             messagebox.showwarning("İşlem Yapılamaz", "All-in durumundasınız!")
             return
-            
-        # Aktif oyuncular ve mevcut max bet
-        active_players = [p for p in self.game.players if not p.is_folded]
-        max_bet = max(player.bet for player in active_players)
-        call_amount = max_bet - player.bet
-        
-        if call_amount <= 0:
-            # Check yapıldı
-            self.add_log(f"{player.name} check yaptı.")
-        else:
-            # Call yapıldı
-            if call_amount >= player.stack:
-                # All-in
-                call_amount = player.stack
-                self.add_log(f"{player.name} {call_amount} chip ile all-in yaptı.")
-                player.stack = 0
-            else:
-                self.add_log(f"{player.name} {call_amount} chip ile call yaptı.")
-                player.stack -= call_amount
-                
-            player.bet += call_amount
-            self.game.pot += call_amount
-            self.game.current_bet = max(self.game.current_bet, player.bet)
-        
-        # Stack'in 0'dan küçük olmasını engelle
-        if player.stack < 0:
-            player.stack = 0
-            
-        # Oyuncunun aksiyon aldığını işaretle
-        self.player_acted[player] = True
-        
-        # UI'ı güncelle
-        self.update_game_state()
-        
-        # Eğer all-in durumu varsa direk showdown'a geç
-        if self.check_allin_showdown():
-            return
-        
-        # Bahis turu tamamlandı mı kontrol et
-        if self.is_betting_round_complete():
-            self.next_stage()
+        if self.engine.current_player is not player:
             return
         
-        # Bir sonraki oyuncuya geç
-        self.current_betting_idx = (self.current_betting_idx + 1) % len(self.betting_order)
-        
-        # Butonları güncelle
-        self.update_game_state()
-        
-        # AI oyuncularının sırasına geç - İnsan oyuncu işlemlerinin sonunda bu çağrı şart!
-        self.root.after(100, self.ai_turn)
+        # Ödenecek miktar yoksa motor bunu check olarak uygular
+        self.handle_events(self.engine.step("call"))
+        self.continue_hand()
     
     def raise_action(self):
         """İnsan oyuncu raise yaptı"""
@@ -955,407 +840,94 @@ class PokerUI:
         if player.is_folded or player.stack <= 0:
             messagebox.showwarning("İşlem Yapılamaz", "Fold yaptınız veya yeterli stack'iniz kalmadı!")
             return
-            
-        raise_amount = self.raise_var.get()
-        
-        # 0 ile raise yapılamamalı kontrolü
-        if raise_amount <= 0:
-            messagebox.showwarning("Geçersiz Raise", "Raise miktarı 0 veya negatif olamaz!")
+        if self.engine.current_player is not player:
             return
             
-        # Minimum raise miktarı kontrolü
-        active_players = [p for p in self.game.players if not p.is_folded]
-        max_bet = max(p.bet for p in active_players)
-        min_raise = max(self.game.small_blind, max_bet - player.bet)
+        # Spinbox değeri bu aksiyonda ortaya konan toplam miktardır (call dahil)
+        raise_amount = self.raise_var.get()
+        min_raise = min(self.game.current_bet - player.bet + self.game.min_raise(), player.stack)
         
-        # Toplam bet miktarı (player.bet + raise_amount) mevcut max bet'ten büyük olmalı
-        if player.bet + raise_amount <= max_bet:
+        if raise_amount < min_raise:
             messagebox.showwarning("Geçersiz Raise", f"Raise miktarı en az {min_raise} olmalıdır!")
             return
             
         if raise_amount > player.stack:
             messagebox.showwarning("Yetersiz Stack", f"En fazla {player.stack} chip ile raise yapabilirsiniz!")
             return
-            
-        # Raise işlemini uygula
-        total_amount = raise_amount + (max_bet - player.bet)  # Call + raise
-        player.stack -= total_amount
-        player.bet = max_bet + raise_amount
-        self.game.current_bet = player.bet
-        self.game.pot += total_amount
-        
-        # Stack'in 0'dan küçük olmasını engelle
-        if player.stack < 0:
-            player.stack = 0
-            
-        if player.stack == 0:
-            self.add_log(f"{player.name} {raise_amount} chip ile all-in yaptı.")
-        else:
-            self.add_log(f"{player.name} {raise_amount} chip ile raise yaptı.")
-        
-        # Raise yapıldığında, tüm diğer oyuncuların aksiyonu sıfırla
-        # Herkes tekrar aksiyon almalı
-        for p in self.player_acted:
-            if p != player and p.stack > 0 and not p.is_folded:
-                self.player_acted[p] = False
-        
-        # Oyuncunun aksiyon aldığını işaretle
-        self.player_acted[player] = True
-        
-        # UI'ı güncelle
-        self.update_game_state()
-        
-        # Eğer all-in durumu varsa direk showdown'a geç
-        if self.check_allin_showdown():
-            return
-        
-        # Bahis turu tamamlandı mı kontrol et
-        if self.is_betting_round_complete():
-            self.next_stage()
-            return
-        
-        # Bir sonraki oyuncuya geç
-        self.current_betting_idx = (self.current_betting_idx + 1) % len(self.betting_order)
-        
-        # Butonları güncelle
-        self.update_game_state()
         
-        # AI oyuncularının sırasına geç - İnsan oyuncu işlemlerinin sonunda bu çağrı şart!
-        self.root.after(100, self.ai_turn)
+        self.handle_events(self.engine.step("raise", raise_amount))
+        self.continue_hand()
     
     def ai_turn(self):
-        """AI oyuncuların sırasını yönet"""
-        # Oyunda aktif kaç oyuncu kaldığını kontrol et
-        active_players = [p for p in self.game.players if not p.is_folded]
-        if len(active_players) <= 1:
-            # Sadece bir oyuncu kaldıysa showdown'a geç
-            self.add_log("Sadece bir oyuncu kaldığı için el sonlandırıldı.")
-            self.showdown()
-            return
-        
-        # Bahis turu tamamlandı mı kontrol et
-        if self.is_betting_round_complete():
-            # Bir sonraki aşamaya geç
-            self.next_stage()
-            return
-        
-        # Şu anki aktif oyuncuları güncelle
-        active_players = [p for p in self.game.players if not p.is_folded and p.stack > 0]
-        
-        # Eğer betting_order yoksa veya boşsa, yeniden oluştur
-        if not hasattr(self, "betting_order") or not self.betting_order:
-            dealer_idx = self.game.round % len(self.game.players)
-            next_idx = -1
-            
-            # Post-flop turlarında ilk sözü dealer'dan sonraki ilk aktif oyuncuya ver
-            if len(self.game.community_cards) > 0:
-                for i in range(1, len(self.game.players) + 1):
-                    check_idx = (dealer_idx + i) % len(self.game.players)
-                    player = self.game.players[check_idx]
-                    if not player.is_folded and player.stack > 0:
-                        next_idx = check_idx
-                        break
-            else:
-                # Pre-flop'ta big blind'dan sonraki oyuncudan başla
-                next_idx = (dealer_idx + 3) % len(self.game.players)
-                
-            # Bahis sırasını oluştur
-            self.betting_order = []
-            for i in range(len(self.game.players)):
-                check_idx = (next_idx + i) % len(self.game.players)
-                player = self.game.players[check_idx]
-                if not player.is_folded and player.stack > 0:
-                    self.betting_order.append(player)
-            
-            # Her oyuncunun aksiyonu olduğunu takip etmek için
-            self.player_acted = {p: False for p in active_players}
-            self.current_betting_idx = 0
-        
-        # Şu anki oyuncuyu al
-        if self.current_betting_idx >= len(self.betting_order):
-            self.current_betting_idx = 0
-            
-        current_player = self.betting_order[self.current_betting_idx]
-        
-        # İnsan oyuncu sırası mı?
-        if current_player.is_human:
-            # İnsan oyuncunun UI'da butonları aktif et - log mesajı kaldırıldı
+        """Sıradaki AI oyuncunun aksiyonunu al ve uygula"""
+        current_player = self.engine.current_player
+        if current_player is None or current_player.is_human:
+            # El bitti veya insan oyuncunun sırası; butonlar update_game_state ile açılır
             self.update_game_state()
             return
         
-        # AI oyuncusunun aksiyonunu işle
-        if current_player.stack <= 0:
-            self.add_log(f"{current_player.name} zaten all-in durumunda.")
-            self.player_acted[current_player] = True
-            # Bir sonraki oyuncuya geç
-            self.current_betting_idx = (self.current_betting_idx + 1) % len(self.betting_order)
-            self.root.after(10, self.ai_turn)
-            return
-        
-        # Mevcut durum analizi
-        is_check_round = all(player.bet == 0 for player in active_players)
-        max_bet = max(player.bet for player in active_players)
-        
-        # AI'nın aksiyonunu al
-        action = current_player.get_action(self.game)
-        
-        # İlk tur tüm bahisler 0 ise check yap
-        if is_check_round and (action == "call"):
-            action = "check"
-        
-        # İlk tur fold gelirse %70 ihtimalle check yap (agresiflik ayarı)
-        if is_check_round and action == "fold":
-            if random.random() < 0.7:  # %70 ihtimalle check
-                action = "check"
-        
-        # Aksiyonu işle
-        if action == "fold":
-            current_player.is_folded = True
-            self.add_log(f"{current_player.name} fold yaptı.")
-        elif action == "check":
-            # Check aksiyonu - bet = 0 durumunda
-            if max_bet > 0 and current_player.bet < max_bet:
-                # Aslında check yapamaz, call yapmalı
-                call_amount = min(max_bet - current_player.bet, current_player.stack)
-                current_player.stack -= call_amount
-                current_player.bet += call_amount
-                self.game.pot += call_amount
-                
-                # Stack'in 0'dan küçük olmasını engelle
-                if current_player.stack < 0:
-                    current_player.stack = 0
-                
-                if current_player.stack == 0:
-                    self.add_log(f"{current_player.name} {call_amount} chip ile all-in yaptı.")
-                else:
-                    self.add_log(f"{current_player.name} {call_amount} chip ile call yaptı.")
-            else:
-                # Normal check
-                self.add_log(f"{current_player.name} check yaptı.")
-        elif action == "call":
-            call_amount = max_bet - current_player.bet
-            if call_amount <= 0:
-                # Aslında check yapmalı
-                self.add_log(f"{current_player.name} check yaptı.")
-            elif call_amount <= current_player.stack:
-                current_player.stack -= call_amount
-                current_player.bet += call_amount
-                self.game.pot += call_amount
-                
-                # Stack'in 0'dan küçük olmasını engelle
-                if current_player.stack < 0:
-                    current_player.stack = 0
-                    
-                self.add_log(f"{current_player.name} {call_amount} chip ile call yaptı.")
-            else:
-                # All-in durumu
-                self.add_log(f"{current_player.name} yeterli chip'i olmadığı için {current_player.stack} chip ile all-in yapıyor.")
-                self.game.pot += current_player.stack
-                current_player.bet += current_player.stack
-                current_player.stack = 0
-        elif action == "raise":
-            raise_amount = current_player.get_raise_amount(self.game)
-            
-            # Raise miktarı 0 veya negatif olamaz
-            if raise_amount <= 0:
-                # Raise yapamayacaksa check ya da call yap
-                if is_check_round:
-                    self.add_log(f"{current_player.name} check yaptı.")
-                else:
-                    # Check round değilse call yap
-                    call_amount = min(max_bet - current_player.bet, current_player.stack)
-                    if call_amount > 0:
-                        current_player.stack -= call_amount
-                        current_player.bet += call_amount
-                        self.game.pot += call_amount
-                        
-                        # Stack'in 0'dan küçük olmasını engelle
-                        if current_player.stack < 0:
-                            current_player.stack = 0
-                            
-                        self.add_log(f"{current_player.name} raise yapamadığı için {call_amount} chip ile call yaptı.")
-                    else:
-                        self.add_log(f"{current_player.name} check yaptı.")
-            else:
-                # Raise miktarı pozitif olduğunda raise işlemi gerçekleştir
-                # Minimum raise miktarı kontrolü (en az small blind kadar olmalı)
-                min_raise = max(self.game.small_blind, max_bet - current_player.bet)
-                
-                # Toplam bet miktarı (current_player.bet + raise_amount) current_bet'ten büyük olmalı
-                if current_player.bet + raise_amount <= max_bet:
-                    raise_amount = min_raise
-                
-                # Maksimum miktarı stack ile sınırla
-                raise_amount = min(raise_amount, current_player.stack)
-                
-                # Normal raise - önceki bahisleri de ekle
-                total_amount = raise_amount + (max_bet - current_player.bet)
-                current_player.stack -= total_amount
-                current_player.bet = max_bet + raise_amount
-                self.game.current_bet = current_player.bet
-                self.game.pot += total_amount
-                
-                # Stack'in 0'dan küçük olmasını engelle
-                if current_player.stack < 0:
-                    current_player.stack = 0
-                
-                if current_player.stack == 0:
-                    self.add_log(f"{current_player.name} {raise_amount} chip ile all-in yaptı.")
-                else:
-                    self.add_log(f"{current_player.name} {raise_amount} chip ile raise yaptı.")
-                    
-                # Raise yapıldığında, tüm diğer oyuncuların aksiyonu sıfırla
-                # Herkes tekrar aksiyon almalı
-                for player in self.player_acted:
-                    if player != current_player and player.stack > 0 and not player.is_folded:
-                        self.player_acted[player] = False
-        
-        # Oyuncunun aksiyon aldığını işaretle
-        self.player_acted[current_player] = True
-        
-        # UI'ı güncelle
-        self.update_game_state()
+        self.handle_events(self.engine.step_agent())
         self.root.update()
-        
-        # Oyun durumunu yeniden kontrol et
-        active_players = [p for p in self.game.players if not p.is_folded]
-        if len(active_players) <= 1:
-            # Sadece bir oyuncu kaldıysa showdown'a geç
-            self.add_log("Sadece bir oyuncu kaldığı için el sonlandırıldı.")
-            self.showdown()
-            return
-        
-        # Eğer all-in durumu varsa direk showdown'a geç
-        if self.check_allin_showdown():
-            return
-        
-        # Bahis turu tamamlandı mı kontrol et
-        if self.is_betting_round_complete():
-            # Bir sonraki aşamaya geç
-            self.next_stage()
-            return
-        
-        # Sonraki oyuncuya geç
-        self.current_betting_idx = (self.current_betting_idx + 1) % len(self.betting_order)
-        
-        # AI hamleleri arasında kısa bir gecikme ekle - 100ms
-        self.root.after(100, self.ai_turn)
-    
-    def is_betting_round_complete(self):
-        """Bahis turu tamamlandı mı kontrol et - aktif oyuncular en az 1 aksiyon aldı ve tüm bahisler eşit"""
-        active_players = [p for p in self.game.players if not p.is_folded and p.stack > 0]
-        
-        # 1. Tüm oyuncular aksiyon aldı mı kontrol et
-        for player in active_players:
-            if not self.player_acted.get(player, False):
-                return False
-        
-        # 2. Tüm bahisler eşit mi kontrol et
-        if not self.game.is_betting_round_done():
-            return False
-        
-        # Evet, bahis turu tamamlandı
-        return True
+        self.continue_hand()
     
-    def next_stage(self):
-        """Bir sonraki aşamaya geç (flop, turn, river)"""
-        # Oyunda aktif kaç oyuncu kaldığını kontrol et
-        active_players = [p for p in self.game.players if not p.is_folded]
-        if len(active_players) <= 1:
-            # Sadece bir oyuncu kaldıysa showdown'a geç
-            self.add_log("Sadece bir oyuncu kaldığı için el sonlandırıldı.")
-            self.showdown()
-            return
-            
-        # Bir sonraki aşamaya geç
-        if len(self.game.community_cards) == 0:
-            # Flop
-            self.game.deal_community_cards(3)
-            self.add_log("--- FLOP ---")
-            flop_cards = [f"{card.rank} of {card.suit}" for card in self.game.community_cards]
-            self.add_log(f"Flop kartları: {', '.join(flop_cards)}")
-        elif len(self.game.community_cards) == 3:
-            # Turn
-            self.game.deal_community_cards(1)
-            self.add_log("--- TURN ---")
-            turn_card = self.game.community_cards[3]
-            self.add_log(f"Turn kartı: {turn_card.rank} of {turn_card.suit}")
-        elif len(self.game.community_cards) == 4:
-            # River
-            self.game.deal_community_cards(1)
-            self.add_log("--- RIVER ---")
-            river_card = self.game.community_cards[4]
-            self.add_log(f"River kartı: {river_card.rank} of {river_card.suit}")
-        else:
-            # Showdown
-            self.add_log("--- SHOWDOWN ---")
-            self.showdown()
-            return
-        
-        # Bahisleri sıfırla
-        for player in self.game.players:
-            player.bet = 0
-        self.game.current_bet = 0
-            
-        # UI'ı güncelle
+    def continue_hand(self):
+        """Aksiyondan sonra eli sürdür: el bittiyse sonucu işle, AI sırasıysa aksiyon al"""
         self.update_game_state()
-        
-        # Aktif oyuncular (stack > 0 ve fold olmamış)
-        active_players = [p for p in self.game.players if not p.is_folded and p.stack > 0]
-        if not active_players:
-            # Aktif oyuncu yoksa (tüm oyuncular all-in)
-            self.next_stage()
-            return
-        
-        # Dealer'ı bul
-        dealer_idx = self.game.round % len(self.game.players)
-        
-        # Post-flop turlarında ilk sözü dealer'dan sonraki ilk aktif oyuncuya ver
-        next_idx = -1
-        for i in range(1, len(self.game.players) + 1):
-            check_idx = (dealer_idx + i) % len(self.game.players)
-            player = self.game.players[check_idx]
-            if not player.is_folded and player.stack > 0:
-                next_idx = check_idx
-                break
-        
-        # Eğer aktif oyuncu bulunamazsa (hepsi all-in)
-        if next_idx == -1:
-            # Bir sonraki aşamaya geç
-            self.next_stage()
+        if self.engine.hand_over:
+            self.check_bankrupt_players()
             return
         
-        # Bahis turundaki sırayı belirle
-        self.betting_order = []
-        # Aktif oyuncuları sırala
-        for i in range(len(self.game.players)):
-            check_idx = (next_idx + i) % len(self.game.players)
-            player = self.game.players[check_idx]
-            if not player.is_folded and player.stack > 0:
-                self.betting_order.append(player)
-        
-        # Her oyuncunun aksiyonu olduğunu takip etmek için
-        self.player_acted = {p: False for p in active_players}
-        self.current_betting_idx = 0
-        
-        # UI'ı güncelle
-        self.update_game_state()
-        
-        # Bahis turuna başla
-        self.ai_turn()
+        # İnsan oyuncu sıradaysa bekle, değilse AI hamleleri arasında kısa bir gecikme - 100ms
+        if not self.engine.current_player.is_human:
+            self.root.after(100, self.ai_turn)
     
-    def showdown(self):
-        # Showdown - kazananı belirle
-        active_players = [p for p in self.game.players if not p.is_folded]
-        
-        # All-in kontrolü - yan pot hesaplama için gereken bilgileri toplama
-        all_in_players = [p for p in active_players if p.stack == 0]
-        has_all_in = len(all_in_players) > 0
+    def handle_events(self, events):
+        """El motorunun olaylarını log'a yaz (bkz. hand_engine.py)"""
+        for event in events:
+            kind = event["type"]
+            if kind == "blind":
+                self.add_log(f"{event['player'].name} {event['blind']} blind: {event['amount']}")
+            elif kind == "action":
+                name, amount = event["player"].name, event["amount"]
+                if event["action"] == "fold":
+                    self.add_log(f"{name} fold yaptı.")
+                elif event["action"] == "check":
+                    self.add_log(f"{name} check yaptı.")
+                elif event["all_in"]:
+                    self.add_log(f"{name} {amount} chip ile all-in yaptı.")
+                else:
+                    self.add_log(f"{name} {amount} chip ile {event['action']} yaptı.")
+            elif kind == "street":
+                cards = [f"{card.rank} of {card.suit}" for card in event["cards"]]
+                if event["street"] == FLOP:
+                    self.add_log("--- FLOP ---")
+                    self.add_log(f"Flop kartları: {', '.join(cards)}")
+                elif event["street"] == TURN:
+                    self.add_log("--- TURN ---")
+                    self.add_log(f"Turn kartı: {cards[0]}")
+                else:
+                    self.add_log("--- RIVER ---")
+                    self.add_log(f"River kartı: {cards[0]}")
+            elif kind == "showdown":
+                self.add_log("--- SHOWDOWN ---")
+                self.showdown(event["hands"])
+            elif kind == "win":
+                winner = event["player"]
+                if event["score"] is None:
+                    self.add_log("Sadece bir oyuncu kaldığı için el sonlandırıldı.")
+                    self.add_log(f"Kazanan: {winner.name} (Tek kalan oyuncu)")
+                    self.add_log(f"{winner.name} {event['amount']} chip kazandı!")
+                else:
+                    hand_desc = self.describe_hand(event["score"])
+                    self.add_log(f"Kazanan: {winner.name} ile {hand_desc}, Kazanç: {event['amount']}")
+    
+    def showdown(self, player_hands):
+        """Showdown: kartları göster ve elleri log'a yaz; pot motor tarafından dağıtılır"""
+        self.showdown_reached = True
         
-        # Showdown'da tüm kartları göster
-        # Tüm AI kartlarını görünür yap
+        # Fold yapmamış tüm oyuncuların (AI ve insan) kartlarını görünür yap
         for player_idx, player in enumerate(self.game.players):
-            if not player.is_folded:  # Fold yapmamış tüm oyuncular (AI ve insan)
+            if not player.is_folded:
                 player_ui = self.player_frames.get(player_idx)
                 if player_ui and "card_labels" in player_ui:
                     for i, card_label in enumerate(player_ui["card_labels"]):
@@ -1367,62 +939,16 @@ class PokerUI:
                             # Kartın görüntüsünü hemen güncelle
                             self.root.update_idletasks()
         
-        # UI'ı güncelle - çağrı değiştirildi, direkt showdown_state'i True yapıyoruz
-        # update_game_state() yerine burada yapıyoruz (loop engellemek için)
-        self.pot_label.config(text=f"Pot: {self.game.pot}")
-        self.round_label.config(text=f"El: {self.game.round}/{self.settings['max_round']}")
-        self.root.update()
-        
-        # El değerlendirmesini hazırla ve loga ekle
+        # El değerlendirmesini loga ekle
         self.add_log("--- EL DEĞERLENDİRMESİ ---")
-        
-        # Player hands bilgisini topla
-        player_hands = []
-        
-        if len(active_players) <= 1:
-            # Tek kalan oyuncu
-            if active_players:
-                winner = active_players[0]
-                self.add_log(f"Kazanan: {winner.name} (Tek kalan oyuncu)")
-                self.add_log(f"{winner.name} {self.game.pot} chip kazandı!")
-                winner.stack += self.game.pot
-                self.game.pot = 0
-            else:
-                self.add_log("Oyunda kimse kalmadı!")
-        else:
-            # Her oyuncunun elini değerlendir
-            for player in active_players:
-                score = el_gucu_hesapla(player.hand, self.game.community_cards)
-                player_hands.append((player, score))
-                hand_desc = self.describe_hand(score)
-                self.add_log(f"{player.name}'in eli: {hand_desc}")
-                
-            # En düşük skor en iyi el (treys'te 1 en iyi, 7462 en kötü)
-            player_hands.sort(key=lambda x: x[1])
-            winner = player_hands[0][0]
-            hand_desc = self.describe_hand(player_hands[0][1])
-            self.add_log(f"Kazanan: {winner.name} ile {hand_desc}")
-            
-            # Yan pot hesaplama - all-in oyuncular varsa
-            if has_all_in:
-                self.calculate_side_pots(active_players, player_hands)
-            else:
-                # Normal pot için kazananı belirle
-                winner.stack += self.game.pot
-                self.add_log(f"{winner.name} {self.game.pot} chip kazandı!")
-                self.game.pot = 0
-        
-        # Oyun durumunu güncelle
-        self.update_game_state()  # Şimdi burada çağırıyoruz
-        
-        # Bankrupt oyuncuları kontrol et
-        self.check_bankrupt_players()
+        for player, score in player_hands:
+            self.add_log(f"{player.name}'in eli: {self.describe_hand(score)}")
     
     def check_bankrupt_players(self):
         """Stacki 0 olan oyuncuları kontrol et"""
-        # Stacki 0 olan oyuncuları kontrol et (sonraki elde fold olacaklar)
+        # Stacki 0 olan oyuncuları kontrol et (sonraki elde oynayamayacaklar)
         for player in self.game.players:
-            if player.stack <= 0 and not player.is_folded:
+            if player.stack <= 0:
                 self.add_log(f"{player.name} chip'i kalmadığı için bir sonraki elde oynayamayacak.")
         
         self.update_game_state()
@@ -1434,70 +960,6 @@ class PokerUI:
             self.end_game()
             return
     
-    def calculate_side_pots(self, active_players, player_hands):
-        """Yan pot hesaplama"""
-        # Önce oyuncuları kartlarına göre sırala
-        player_hand_map = {p[0]: p[1] for p in player_hands}
-        
-        # Oyuncuları bet miktarına göre sırala (düşükten yükseğe)
-        players_by_bet = sorted(active_players, key=lambda p: p.bet)
-        
-        # Toplam pot ve kümülatif oyuncu grupları
-        total_pot = self.game.pot
-        remaining_pot = total_pot
-        prev_bet = 0
-        
-        self.add_log(f"Toplam pot: {total_pot}")
-        
-        # Her bet seviyesi için pot hesapla
-        for i, player in enumerate(players_by_bet):
-            current_bet = player.bet
-            
-            # Eğer önceki bet'ten farklı bir bet seviyesi varsa, pot hesapla
-            if current_bet > prev_bet:
-                # Bu seviyeye kadar olan farkı hesapla
-                bet_diff = current_bet - prev_bet
-                # Bu seviyede pot'a katılan oyuncu sayısı
-                contributing_players = players_by_bet[i:]  # Bu ve daha büyük bet yapan oyuncular
-                
-                # Pot miktarını hesapla
-                pot_amount = bet_diff * len(contributing_players)
-                pot_amount = min(pot_amount, remaining_pot)  # Toplam pottan fazla olamaz
-                
-                # Kalan potu güncelle
-                remaining_pot -= pot_amount
-                
-                if pot_amount > 0:  # Sadece pozitif pot varsa
-                    # Bu pot seviyesinde yarışabilecek oyuncuları bul (fold olmamış)
-                    eligible_players = [p for p in contributing_players if not p.is_folded]
-                    if eligible_players:
-                        # En güçlü eli olan oyuncu(lar)ı bul
-                        eligible_players.sort(key=lambda p: player_hand_map.get(p, 7462))  # En düşük skor (en iyi el)
-                        best_score = player_hand_map.get(eligible_players[0], 7462)
-                        
-                        # Aynı skora sahip oyuncuları bul (beraberlik durumu)
-                        tied_winners = [p for p in eligible_players if player_hand_map.get(p, 7462) == best_score]
-                        
-                        # Her kazanana eşit pay ver
-                        pot_share = pot_amount // len(tied_winners)
-                        remainder = pot_amount % len(tied_winners)  # Kalan chipler
-                        
-                        for winner in tied_winners:
-                            winner_share = pot_share
-                            if remainder > 0:
-                                winner_share += 1
-                                remainder -= 1
-                                
-                            hand_desc = self.describe_hand(player_hand_map.get(winner, 7462))
-                            pot_desc = f"Pot (Bet: {current_bet})" if i < len(players_by_bet) - 1 else "Ana Pot"
-                            self.add_log(f"{pot_desc} kazananı: {winner.name} ile {hand_desc}, Kazanç: {winner_share}")
-                            winner.stack += winner_share
-            
-            prev_bet = current_bet
-                    
-        # Pot'u sıfırla
-        self.game.pot = 0
-    
     def describe_hand(self, score):
         """Treys kütüphanesinin ürettiği skor değerini insan tarafından okunabilir bir el tanımına dönüştürür"""
         if score == 1:
@@ -1523,6 +985,10 @@ class PokerUI:
     
     def next_round(self):
         """Bir sonraki ele geç"""
+        if not self.engine.hand_over:
+            messagebox.showwarning("İşlem Yapılamaz", "El henüz bitmedi!")
+            return
+        
         self.game.round += 1
         
         if self.game.round > self.settings["max_round"]:
@@ -1559,94 +1025,25 @@ class PokerUI:
             self.end_game()
             return
         
-        # Yeni kartları dağıt
-        self.game.deck.shuffle()
-        self.game.deal_hole_cards()
-        
-        # Eğer 0. el ise (gerçekte ilk el) direk sonraki ele geç
-        if self.game.round == 0:
-            self.next_round()
-            return
-        
-        # Oyuncuların kartlarını log'a kaydet
-        player = self.game.players[0]  # İnsan oyuncu
-        hand_cards = [f"{card.rank} of {card.suit}" for card in player.hand]
-        self.add_log(f"Kartlarınız: {', '.join(hand_cards)}")
-        
         # Aktif oyuncuları belirle (Stack > 0)
         active_players = [p for p in self.game.players if p.stack > 0]
         if len(active_players) <= 1:
             # Sadece bir oyuncu kaldıysa oyunu bitir
             self.end_game()
             return
-            
-        # Aktif oyuncular arasından dealer, small blind ve big blind pozisyonlarını belirle
-        # Her el için pozisyonları değiştir (dealer = round % active_count)
-        active_count = len(active_players)
-        dealer_idx = self.game.round % active_count
-        sb_idx = (dealer_idx + 1) % active_count
-        bb_idx = (dealer_idx + 2) % active_count
-        
-        # Small blind ve big blind oyuncularını al
-        small_blind_player = active_players[sb_idx]
-        big_blind_player = active_players[bb_idx]
-        
-        # Small blind yerleştir
-        small_blind_amount = min(self.game.small_blind, small_blind_player.stack)
-        self.game.place_bet(small_blind_player, small_blind_amount)
-        self.add_log(f"{small_blind_player.name} small blind: {small_blind_amount}")
-        
-        # Big blind yerleştir
-        big_blind_amount = min(self.game.small_blind * 2, big_blind_player.stack)
-        self.game.place_bet(big_blind_player, big_blind_amount)
-        self.add_log(f"{big_blind_player.name} big blind: {big_blind_amount}")
-        
-        # Current bet'i büyük blind olarak ayarla
-        self.game.current_bet = big_blind_amount
-        
-        # UI'ı güncelle
-        self.update_game_state()
         
-        # All-in durumunu kontrol et ve ilgili oyuncuların fold durumunu düzelt
-        for player in self.game.players:
-            if player.stack <= 0 and player.bet > 0:  # All-in durumu
-                player.is_folded = False  # All-in oyuncusu fold değil
-                self.add_log(f"{player.name} all-in durumunda, el sonuna kadar oyunda kalacak.")
-            else:
-                # Diğer oyuncuların fold durumunu resetle (yeni el)
-                player.is_folded = False
-        
-        # Pre-flop için betting_order oluştur
-        dealer_pos = self.game.round % len(self.game.players)
-        # Big blind'dan sonraki pozisyondan başla
-        start_pos = (dealer_pos + 3) % len(self.game.players)
-        
-        self.betting_order = []
-        for i in range(len(self.game.players)):
-            check_idx = (start_pos + i) % len(self.game.players)
-            player = self.game.players[check_idx]
-            if not player.is_folded and player.stack > 0:
-                self.betting_order.append(player)
-        
-        # Her oyuncunun aksiyonu olduğunu takip etmek için
-        self.player_acted = {p: False for p in active_players}
-        
-        # Small blind ve big blind oyuncuları aksiyon aldı sayalım
-        # Ama raise yapılırsa tekrar aksiyon almaları gerekecek
-        if small_blind_player in self.player_acted:
-            self.player_acted[small_blind_player] = True
-        if big_blind_player in self.player_acted:
-            self.player_acted[big_blind_player] = True
-        
-        self.current_betting_idx = 0
-        
-        # UI'ı güncelle
-        self.update_game_state()
+        # Eli başlat: kartlar dağıtılır, pozisyonlar (dealer = el % aktif oyuncu sayısı) ve blind'lar motor tarafından belirlenir
+        self.showdown_reached = False
+        events = self.engine.start_hand(self.game.round)
         
-        # Eğer insan oyuncu sıradaysa bekle, değilse AI turuna geç
-        current_player = self.betting_order[self.current_betting_idx] if self.betting_order else None
-        if current_player and not current_player.is_human:
-            self.ai_turn()
+        # Oyuncuların kartlarını log'a kaydet
+        player = self.game.players[0]  # İnsan oyuncu
+        hand_cards = [f"{card.rank} of {card.suit}" for card in player.hand]
+        self.add_log(f"Kartlarınız: {', '.join(hand_cards)}")
+        self.handle_events(events)
+        
+        # İnsan oyuncu sıradaysa bekle, değilse AI turuna geç
+        self.continue_hand()
     
     def end_game(self):
         # Oyun bitti, sonuçları göster
@@ -1671,75 +1068,6 @@ class PokerUI:
             self.log_text.insert(tk.END, f"{message}\n")
             self.log_text.see(tk.END)  # Otomatik kaydır
     
-    def check_allin_showdown(self):
-        """Tüm aktif oyuncular all-in mi kontrol et ve showdown'a geç"""
-        # Recursive çağrıları engellemek için flag kontrolü
-        if hasattr(self, "_in_allin_check") and self._in_allin_check:
-            return False
-            
-        # İşaretçi ayarla
-        self._in_allin_check = True
-        
-        try:
-            active_players = [p for p in self.game.players if not p.is_folded]
-            non_allin_players = [p for p in active_players if p.stack > 0]
-            
-            # Eğer aktif oyunculardan en fazla 1 tanesi non-all-in ise ve bahisler eşitse, kalan kartları açıp showdown'a geç
-            if len(non_allin_players) <= 1 and self.game.is_betting_round_done():
-                # All-in durumu, bahis turu tamamlanmış ve kalan tek oyuncu var/yok
-                self.add_log("All-in durumu tespit edildi. Kalan tüm kartlar açılıyor...")
-                
-                # Kalan community kartları aç
-                while len(self.game.community_cards) < 5:
-                    if len(self.game.community_cards) == 0:
-                        # Flop açılmadıysa flop aç
-                        self.game.deal_community_cards(3)
-                        self.add_log("--- FLOP ---")
-                        flop_cards = [f"{card.rank} of {card.suit}" for card in self.game.community_cards]
-                        self.add_log(f"Flop kartları: {', '.join(flop_cards)}")
-                        # Arayüzü güncelle ama recursive çağrıları önle
-                        self.pot_label.config(text=f"Pot: {self.game.pot}")
-                        self.round_label.config(text=f"El: {self.game.round}/{self.settings['max_round']}")
-                        self.root.update()
-                        # 1 saniye bekle, kartlar görünsün
-                        self.root.after(1000, lambda: None)
-                    elif len(self.game.community_cards) == 3:
-                        # Turn açılmadıysa turn aç
-                        self.game.deal_community_cards(1)
-                        self.add_log("--- TURN ---")
-                        turn_card = self.game.community_cards[3]
-                        self.add_log(f"Turn kartı: {turn_card.rank} of {turn_card.suit}")
-                        # Arayüzü güncelle ama recursive çağrıları önle
-                        self.pot_label.config(text=f"Pot: {self.game.pot}")
-                        self.round_label.config(text=f"El: {self.game.round}/{self.settings['max_round']}")
-                        self.root.update()
-                        # 1 saniye bekle, kartlar görünsün
-                        self.root.after(1000, lambda: None)
-                    elif len(self.game.community_cards) == 4:
-                        # River açılmadıysa river aç
-                        self.game.deal_community_cards(1)
-                        self.add_log("--- RIVER ---")
-                        river_card = self.game.community_cards[4]
-                        self.add_log(f"River kartı: {river_card.rank} of {river_card.suit}")
-                        # Arayüzü güncelle ama recursive çağrıları önle
-                        self.pot_label.config(text=f"Pot: {self.game.pot}")
-                        self.round_label.config(text=f"El: {self.game.round}/{self.settings['max_round']}")
-                        self.root.update()
-                        # 1 saniye bekle, kartlar görünsün
-                        self.root.after(1000, lambda: None)
-                
-                # Tüm kartlar açıldı, showdown'a geç
-                self.add_log("--- SHOWDOWN ---")
-                # İşaretçiyi kaldır
-                self._in_allin_check = False
-                self.showdown()
-                return True
-            
-            return False
-        finally:
-            # İşaretçiyi kaldır
-            self._in_allin_check = False
-    
     def run(self):
         self.setup_screen()
         self.root.mainloop()